@@ -6,6 +6,8 @@
 import calendar
 import datetime
 import operator
+import uuid
+from contextlib import closing
 
 from odoo import _, api, models
 from odoo.tools import float_is_zero
@@ -16,6 +18,9 @@ class GeneralLedgerReport(models.AbstractModel):
     _description = "General Ledger Report"
     _inherit = "report.account_financial_report.abstract_report"
 
+    # number of move lines fetched at once when streaming the period
+    _stream_page_size = 2000
+
     def _get_analytic_data(self, account_ids):
         analytic_accounts = self.env["account.analytic.account"].search_fetch(
             [("id", "in", account_ids)], ["name", "code"]
@@ -568,6 +573,382 @@ class GeneralLedgerReport(models.AbstractModel):
                 move_line["rec_name"] = "(" + _("future") + ") " + move_line["rec_name"]
         return move_lines
 
+    def _add_period_ml_totals(
+        self, data, currency, company_currency, foreign_currency, totals
+    ):
+        debit, credit, balance, amount_currency, count = totals
+        data["fin_bal"]["credit"] += credit
+        data["fin_bal"]["debit"] += debit
+        data["fin_bal"]["balance"] += balance
+        if foreign_currency:
+            data["fin_bal"]["bal_curr"] += amount_currency
+        data["ml_count"] = data.get("ml_count", 0) + count
+        # Amounts in foreign currencies, used instead of the move lines to
+        # compute the final balance in currency of the accounts without one.
+        data.setdefault("foreign_bal_curr", 0.0)
+        data.setdefault("foreign_currency_ids", [])
+        if currency and currency != company_currency:
+            data["foreign_bal_curr"] += amount_currency
+            if currency.id not in data["foreign_currency_ids"]:
+                data["foreign_currency_ids"].append(currency.id)
+
+    def _get_period_ml_item_totals(self, domain, grouped_by, aggregates):
+        """Return (account_id, item_id, item_name, currency, totals) tuples,
+        grouping the move lines in items like _prepare_ml_items does."""
+        res = []
+        aml_model = self.env["account.move.line"]
+        if grouped_by == "partners":
+            for account, partner, currency, *totals in aml_model._read_group(
+                domain, ["account_id", "partner_id", "currency_id"], aggregates
+            ):
+                item_name = partner.display_name if partner else _("Missing Partner")
+                res.append((account.id, partner.id or 0, item_name, currency, totals))
+        elif grouped_by == "taxes":
+            for account, tax, currency, *totals in aml_model._read_group(
+                domain + [("tax_line_id", "!=", False)],
+                ["account_id", "tax_line_id", "currency_id"],
+                aggregates,
+            ):
+                res.append((account.id, tax.id, tax.display_name, currency, totals))
+            # move lines without tax line are counted once per tax
+            for account, tax, currency, *totals in aml_model._read_group(
+                domain + [("tax_line_id", "=", False)],
+                ["account_id", "tax_ids", "currency_id"],
+                aggregates,
+            ):
+                item_name = tax.name if tax else "Missing Tax"
+                res.append((account.id, tax.id or 0, item_name, currency, totals))
+        else:
+            for account, currency, *totals in aml_model._read_group(
+                domain, ["account_id", "currency_id"], aggregates
+            ):
+                res.append((account.id, 0, "", currency, totals))
+        return res
+
+    def _get_period_ml_totals(
+        self,
+        account_ids,
+        partner_ids,
+        company_id,
+        foreign_currency,
+        only_posted_moves,
+        date_from,
+        date_to,
+        gen_ld_data,
+        cost_center_ids,
+        extra_domain,
+        grouped_by,
+    ):
+        """Streaming counterpart of _get_period_ml_data.
+
+        Only the final balances and the number of move lines of each account
+        and item are computed here, with grouped queries. The move lines
+        themselves are read page by page by _stream_move_lines while the
+        report is rendered, and the journals, taxes, analytic accounts and
+        reconciliations they refer to are added to the returned lookup
+        dictionaries at the same time.
+        """
+        domain = self._get_period_domain(
+            account_ids,
+            partner_ids,
+            company_id,
+            only_posted_moves,
+            date_to,
+            date_from,
+            cost_center_ids,
+        )
+        if extra_domain:
+            domain += extra_domain
+        company_currency = self.env["res.company"].browse(company_id).currency_id
+        aggregates = [
+            "debit:sum",
+            "credit:sum",
+            "balance:sum",
+            "amount_currency:sum",
+            "__count",
+        ]
+        for account, currency, *totals in self.env["account.move.line"]._read_group(
+            domain, ["account_id", "currency_id"], aggregates
+        ):
+            acc_id = account.id
+            if acc_id not in gen_ld_data.keys():
+                gen_ld_data[acc_id] = self._initialize_data(foreign_currency)
+                gen_ld_data[acc_id]["id"] = acc_id
+                gen_ld_data[acc_id]["mame"] = account.display_name
+                gen_ld_data[acc_id][grouped_by] = False
+            self._add_period_ml_totals(
+                gen_ld_data[acc_id],
+                currency,
+                company_currency,
+                foreign_currency,
+                totals,
+            )
+        acc_prt_account_ids = self._get_acc_prt_accounts_ids(company_id, grouped_by)
+        for (
+            acc_id,
+            item_id,
+            item_name,
+            currency,
+            totals,
+        ) in self._get_period_ml_item_totals(
+            domain + [("account_id", "in", acc_prt_account_ids)],
+            grouped_by,
+            aggregates,
+        ):
+            if item_id not in gen_ld_data[acc_id]:
+                gen_ld_data[acc_id][grouped_by] = True
+                gen_ld_data[acc_id][item_id] = self._initialize_data(foreign_currency)
+                gen_ld_data[acc_id][item_id]["id"] = item_id
+                gen_ld_data[acc_id][item_id]["name"] = item_name
+            self._add_period_ml_totals(
+                gen_ld_data[acc_id][item_id],
+                currency,
+                company_currency,
+                foreign_currency,
+                totals,
+            )
+        accounts_data = self._get_accounts_data(gen_ld_data.keys())
+        stream_data = {
+            "domain": domain,
+            "date_to": date_to,
+            "journals_data": {},
+            "full_reconcile_data": {},
+            "taxes_data": {},
+            "analytic_data": {},
+            "rec_after_date_to_ids": set(),
+        }
+        return gen_ld_data, accounts_data, stream_data
+
+    def _get_stream_item_domain(self, grouped_by, item_id):
+        if grouped_by == "partners":
+            return [("partner_id", "=", item_id or False)]
+        if grouped_by == "taxes":
+            if not item_id:
+                return [("tax_line_id", "=", False), ("tax_ids", "=", False)]
+            return [
+                "|",
+                ("tax_line_id", "=", item_id),
+                "&",
+                ("tax_line_id", "=", False),
+                ("tax_ids", "in", [item_id]),
+            ]
+        return []
+
+    def _iter_move_line_pages(self, domain):
+        """Yield the move lines matching domain, as lists of dictionaries
+        of at most _stream_page_size lines, in the order of the report.
+
+        The ids are read from a server-side cursor, so that neither the
+        ids nor the lines of the whole period are held in memory.
+        """
+        aml_model = self.env["account.move.line"]
+        self.env.flush_all()
+        query = aml_model._search(domain, order="date, move_name, id")
+        sql = query.select()
+        ml_fields = self._get_ml_fields()
+        cursor_name = f"general_ledger_{uuid.uuid4().hex}"
+        with closing(self.env.cr._cnx.cursor(cursor_name)) as named_cr:
+            named_cr.itersize = self._stream_page_size
+            named_cr.execute(sql.code, sql.params)
+            while True:
+                rows = named_cr.fetchmany(self._stream_page_size)
+                if not rows:
+                    break
+                move_lines = aml_model.browse([row[0] for row in rows])
+                yield move_lines.read(ml_fields)
+                # do not keep the values of the previous pages in cache
+                move_lines.invalidate_recordset()
+
+    def _update_stream_data(self, move_lines, stream_data):
+        """Add the records referred to by a page of move lines to the lookup
+        dictionaries of the report."""
+        journal_ids = set()
+        taxes_ids = set()
+        analytic_ids = set()
+        full_reconcile_ids = set()
+        for move_line in move_lines:
+            journal_ids.add(move_line["journal_id"][0])
+            taxes_ids.update(move_line["tax_ids"])
+            for analytic_account in move_line["analytic_distribution"] or {}:
+                for analytic_account_id in analytic_account.split(","):
+                    analytic_ids.add(int(analytic_account_id))
+            if move_line["full_reconcile_id"]:
+                rec_id = move_line["full_reconcile_id"][0]
+                if rec_id not in stream_data["full_reconcile_data"]:
+                    stream_data["full_reconcile_data"][rec_id] = {
+                        "id": rec_id,
+                        "name": move_line["matching_number"],
+                    }
+                    full_reconcile_ids.add(rec_id)
+        self._update_stream_journals(journal_ids, stream_data)
+        taxes_ids -= stream_data["taxes_data"].keys()
+        if taxes_ids:
+            stream_data["taxes_data"].update(self._get_taxes_data(list(taxes_ids)))
+        analytic_ids -= stream_data["analytic_data"].keys()
+        if analytic_ids:
+            stream_data["analytic_data"].update(
+                self._get_analytic_data(list(analytic_ids))
+            )
+        if full_reconcile_ids:
+            stream_data["rec_after_date_to_ids"].update(
+                self._get_reconciled_after_date_to_ids(
+                    full_reconcile_ids, stream_data["date_to"]
+                )
+            )
+
+    def _update_stream_journals(self, journal_ids, stream_data):
+        """Add the journals missing from the lookup dictionary of the report."""
+        journal_ids = set(journal_ids) - stream_data["journals_data"].keys()
+        if journal_ids:
+            stream_data["journals_data"].update(
+                self._get_journals_data(list(journal_ids))
+            )
+
+    def _stream_move_lines(self, domain, last_cumul_balance, stream_data):
+        """Generate the move lines of the report matching domain, with their
+        cumulative balance, one page of move lines at a time."""
+        for move_lines in self._iter_move_line_pages(domain):
+            self._update_stream_data(move_lines, stream_data)
+            move_lines = self._recalculate_cumul_balance(
+                [self._get_move_line_data(move_line) for move_line in move_lines],
+                last_cumul_balance,
+                stream_data["rec_after_date_to_ids"],
+            )
+            last_cumul_balance = move_lines[-1]["balance"]
+            yield from move_lines
+
+    def _get_centralized_ml_stream(self, domain, date_to):
+        """Grouped query counterpart of _get_centralized_ml."""
+        if isinstance(date_to, str):
+            date_to = datetime.datetime.strptime(date_to, "%Y-%m-%d").date()
+        list_centralized_ml = []
+        for journal, month, debit, credit, amount_currency in self.env[
+            "account.move.line"
+        ]._read_group(
+            domain,
+            ["journal_id", "date:month"],
+            ["debit:sum", "credit:sum", "amount_currency:sum"],
+        ):
+            last_day_month = calendar.monthrange(month.year, month.month)
+            date = datetime.date(month.year, month.month, last_day_month[1])
+            if date > date_to:
+                date = date_to
+            list_centralized_ml.append(
+                {
+                    "journal_id": journal.id,
+                    "ref_label": "Centralized entries",
+                    "date": date,
+                    "debit": debit,
+                    "credit": credit,
+                    "balance": debit - credit,
+                    "bal_curr": amount_currency,
+                    "partner_id": False,
+                    "rec_id": 0,
+                    "entry_id": False,
+                    "tax_ids": [],
+                    "tax_line_id": False,
+                    "full_reconcile_id": False,
+                    "id": False,
+                    "currency_id": False,
+                    "analytic_distribution": {},
+                }
+            )
+        return list_centralized_ml
+
+    def _create_general_ledger_stream(
+        self,
+        gen_led_data,
+        accounts_data,
+        grouped_by,
+        hide_account_at_0,
+        centralize,
+        stream_data,
+    ):
+        """Streaming counterpart of _create_general_ledger, where the
+        move_lines of the accounts and items are generators."""
+        general_ledger = []
+        rounding = self.env.company.currency_id.rounding
+        for acc_id in gen_led_data.keys():
+            acc_data = gen_led_data[acc_id]
+            account = {
+                "code": accounts_data[acc_id]["code"],
+                "name": accounts_data[acc_id]["name"],
+                "type": "account",
+                "currency_id": accounts_data[acc_id]["currency_id"],
+                "centralized": accounts_data[acc_id]["centralized"],
+                "grouped_by": grouped_by,
+            }
+            list_grouped = []
+            for data_id in acc_data.keys():
+                if not isinstance(data_id, int):
+                    account.update({data_id: acc_data[data_id]})
+                    continue
+                item_data = acc_data[data_id]
+                if (
+                    hide_account_at_0
+                    and float_is_zero(
+                        item_data["init_bal"]["balance"], precision_rounding=rounding
+                    )
+                    and not item_data.get("ml_count")
+                ):
+                    continue
+                group_item = {
+                    key: value
+                    for key, value in item_data.items()
+                    if not isinstance(key, int)
+                }
+                group_item["move_lines"] = (
+                    self._stream_move_lines(
+                        stream_data["domain"]
+                        + [("account_id", "=", acc_id)]
+                        + self._get_stream_item_domain(grouped_by, data_id),
+                        item_data["init_bal"]["balance"],
+                        stream_data,
+                    )
+                    if item_data.get("ml_count")
+                    else []
+                )
+                list_grouped.append(group_item)
+            if hide_account_at_0 and float_is_zero(
+                acc_data["init_bal"]["balance"], precision_rounding=rounding
+            ):
+                if acc_data[grouped_by] and not list_grouped:
+                    continue
+                if not acc_data[grouped_by] and not acc_data.get("ml_count"):
+                    continue
+            if centralize and account["centralized"]:
+                centralized_ml = self._get_centralized_ml_stream(
+                    stream_data["domain"] + [("account_id", "=", acc_id)],
+                    stream_data["date_to"],
+                )
+                # their journals may not appear in any streamed page
+                self._update_stream_journals(
+                    [move_line["journal_id"] for move_line in centralized_ml],
+                    stream_data,
+                )
+                account["move_lines"] = self._recalculate_cumul_balance(
+                    centralized_ml,
+                    acc_data["init_bal"]["balance"],
+                    stream_data["rec_after_date_to_ids"],
+                )
+                account["foreign_bal_curr"] = 0.0
+                account["foreign_currency_ids"] = []
+                account[grouped_by] = False
+            elif acc_data[grouped_by]:
+                account["list_grouped"] = list_grouped
+            else:
+                account["move_lines"] = (
+                    self._stream_move_lines(
+                        stream_data["domain"] + [("account_id", "=", acc_id)],
+                        acc_data["init_bal"]["balance"],
+                        stream_data,
+                    )
+                    if acc_data.get("ml_count")
+                    else []
+                )
+            general_ledger += [account]
+        return general_ledger
+
     def _create_account(self, account, acc_id, gen_led_data, rec_after_date_to_ids):
         move_lines = []
         for ml_id in gen_led_data[acc_id].keys():
@@ -790,49 +1171,77 @@ class GeneralLedgerReport(models.AbstractModel):
             grouped_by,
         )
         centralize = data["centralize"]
-        (
-            gen_ld_data,
-            accounts_data,
-            journals_data,
-            full_reconcile_data,
-            taxes_data,
-            analytic_data,
-            rec_after_date_to_ids,
-        ) = self._get_period_ml_data(
-            account_ids,
-            partner_ids,
-            company_id,
-            foreign_currency,
-            only_posted_moves,
-            date_from,
-            date_to,
-            gen_ld_data,
-            cost_center_ids,
-            extra_domain,
-            grouped_by,
-        )
-        general_ledger = self._create_general_ledger(
-            gen_ld_data,
-            accounts_data,
-            grouped_by,
-            rec_after_date_to_ids,
-            hide_account_at_0,
-        )
-        if centralize:
-            for account in general_ledger:
-                if account["centralized"]:
-                    centralized_ml = self._get_centralized_ml(
-                        account, date_to, grouped_by
-                    )
-                    account["move_lines"] = centralized_ml
-                    account["move_lines"] = self._recalculate_cumul_balance(
-                        account["move_lines"],
-                        gen_ld_data[account["id"]]["init_bal"]["balance"],
-                        rec_after_date_to_ids,
-                    )
-                    if account[grouped_by]:
-                        account[grouped_by] = False
-                        del account["list_grouped"]
+        stream_move_lines = data.get("stream_move_lines")
+        if stream_move_lines:
+            gen_ld_data, accounts_data, stream_data = self._get_period_ml_totals(
+                account_ids,
+                partner_ids,
+                company_id,
+                foreign_currency,
+                only_posted_moves,
+                date_from,
+                date_to,
+                gen_ld_data,
+                cost_center_ids,
+                extra_domain,
+                grouped_by,
+            )
+            journals_data = stream_data["journals_data"]
+            full_reconcile_data = stream_data["full_reconcile_data"]
+            taxes_data = stream_data["taxes_data"]
+            analytic_data = stream_data["analytic_data"]
+            general_ledger = self._create_general_ledger_stream(
+                gen_ld_data,
+                accounts_data,
+                grouped_by,
+                hide_account_at_0,
+                centralize,
+                stream_data,
+            )
+        else:
+            (
+                gen_ld_data,
+                accounts_data,
+                journals_data,
+                full_reconcile_data,
+                taxes_data,
+                analytic_data,
+                rec_after_date_to_ids,
+            ) = self._get_period_ml_data(
+                account_ids,
+                partner_ids,
+                company_id,
+                foreign_currency,
+                only_posted_moves,
+                date_from,
+                date_to,
+                gen_ld_data,
+                cost_center_ids,
+                extra_domain,
+                grouped_by,
+            )
+            general_ledger = self._create_general_ledger(
+                gen_ld_data,
+                accounts_data,
+                grouped_by,
+                rec_after_date_to_ids,
+                hide_account_at_0,
+            )
+            if centralize:
+                for account in general_ledger:
+                    if account["centralized"]:
+                        centralized_ml = self._get_centralized_ml(
+                            account, date_to, grouped_by
+                        )
+                        account["move_lines"] = centralized_ml
+                        account["move_lines"] = self._recalculate_cumul_balance(
+                            account["move_lines"],
+                            gen_ld_data[account["id"]]["init_bal"]["balance"],
+                            rec_after_date_to_ids,
+                        )
+                        if account[grouped_by]:
+                            account[grouped_by] = False
+                            del account["list_grouped"]
         general_ledger = sorted(general_ledger, key=lambda k: k["code"])
         # Set the bal_curr of the initial balance to 0 if it does not correspond
         # (reducing the corresponding of the bal_curr of the initial balance).
@@ -861,7 +1270,22 @@ class GeneralLedgerReport(models.AbstractModel):
                 gl_item["fin_bal_currency_id"] = fin_bal_currency_id
                 continue
             gl_item["fin_bal"]["bal_curr"] = gl_item["init_bal"]["bal_curr"]
-            if "move_lines" in gl_item:
+            if stream_move_lines:
+                # the move lines are not read yet, use the period totals
+                if "list_grouped" in gl_item:
+                    foreign_items = gl_item["list_grouped"]
+                    for lg_item in foreign_items:
+                        lg_item["fin_bal"]["bal_curr"] = lg_item["init_bal"][
+                            "bal_curr"
+                        ] + lg_item.get("foreign_bal_curr", 0.0)
+                else:
+                    foreign_items = [gl_item]
+                for item in foreign_items:
+                    gl_item["fin_bal"]["bal_curr"] += item.get("foreign_bal_curr", 0.0)
+                    for ml_currency_id in item.get("foreign_currency_ids", []):
+                        if ml_currency_id not in fin_bal_currency_ids:
+                            fin_bal_currency_ids.append(ml_currency_id)
+            elif "move_lines" in gl_item:
                 for ml in gl_item["move_lines"]:
                     ml_currency_id = (
                         ml["currency_id"][0] if ml["currency_id"] else False
@@ -143,6 +143,9 @@ class GeneralLedgerXslx(models.AbstractModel):
         filter_partner_ids = res_data["filter_partner_ids"]
         foreign_currency = res_data["foreign_currency"]
         company_currency = res_data["company_currency"]
+        # When the journal items are streamed, the move lines of the accounts
+        # are generators reading them page by page: they are written as soon
+        # as they are read and can only be iterated once.
         # For each account
         for account in general_ledger:
             # Write account title
@@ -6,6 +6,7 @@
 
 from odoo import _, api, models
 from odoo.exceptions import UserError
+from odoo.tools import SQL
 from odoo.tools.float_utils import float_is_zero
 
 
@@ -404,7 +405,7 @@ class TrialBalanceReport(models.AbstractModel):
 
     # flake8: noqa: C901
     @api.model
-    def _get_data(
+    def _get_balances_read_group(
         self,
         account_ids,
         journal_ids,
@@ -416,16 +417,15 @@ class TrialBalanceReport(models.AbstractModel):
         only_posted_moves,
         show_partner_details,
         hide_account_at_0,
-        unaffected_earnings_account,
         fy_start_date,
         grouped_by,
     ):
+        """Return the balances of the accounts (and partners) as read_group
+        results, with the initial balance of the P&L accounts of previous
+        fiscal years, using one read_group per kind of balance."""
         accounts_domain = [("company_ids", "in", [company_id])]
         if account_ids:
             accounts_domain += [("id", "in", account_ids)]
-            # If explicit list of accounts is provided,
-            # don't include unaffected earnings account
-            unaffected_earnings_account = False
         accounts = self.env["account.account"].search(accounts_domain)
         tb_initial_acc = []
         for account in accounts:
@@ -539,6 +539,295 @@ class TrialBalanceReport(models.AbstractModel):
                 groupby=["account_id", "currency_id", "partner_id"],
                 lazy=False,
             )
+        else:
+            tb_initial_prt = tb_period_prt = []
+        pl_initial_balances = self._get_pl_initial_balance(
+            account_ids,
+            journal_ids,
+            partner_ids,
+            company_id,
+            fy_start_date,
+            only_posted_moves,
+            show_partner_details,
+            foreign_currency,
+        )
+        return (
+            tb_initial_acc,
+            tb_period_acc,
+            tb_initial_prt,
+            tb_period_prt,
+            pl_initial_balances,
+        )
+
+    @api.model
+    def _get_balances_sql(
+        self,
+        account_ids,
+        journal_ids,
+        partner_ids,
+        company_id,
+        date_to,
+        date_from,
+        foreign_currency,
+        only_posted_moves,
+        show_partner_details,
+        hide_account_at_0,
+        fy_start_date,
+        grouped_by,
+    ):
+        """Single query counterpart of _get_balances_read_group.
+
+        The initial and period balances of the accounts, of the partners of
+        their move lines and the initial balance of the P&L accounts of
+        previous fiscal years are all aggregated in one pass over the move
+        lines, using grouping sets. Like the read_group engine, the rows are
+        split by currency and ordered the same way, for the merge code to
+        build the same totals. The balances of the account groups are then
+        rolled up from the accounts as usual.
+        """
+        aml_model = self.env["account.move.line"]
+        accounts_domain = [("company_ids", "in", [company_id])]
+        if account_ids:
+            accounts_domain += [("id", "in", account_ids)]
+        accounts = self.env["account.account"].search(accounts_domain)
+        pl_account_ids = accounts.filtered(lambda a: not a.include_initial_balance).ids
+        domain = [
+            ("display_type", "not in", ["line_note", "line_section"]),
+            ("date", "<=", date_to),
+            ("account_id", "in", accounts.ids),
+        ]
+        if company_id:
+            domain += [("company_id", "=", company_id)]
+        if journal_ids:
+            domain += [("journal_id", "in", journal_ids)]
+        if partner_ids:
+            domain += [("partner_id", "in", partner_ids)]
+        if only_posted_moves:
+            domain += [("move_id.state", "=", "posted")]
+        else:
+            domain += [("move_id.state", "in", ["posted", "draft"])]
+        if show_partner_details:
+            domain += [
+                (
+                    "account_id.account_type",
+                    "in",
+                    ["asset_receivable", "liability_payable"],
+                )
+            ]
+        aml_model.flush_model(
+            [
+                "account_id",
+                "partner_id",
+                "currency_id",
+                "date",
+                "debit",
+                "credit",
+                "balance",
+                "amount_currency",
+            ]
+        )
+        query = aml_model._search(domain)
+        query.order = None
+
+        def column(name):
+            return SQL.identifier(query.table, name)
+
+        account_col = column("account_id")
+        partner_col = column("partner_id")
+        currency_col = column("currency_id")
+        date_col = column("date")
+        is_period = SQL("%s >= %s", date_col, date_from)
+        is_initial = SQL(
+            "%s < %s AND (%s <> ALL(%s) OR %s >= %s)",
+            date_col,
+            date_from,
+            account_col,
+            pl_account_ids,
+            date_col,
+            fy_start_date,
+        )
+        is_pl_initial = SQL(
+            "%s = ANY(%s) AND %s < %s",
+            account_col,
+            pl_account_ids,
+            date_col,
+            fy_start_date,
+        )
+
+        def total(field, condition):
+            return SQL(
+                "COALESCE(SUM(%s) FILTER (WHERE %s), 0)", column(field), condition
+            )
+
+        if show_partner_details:
+            query.groupby = SQL(
+                "GROUPING SETS ((%s, %s), (%s, %s, %s))",
+                account_col,
+                currency_col,
+                account_col,
+                partner_col,
+                currency_col,
+            )
+            partner_columns = [partner_col, SQL("GROUPING(%s) = 1", partner_col)]
+        else:
+            query.groupby = SQL("%s, %s", account_col, currency_col)
+            partner_columns = [SQL("NULL"), SQL("TRUE")]
+        self.env.cr.execute(
+            query.select(
+                account_col,
+                *partner_columns,
+                currency_col,
+                SQL("COUNT(*) FILTER (WHERE %s)", is_period),
+                total("debit", is_period),
+                total("credit", is_period),
+                total("balance", is_period),
+                total("amount_currency", is_period),
+                SQL("COUNT(*) FILTER (WHERE %s)", is_initial),
+                total("balance", is_initial),
+                total("amount_currency", is_initial),
+                total("balance", is_pl_initial),
+                total("amount_currency", is_pl_initial),
+            )
+        )
+        rows = self.env.cr.fetchall()
+        # present the rows like read_group does, in the order of the accounts
+        account_names = {account.id: account.display_name for account in accounts}
+        partner_names = {
+            partner.id: partner.display_name
+            for partner in self.env["res.partner"].browse(
+                {row[1] for row in rows if row[1]}
+            )
+        }
+        account_order = {account_id: i for i, account_id in enumerate(account_names)}
+        currencies = (
+            self.env["res.currency"]
+            .with_context(active_test=False)
+            .browse({row[3] for row in rows if row[3]})
+            .sorted()
+        )
+        currency_order = {currency.id: i for i, currency in enumerate(currencies)}
+        rows.sort(
+            key=lambda row: (
+                account_order[row[0]],
+                currency_order.get(row[3], len(currency_order)),
+                row[1] or 0,
+            )
+        )
+        initial_acc = {
+            account_id: {
+                "account_id": account_id,
+                "balance": 0.0,
+                "amount_currency": 0.0,
+            }
+            for account_id in account_names
+        }
+        tb_period_acc = []
+        tb_initial_prt = []
+        tb_period_prt = []
+        pl_initial_balance = 0.0
+        pl_initial_currency_balance = 0.0
+        for (
+            acc_id,
+            prt_id,
+            is_account_row,
+            __,
+            period_count,
+            debit,
+            credit,
+            balance,
+            amount_currency,
+            initial_count,
+            initial_balance,
+            initial_amount_currency,
+            pl_balance,
+            pl_amount_currency,
+        ) in rows:
+            tb = {
+                "account_id": (acc_id, account_names[acc_id]),
+                "debit": debit,
+                "credit": credit,
+                "balance": balance,
+                "amount_currency": amount_currency,
+            }
+            tb_initial = {
+                "account_id": (acc_id, account_names[acc_id]),
+                "balance": initial_balance,
+                "amount_currency": initial_amount_currency,
+            }
+            if is_account_row:
+                initial_acc[acc_id]["balance"] += initial_balance
+                initial_acc[acc_id]["amount_currency"] += initial_amount_currency
+                if period_count:
+                    tb_period_acc.append(tb)
+                pl_initial_balance += pl_balance
+                if foreign_currency:
+                    pl_initial_currency_balance += round(pl_amount_currency, 2)
+                continue
+            partner = (prt_id, partner_names[prt_id]) if prt_id else False
+            if period_count:
+                tb_period_prt.append(dict(tb, partner_id=partner))
+            if initial_count:
+                tb_initial_prt.append(dict(tb_initial, partner_id=partner))
+        tb_initial_acc = list(initial_acc.values())
+        if hide_account_at_0:
+            tb_initial_acc = [p for p in tb_initial_acc if p["balance"] != 0]
+            tb_initial_prt = [p for p in tb_initial_prt if p["balance"] != 0]
+        return (
+            tb_initial_acc,
+            tb_period_acc,
+            tb_initial_prt,
+            tb_period_prt,
+            (pl_initial_balance, pl_initial_currency_balance),
+        )
+
+    # flake8: noqa: C901
+    @api.model
+    def _get_data(
+        self,
+        account_ids,
+        journal_ids,
+        partner_ids,
+        company_id,
+        date_to,
+        date_from,
+        foreign_currency,
+        only_posted_moves,
+        show_partner_details,
+        hide_account_at_0,
+        unaffected_earnings_account,
+        fy_start_date,
+        grouped_by,
+        engine="read_group",
+    ):
+        if account_ids:
+            # If explicit list of accounts is provided,
+            # don't include unaffected earnings account
+            unaffected_earnings_account = False
+        # The SQL engine does not support the grouping by analytic account
+        if engine == "sql" and not grouped_by:
+            get_balances = self._get_balances_sql
+        else:
+            get_balances = self._get_balances_read_group
+        (
+            tb_initial_acc,
+            tb_period_acc,
+            tb_initial_prt,
+            tb_period_prt,
+            (pl_initial_balance, pl_initial_currency_balance),
+        ) = get_balances(
+            account_ids,
+            journal_ids,
+            partner_ids,
+            company_id,
+            date_to,
+            date_from,
+            foreign_currency,
+            only_posted_moves,
+            show_partner_details,
+            hide_account_at_0,
+            fy_start_date,
+            grouped_by,
+        )
         total_amount = {}
         partners_data = []
         total_amount = self._compute_account_amount(
@@ -582,19 +871,6 @@ class TrialBalanceReport(models.AbstractModel):
                 )
                 total_amount[unaffected_id]["group_by_data"][0] = group_by_data_item
         accounts_data = self._get_accounts_data(accounts_ids)
-        (
-            pl_initial_balance,
-            pl_initial_currency_balance,
-        ) = self._get_pl_initial_balance(
-            account_ids,
-            journal_ids,
-            partner_ids,
-            company_id,
-            fy_start_date,
-            only_posted_moves,
-            show_partner_details,
-            foreign_currency,
-        )
         if unaffected_id:
             total_amount[unaffected_id]["ending_balance"] += pl_initial_balance
             total_amount[unaffected_id]["initial_balance"] += pl_initial_balance
@@ -889,6 +1165,7 @@ class TrialBalanceReport(models.AbstractModel):
             unaffected_earnings_account,
             fy_start_date,
             grouped_by,
+            engine=data.get("engine", "read_group"),
         )
         trial_balance_grouped = False
         total_amount_grouped = False
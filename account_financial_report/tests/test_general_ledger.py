@@ -101,7 +101,9 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
         move = self.env["account.move"].create(move_vals)
         move.action_post()
 
-    def _get_report_lines(self, with_partners=False, account_ids=False):
+    def _get_report_lines(
+        self, with_partners=False, account_ids=False, stream_move_lines=False
+    ):
         centralize = True
         if with_partners:
             centralize = False
@@ -116,6 +118,7 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
                 "account_ids": account_ids,
                 "fy_start_date": self.fy_date_start,
                 "centralize": centralize,
+                "stream_move_lines": stream_move_lines,
             }
         )
         data = general_ledger._prepare_report_general_ledger()
@@ -687,6 +690,88 @@ class TestGeneralLedgerReport(AccountTestInvoicingCommon):
         self.assertEqual(unaffected_fin_balance["credit"], 1000)
         self.assertEqual(unaffected_fin_balance["balance"], 500)
 
+    def _get_report_move_lines(self, account):
+        items = account.get("list_grouped") or [account]
+        return [
+            (item.get("id"), line["id"], line["debit"], line["balance"])
+            for item in items
+            for line in item["move_lines"]
+        ]
+
+    def test_05_stream_move_lines(self):
+        self._add_move(
+            date=self.previous_fy_date_end,
+            receivable_debit=1000,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=1000,
+        )
+        self._add_move(
+            date=self.fy_date_start,
+            receivable_debit=0,
+            receivable_credit=300,
+            income_debit=300,
+            income_credit=0,
+        )
+        self._add_move(
+            date=self.fy_date_end,
+            receivable_debit=0,
+            receivable_credit=200,
+            income_debit=200,
+            income_credit=0,
+        )
+        for with_partners in (True, False):
+            general_ledger = self._get_report_lines(with_partners=with_partners)[
+                "general_ledger"
+            ]
+            stream_general_ledger = self._get_report_lines(
+                with_partners=with_partners, stream_move_lines=True
+            )["general_ledger"]
+            self.assertEqual(
+                [account["id"] for account in stream_general_ledger],
+                [account["id"] for account in general_ledger],
+            )
+            for account, stream_account in zip(
+                general_ledger, stream_general_ledger, strict=True
+            ):
+                self.assertEqual(stream_account["init_bal"], account["init_bal"])
+                self.assertEqual(stream_account["fin_bal"], account["fin_bal"])
+                self.assertEqual(
+                    self._get_report_move_lines(stream_account),
+                    self._get_report_move_lines(account),
+                )
+        receivable = next(
+            account
+            for account in stream_general_ledger
+            if account["id"] == self.receivable_account.id
+        )
+        self.assertEqual(
+            [line[3] for line in self._get_report_move_lines(receivable)],
+            [700, 500],
+        )
+
+    def test_06_stream_centralized_journals(self):
+        self.income_account.centralized = True
+        self._add_move(
+            date=self.fy_date_start,
+            receivable_debit=0,
+            receivable_credit=300,
+            income_debit=300,
+            income_credit=0,
+        )
+        journal = self.env["account.journal"].search(
+            [("company_id", "=", self.env.user.company_id.id)], limit=1
+        )
+        res_data = self._get_report_lines(
+            account_ids=self.income_account.ids, stream_move_lines=True
+        )
+        [income] = res_data["general_ledger"]
+        self.assertEqual(
+            [line["journal_id"] for line in income["move_lines"]], [journal.id]
+        )
+        # no page is streamed for a centralized account
+        self.assertEqual(res_data["journals_data"][journal.id]["code"], journal.code)
+
     def test_partner_filter(self):
         partner_1 = self.env.ref("base.res_partner_1")
         partner_2 = self.env.ref("base.res_partner_2")
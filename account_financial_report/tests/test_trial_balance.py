@@ -3,12 +3,16 @@
 # Copyright 2020 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+import logging
 import re
+import time
 
 from odoo.tests import tagged
 
 from odoo.addons.account.tests.common import AccountTestInvoicingCommon
 
+_logger = logging.getLogger(__name__)
+
 
 @tagged("post_install", "-at_install")
 class TestTrialBalanceReport(AccountTestInvoicingCommon):
@@ -172,7 +176,11 @@ class TestTrialBalanceReport(AccountTestInvoicingCommon):
         move.action_post()
 
     def _get_report_lines(
-        self, with_partners=False, account_ids=False, show_hierarchy=False
+        self,
+        with_partners=False,
+        account_ids=False,
+        show_hierarchy=False,
+        engine="read_group",
     ):
         company = self.env.user.company_id
         trial_balance = self.env["trial.balance.report.wizard"].create(
@@ -186,6 +194,7 @@ class TestTrialBalanceReport(AccountTestInvoicingCommon):
                 "account_ids": account_ids,
                 "fy_start_date": self.fy_date_start,
                 "show_partner_details": with_partners,
+                "engine": engine,
             }
         )
         data = trial_balance._prepare_report_trial_balance()
@@ -715,3 +724,200 @@ class TestTrialBalanceReport(AccountTestInvoicingCommon):
         ]
         self.assertEqual(len(trial_balance_code_set), len(all_accounts_code_set))
         self.assertTrue(trial_balance_code_set == all_accounts_code_set)
+
+    def test_06_sql_engine(self):
+        self._add_move(
+            date=self.previous_fy_date_end,
+            receivable_debit=1000,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=1000,
+        )
+        self._add_move(
+            date=self.date_start,
+            receivable_debit=0,
+            receivable_credit=300,
+            income_debit=300,
+            income_credit=0,
+            unaffected_debit=0,
+            unaffected_credit=0,
+        )
+        for with_partners, show_hierarchy in [
+            (False, False),
+            (False, True),
+            (True, False),
+        ]:
+            res_data = self._get_report_lines(
+                with_partners=with_partners, show_hierarchy=show_hierarchy
+            )
+            sql_res_data = self._get_report_lines(
+                with_partners=with_partners,
+                show_hierarchy=show_hierarchy,
+                engine="sql",
+            )
+            self.assertEqual(
+                get_balances(sql_res_data, with_partners),
+                get_balances(res_data, with_partners),
+            )
+
+    def test_07_sql_engine_currencies(self):
+        self._add_move(
+            date=self.date_start,
+            receivable_debit=500,
+            receivable_credit=0,
+            income_debit=0,
+            income_credit=500,
+        )
+        # the same partner and accounts in a second currency
+        currency = self.env.ref("base.EUR")
+        if currency == self.env.user.company_id.currency_id:
+            currency = self.env.ref("base.CHF")
+        currency.active = True
+        journal = self.env["account.journal"].search(
+            [("company_id", "=", self.env.user.company_id.id)], limit=1
+        )
+        partner = self.env.ref("base.res_partner_12")
+        move = self.env["account.move"].create(
+            {
+                "journal_id": journal.id,
+                "date": self.date_start,
+                "line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 200,
+                            "credit": 0,
+                            "amount_currency": 400,
+                            "currency_id": currency.id,
+                            "partner_id": partner.id,
+                            "account_id": self.account100.id,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "debit": 0,
+                            "credit": 200,
+                            "amount_currency": -400,
+                            "currency_id": currency.id,
+                            "partner_id": partner.id,
+                            "account_id": self.account200.id,
+                        },
+                    ),
+                ],
+            }
+        )
+        move.action_post()
+        for with_partners in (False, True):
+            res_data = self._get_report_lines(with_partners=with_partners)
+            sql_res_data = self._get_report_lines(
+                with_partners=with_partners, engine="sql"
+            )
+            self.assertEqual(
+                get_balances(sql_res_data, with_partners),
+                get_balances(res_data, with_partners),
+            )
+
+
+def get_balances(res_data, with_partners):
+    """Return the rounded balances of the lines of a trial balance, and of
+    the partners of its accounts when they are detailed."""
+    fields = ["initial_balance", "debit", "credit", "balance", "ending_balance"]
+    res = {
+        (line["type"], line["id"]): [round(line[f], 2) for f in fields]
+        for line in res_data["trial_balance"]
+    }
+    if with_partners:
+        for acc_id, acc_data in res_data["total_amount"].items():
+            for prt_id, prt_data in acc_data.items():
+                if isinstance(prt_id, int):
+                    res[(acc_id, prt_id)] = [round(prt_data[f], 2) for f in fields]
+    return res
+
+
+@tagged("post_install", "-at_install", "-standard", "trial_balance_benchmark")
+class TestTrialBalanceBenchmark(AccountTestInvoicingCommon):
+    """Compare the duration of both computation engines on a generated set of
+    journal items. Run it with --test-tags trial_balance_benchmark."""
+
+    MOVE_COUNT = 2000
+    PARTNER_COUNT = 50
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        receivable = cls.company_data["default_account_receivable"]
+        revenue = cls.company_data["default_account_revenue"]
+        expense = cls.company_data["default_account_expense"]
+        journal = cls.company_data["default_journal_misc"]
+        partners = cls.env["res.partner"].create(
+            [{"name": f"Benchmark partner {i}"} for i in range(cls.PARTNER_COUNT)]
+        )
+        moves = cls.env["account.move"].create(
+            [
+                {
+                    "journal_id": journal.id,
+                    "date": f"{2015 + i % 2}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                    "line_ids": [
+                        (
+                            0,
+                            0,
+                            {
+                                "account_id": receivable.id,
+                                "partner_id": partners[i % cls.PARTNER_COUNT].id,
+                                "debit": 100 + i,
+                            },
+                        ),
+                        (
+                            0,
+                            0,
+                            {
+                                "account_id": (revenue if i % 3 else expense).id,
+                                "credit": 100 + i,
+                            },
+                        ),
+                    ],
+                }
+                for i in range(cls.MOVE_COUNT)
+            ]
+        )
+        moves.action_post()
+
+    def _run_engine(self, engine, with_partners):
+        wizard = self.env["trial.balance.report.wizard"].create(
+            {
+                "date_from": "2016-01-01",
+                "date_to": "2016-12-31",
+                "target_move": "posted",
+                "company_id": self.env.company.id,
+                "show_partner_details": with_partners,
+                "show_hierarchy": not with_partners,
+                "engine": engine,
+            }
+        )
+        data = wizard._prepare_report_trial_balance()
+        report = self.env["report.account_financial_report.trial_balance"]
+        self.env.invalidate_all()
+        start = time.perf_counter()
+        res_data = report._get_report_values(wizard, data)
+        return res_data, time.perf_counter() - start
+
+    def test_benchmark_engines(self):
+        for with_partners in (False, True):
+            res_data, read_group_time = self._run_engine("read_group", with_partners)
+            sql_res_data, sql_time = self._run_engine("sql", with_partners)
+            _logger.info(
+                "Trial balance on %s moves (partner details: %s): "
+                "read_group %.3fs, sql %.3fs",
+                self.MOVE_COUNT,
+                with_partners,
+                read_group_time,
+                sql_time,
+            )
+            self.assertEqual(
+                get_balances(sql_res_data, with_partners),
+                get_balances(res_data, with_partners),
+            )
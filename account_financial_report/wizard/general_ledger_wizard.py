@@ -84,6 +84,12 @@ class GeneralLedgerReportWizard(models.TransientModel):
         string="Show Analytic Account",
         default=True,
     )
+    stream_move_lines = fields.Boolean(
+        string="Stream journal items",
+        help="XLSX export only: read the journal items page by page while the "
+        "file is written instead of loading the whole period in memory. "
+        "Use it to export long periods on large databases.",
+    )
     domain = fields.Char(
         string="Journal Items Domain",
         default=[],
@@ -274,6 +280,9 @@ class GeneralLedgerReportWizard(models.TransientModel):
     def _print_report(self, report_type):
         self.ensure_one()
         data = self._prepare_report_general_ledger()
+        if report_type != "xlsx":
+            # the QWeb templates need the move lines in memory
+            data["stream_move_lines"] = False
         if report_type == "xlsx":
             report_name = "a_f_r.report_general_ledger_xlsx"
         else:
@@ -308,6 +317,7 @@ class GeneralLedgerReportWizard(models.TransientModel):
             "unaffected_earnings_account": self.unaffected_earnings_account.id,
             "account_financial_report_lang": self.env.lang,
             "domain": self._get_account_move_lines_domain(),
+            "stream_move_lines": self.stream_move_lines,
         }
 
     def _export(self, report_type):
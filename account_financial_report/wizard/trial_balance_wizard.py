@@ -71,6 +71,16 @@ class TrialBalanceReportWizard(models.TransientModel):
     grouped_by = fields.Selection(
         selection=[("analytic_account", "Analytic Account")], default=False
     )
+    engine = fields.Selection(
+        selection=[("read_group", "Grouped reads"), ("sql", "Single SQL pass")],
+        string="Computation engine",
+        default="read_group",
+        required=True,
+        help="Single SQL pass computes the initial, period and ending balances "
+        "of the accounts and partners with one query over the journal items, "
+        "which is faster on large databases. It is not used when grouping by "
+        "analytic account.",
+    )
 
     @api.onchange("grouped_by")
     def onchange_grouped_by(self):
@@ -277,6 +287,7 @@ class TrialBalanceReportWizard(models.TransientModel):
             "unaffected_earnings_account": self.unaffected_earnings_account.id,
             "account_financial_report_lang": self.env.lang,
             "grouped_by": self.grouped_by,
+            "engine": self.engine,
         }
 
     def _export(self, report_type):
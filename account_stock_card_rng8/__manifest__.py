@@ -11,6 +11,7 @@
         "account_payment_collection_report",
         "stock",
         "product",
+        "inventory_stock_card",
     ],
     "data": [
         "security/ir.model.access.csv",
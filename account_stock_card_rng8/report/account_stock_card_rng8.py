@@ -67,14 +67,9 @@ class AccountStockCardRNG8(models.TransientModel):
             )
         return [self.location_id.id]
 
-    def _compute_period_data(self, product, location_ids, date_from_utc, date_to_utc):
-        """
-        TH: คำนวณข้อมูลการเคลื่อนไหวของสินค้า (ยอดยกมา, รับเข้า, จ่ายออก, คงเหลือ) ตามช่วงเวลาและคลังสินค้าที่กำหนด
-        EN: Compute product movement data (opening, incoming, outgoing, ending) based on the specified period and locations.
-        """
-        domain = [
+    def _get_period_domain(self, location_ids, date_to_utc):
+        return [
             ("state", "=", "done"),
-            ("product_id", "=", product.id),
             ("company_id", "=", self.company_id.id),
             ("date", "<=", date_to_utc),
             "|",
@@ -82,12 +77,72 @@ class AccountStockCardRNG8(models.TransientModel):
             ("location_dest_id", "in", location_ids),
         ]
 
-        move_lines = self.env["stock.move.line"].search(domain)
+    def _iter_period_data(self, products, location_ids, date_from_utc, date_to_utc):
+        """
+        TH: คำนวณข้อมูลการเคลื่อนไหวของสินค้าทั้งหมด โดยค้นหา stock.move.line ครั้งเดียว
+        EN: Yield (product, period data) for each product, the move lines of all the products being searched at once.
+        """
+        # ยอดยกมาของเดือนที่ปิดแล้ว / opening of the closed months
+        cutoff, closings = self.env["inventory.stock.card.closing"]._get_openings(
+            self.company_id.id,
+            products.ids,
+            location_ids,
+            date_from_utc,
+            siblings=False,
+        )
+        domain = self._get_period_domain(location_ids, date_to_utc)
+        if cutoff:
+            domain.append(("date", ">=", cutoff))
+        query_mixin = self.env["inventory.stock.card.query.mixin"]
+        for product, move_lines in query_mixin._iter_product_move_lines(
+            products, domain
+        ):
+            yield product, self._compute_period_data(
+                product,
+                location_ids,
+                date_from_utc,
+                date_to_utc,
+                move_lines=move_lines,
+                opening=closings.get(product.id, (0.0, 0.0)),
+            )
+
+    def _compute_period_data(
+        self,
+        product,
+        location_ids,
+        date_from_utc,
+        date_to_utc,
+        move_lines=None,
+        opening=None,
+    ):
+        """
+        TH: คำนวณข้อมูลการเคลื่อนไหวของสินค้า (ยอดยกมา, รับเข้า, จ่ายออก, คงเหลือ) ตามช่วงเวลาและคลังสินค้าที่กำหนด
+        EN: Compute product movement data (opening, incoming, outgoing, ending) based on the specified period and locations.
+        """
+        if move_lines is None:
+            domain = self._get_period_domain(location_ids, date_to_utc)
+            domain.append(("product_id", "=", product.id))
+            # ยอดยกมาของเดือนที่ปิดแล้ว / opening of the closed months
+            cutoff, closings = self.env["inventory.stock.card.closing"]._get_openings(
+                self.company_id.id,
+                product.ids,
+                location_ids,
+                date_from_utc,
+                siblings=False,
+            )
+            opening = closings.get(product.id, (0.0, 0.0))
+            if cutoff:
+                domain.append(("date", ">=", cutoff))
+            move_lines = self.env["stock.move.line"].search(domain)
+        open_qty, open_val = opening or (0.0, 0.0)
+        unit_costs = self.env["inventory.stock.card.query.mixin"]._get_line_unit_costs(
+            move_lines, self.company_id.id, siblings=False
+        )
         product_uom = product.uom_id
 
         data = {
-            "open_qty": 0.0,
-            "open_val": 0.0,
+            "open_qty": open_qty,
+            "open_val": open_val,
             "in_qty": 0.0,
             "in_val": 0.0,
             "out_qty": 0.0,
@@ -101,16 +156,7 @@ class AccountStockCardRNG8(models.TransientModel):
             if line.product_uom_id and line.product_uom_id != product_uom:
                 qty = line.product_uom_id._compute_quantity(qty, product_uom)
 
-            unit_cost = 0.0
-            layers = line.move_id.stock_valuation_layer_ids
-            if layers:
-                val_sum = sum(layers.mapped("value"))
-                qty_sum = sum(layers.mapped("quantity"))
-                if qty_sum:
-                    unit_cost = abs(val_sum / qty_sum)
-
-            if unit_cost == 0.0:
-                unit_cost = line.move_id.price_unit or product.standard_price
+            unit_cost = unit_costs[line.id]
 
             is_in = (line.location_dest_id.id in location_ids) and (
                 line.location_id.id not in location_ids
@@ -181,10 +227,9 @@ class AccountStockCardRNG8(models.TransientModel):
         location_ids = self._get_location_ids()
 
         lines = []
-        for product in products:
-            res = self._compute_period_data(
-                product, location_ids, date_from_utc, date_to_utc
-            )
+        for product, res in self._iter_period_data(
+            products, location_ids, date_from_utc, date_to_utc
+        ):
 
             if (
                 abs(res["open_qty"]) < 0.001
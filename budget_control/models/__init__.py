@@ -12,6 +12,7 @@ from . import analytic_account
 
 # Base Model
 from . import base_budget_move
+from . import budget_analytic_balance
 
 # Operation Data
 from . import budget_plan
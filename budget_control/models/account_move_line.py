@@ -33,10 +33,9 @@ class AccountMoveLine(models.Model):
         return res
 
     def recompute_budget_move(self):
-        for invoice_line in self:
-            invoice_line.budget_move_ids.unlink()
-            # Commit on invoice
-            invoice_line.commit_budget()
+        self.mapped("budget_move_ids").unlink()
+        # Commit on invoice
+        self.commit_budget_batch()
 
     def _init_docline_budget_vals(self, budget_vals, analytic_id):
         self.ensure_one()
@@ -1,11 +1,23 @@
 # Copyright 2020 Ecosoft Co., Ltd. (http://ecosoft.co.th)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
 from datetime import datetime
 from json import dumps
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.sql import table_exists
+
+# Fields of a budget move changing the budget analytic balances
+BALANCE_FIELDS = {
+    "analytic_account_id",
+    "template_line_id",
+    "kpi_id",
+    "date",
+    "debit",
+    "credit",
+}
 
 
 class BaseBudgetMove(models.AbstractModel):
@@ -94,6 +106,39 @@ class BaseBudgetMove(models.AbstractModel):
         help="This budget move line is the result of 'Forward Budget Commitment'",
     )
 
+    def init(self):
+        if self._abstract or not table_exists(self.env.cr, "budget_analytic_balance"):
+            return
+        Balance = self.env["budget.analytic.balance"]
+        amount_type = Balance._get_amount_type(self._name)
+        if amount_type:
+            Balance._rebuild([amount_type])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        budget_moves = super().create(vals_list)
+        self.env["budget.analytic.balance"]._update_balances(budget_moves)
+        self.env["budget.monitor.report"]._refresh_store(budget_moves)
+        return budget_moves
+
+    def write(self, vals):
+        if not BALANCE_FIELDS.intersection(vals):
+            res = super().write(vals)
+        else:
+            Balance = self.env["budget.analytic.balance"]
+            Balance._update_balances(self, sign=-1)
+            res = super().write(vals)
+            Balance._update_balances(self)
+        self.env["budget.monitor.report"]._refresh_store(self)
+        return res
+
+    def unlink(self):
+        self.env["budget.analytic.balance"]._update_balances(self, sign=-1)
+        budget_moves = self.browse(self.ids)
+        res = super().unlink()
+        self.env["budget.monitor.report"]._refresh_store(budget_moves)
+        return res
+
     @api.depends("template_line_id")
     def _compute_kpi_id(self):
         for rec in self:
@@ -344,9 +389,18 @@ class BudgetDoclineMixin(models.AbstractModel):
     def _get_amount_convert_currency(
         self, amount_currency, currency, company, date_commit
     ):
-        return currency._convert(
-            amount_currency, company.currency_id, company, date_commit
-        )
+        # Rates shared by the doclines of commit_budget_batch()
+        rates = self.env.context.get("budget_currency_rates")
+        if rates is None:
+            return currency._convert(
+                amount_currency, company.currency_id, company, date_commit
+            )
+        key = (currency.id, company.id, date_commit)
+        if key not in rates:
+            rates[key] = currency._get_conversion_rate(
+                currency, company.currency_id, company, date_commit
+            )
+        return company.currency_id.round(amount_currency * rates[key])
 
     def _update_budget_commitment(self, budget_vals, analytic, reverse=False):
         self.ensure_one()
@@ -417,6 +471,43 @@ class BudgetDoclineMixin(models.AbstractModel):
             budget_move.kpi_id = template_line.kpi_id.id
         return budget_move
 
+    def _update_template_lines(self, budget_moves_by_docline):
+        """Same as _update_template_line() on each docline, with one write
+        per template line.
+
+        :param budget_moves_by_docline: {docline id: new budget moves}
+        """
+        BudgetPeriod = self.env["budget.period"]
+        budget_periods = {}
+        template_moves = defaultdict(list)
+        for docline in self:
+            if docline.date_commit not in budget_periods:
+                budget_periods[docline.date_commit] = (
+                    BudgetPeriod._get_eligible_budget_period(docline.date_commit)
+                )
+            budget_period = budget_periods[docline.date_commit]
+            if not budget_period:
+                continue
+            controls = BudgetPeriod.with_context(need_control=True)._prepare_controls(
+                budget_period, docline
+            )
+            template_lines = budget_period.template_id.line_ids
+            # Get KPI, when possible.
+            if controls and template_lines:
+                template_line = BudgetPeriod._get_kpi_by_control_key(
+                    template_lines, controls[0]
+                )
+                template_moves[template_line] += budget_moves_by_docline[docline.id]
+        BudgetMove = self.env[self._budget_model()]
+        for template_line, budget_move_ids in template_moves.items():
+            BudgetMove.browse(budget_move_ids).write(
+                {
+                    "template_line_id": template_line.id,
+                    # Set KPI for check budget
+                    "kpi_id": template_line.kpi_id.id,
+                }
+            )
+
     def _get_domain_fwd_line(self, docline):
         return [
             ("res_model", "=", docline._name),
@@ -522,6 +613,58 @@ class BudgetDoclineMixin(models.AbstractModel):
             )
         )
 
+    def _prepare_budget_commit_vals(self, reverse=False, **vals):
+        """Return the values of the budget moves of the docline,
+        one per analytic account, or False when there is nothing to commit"""
+        self.ensure_one()
+        budget_commit_vals = []
+        # Specific analytic account
+        if vals.get("analytic_account_id", False):
+            analytic_account = vals["analytic_account_id"]
+        else:
+            analytic_account = self._convert_analytics(
+                analytic_distribution=vals.get("analytic_distribution", False)
+            )
+            # Delete analytic_distribution from vals
+            if vals.get("analytic_distribution", "/") != "/":
+                del vals["analytic_distribution"]
+
+        for analytic in analytic_account:
+            # Set amount_currency
+            budget_vals = self._init_docline_budget_vals(vals, analytic.id)
+            # Case budget_include_tax = True
+            budget_vals = self._budget_include_tax(budget_vals)
+            # Case force use_amount_commit, this should overwrite tax compute
+            if self.env.context.get("use_amount_commit"):
+                budget_vals["amount_currency"] = self.amount_commit[str(analytic.id)]
+            # Case forward_commit
+            if self.env.context.get("fwd_amount_commit"):
+                budget_vals["amount_currency"] = self.env.context.get(
+                    "fwd_amount_commit"
+                )
+            # Only on case reverse, to force use return_amount_commit
+            if reverse and "return_amount_commit" in self.env.context:
+                budget_vals["amount_currency"] = self.env.context.get(
+                    "return_amount_commit"
+                )
+            # Complete budget commitment dict
+            budget_vals = self._update_budget_commitment(
+                budget_vals, analytic, reverse=reverse
+            )
+            # Final note
+            budget_vals["note"] = self.env.context.get("commit_note")
+            # Is Adjustment Commit
+            budget_vals["adj_commit"] = self.env.context.get("adj_commit")
+            # Is Forward Commit
+            budget_vals["fwd_commit"] = self.env.context.get("fwd_commit")
+            # Create budget move
+            if not budget_vals["amount_currency"]:
+                return False
+            budget_commit_vals.append(budget_vals.copy())
+            # Clear old values for case multi analytics
+            del budget_vals["amount_currency"]
+        return budget_commit_vals
+
     def commit_budget(self, reverse=False, **vals):
         """Create budget commit for each docline"""
         if self._check_required_analytic():
@@ -529,54 +672,11 @@ class BudgetDoclineMixin(models.AbstractModel):
         self.prepare_commit()
         to_commit = self.env.context.get("force_commit") or self._valid_commit_state()
         if self.can_commit and to_commit:
-            budget_commit_vals = []
-            # Specific analytic account
-            if vals.get("analytic_account_id", False):
-                analytic_account = vals["analytic_account_id"]
-            else:
-                analytic_account = self._convert_analytics(
-                    analytic_distribution=vals.get("analytic_distribution", False)
-                )
-                # Delete analytic_distribution from vals
-                if vals.get("analytic_distribution", "/") != "/":
-                    del vals["analytic_distribution"]
-
-            for analytic in analytic_account:
-                # Set amount_currency
-                budget_vals = self._init_docline_budget_vals(vals, analytic.id)
-                # Case budget_include_tax = True
-                budget_vals = self._budget_include_tax(budget_vals)
-                # Case force use_amount_commit, this should overwrite tax compute
-                if self.env.context.get("use_amount_commit"):
-                    budget_vals["amount_currency"] = self.amount_commit[
-                        str(analytic.id)
-                    ]
-                # Case forward_commit
-                if self.env.context.get("fwd_amount_commit"):
-                    budget_vals["amount_currency"] = self.env.context.get(
-                        "fwd_amount_commit"
-                    )
-                # Only on case reverse, to force use return_amount_commit
-                if reverse and "return_amount_commit" in self.env.context:
-                    budget_vals["amount_currency"] = self.env.context.get(
-                        "return_amount_commit"
-                    )
-                # Complete budget commitment dict
-                budget_vals = self._update_budget_commitment(
-                    budget_vals, analytic, reverse=reverse
-                )
-                # Final note
-                budget_vals["note"] = self.env.context.get("commit_note")
-                # Is Adjustment Commit
-                budget_vals["adj_commit"] = self.env.context.get("adj_commit")
-                # Is Forward Commit
-                budget_vals["fwd_commit"] = self.env.context.get("fwd_commit")
-                # Create budget move
-                if not budget_vals["amount_currency"]:
-                    return False
-                budget_commit_vals.append(budget_vals.copy())
-                # Clear old values for case multi analytics
-                del budget_vals["amount_currency"]
+            budget_commit_vals = self._prepare_budget_commit_vals(
+                reverse=reverse, **vals
+            )
+            if budget_commit_vals is False:
+                return False
             budget_move = self.env[self._budget_model()].create(budget_commit_vals)
             # Update Template Line
             budget_move = self._update_template_line(budget_move)
@@ -586,6 +686,46 @@ class BudgetDoclineMixin(models.AbstractModel):
         else:
             self[self._budget_field()].unlink()
 
+    def commit_budget_batch(self, reverse=False, **vals):
+        """Same as commit_budget() on each docline, for many doclines.
+
+        The values of all the budget moves are prepared first, sharing the
+        currency rates by currency and date, then created with a single
+        create(). Template lines are written once per template line and,
+        on reverse, the over returned budget is checked at the end.
+        """
+        BudgetMove = self.env[self._budget_model()]
+        doclines = self.with_context(budget_currency_rates={})
+        budget_commit_vals = []
+        committed = []
+        to_unlink = BudgetMove
+        for docline in doclines:
+            if docline._check_required_analytic():
+                raise UserError(self.env._("Please fill analytic account."))
+            docline.prepare_commit()
+            to_commit = (
+                self.env.context.get("force_commit") or docline._valid_commit_state()
+            )
+            if not (docline.can_commit and to_commit):
+                to_unlink |= docline[docline._budget_field()]
+                continue
+            docline_vals = docline._prepare_budget_commit_vals(reverse=reverse, **vals)
+            if not docline_vals:
+                continue
+            budget_commit_vals += docline_vals
+            committed += [docline] * len(docline_vals)
+        to_unlink.unlink()
+        budget_moves = BudgetMove.create(budget_commit_vals)
+        budget_moves_by_docline = defaultdict(list)
+        for docline, budget_move in zip(committed, budget_moves, strict=True):
+            budget_moves_by_docline[docline.id].append(budget_move.id)
+        doclines = self.browse(list(budget_moves_by_docline))
+        doclines._update_template_lines(budget_moves_by_docline)
+        if reverse:  # On reverse, make sure not over returned
+            for docline in doclines:
+                self.env["budget.period"].check_over_returned_budget(docline)
+        return budget_moves
+
     def _required_fields_to_commit(self):
         return [self._budget_analytic_field]
 
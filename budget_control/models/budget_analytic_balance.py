@@ -0,0 +1,146 @@
+# Copyright 2020 Ecosoft Co., Ltd. (http://ecosoft.co.th)
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from collections import defaultdict
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_unique_index, table_exists
+
+
+class BudgetAnalyticBalance(models.Model):
+    """Commitments and actuals summed per analytic account, KPI, date
+    and amount type.
+
+    Kept up to date by the budget moves on create, write and unlink, so
+    the budget check of a document does not scan the budget move tables
+    (see budget.period._get_budget_availables). It mirrors the budget move
+    tables, the filters added by the _where_* hooks of the budget
+    monitoring report are not applied here.
+    """
+
+    _name = "budget.analytic.balance"
+    _description = "Budget Analytic Balance"
+    _order = "analytic_account_id, date"
+
+    analytic_account_id = fields.Many2one(
+        comodel_name="account.analytic.account",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    kpi_id = fields.Many2one(
+        comodel_name="budget.kpi",
+        string="KPI",
+        readonly=True,
+        ondelete="cascade",
+    )
+    date = fields.Date(
+        required=True,
+        readonly=True,
+    )
+    amount_type = fields.Char(
+        required=True,
+        readonly=True,
+    )
+    amount = fields.Float(
+        readonly=True,
+        digits="Budget Precision",
+    )
+
+    def init(self):
+        create_unique_index(
+            self.env.cr,
+            "budget_analytic_balance_key_uniq",
+            self._table,
+            ["analytic_account_id", "COALESCE(kpi_id, 0)", "date", "amount_type"],
+        )
+        self._rebuild()
+
+    @api.model
+    def _get_amount_type(self, budget_move_model):
+        """Return the amount type of the budget moves of the model"""
+        table = self.env[budget_move_model]._table
+        Monitor = self.env["budget.monitor.report"]
+        for source in Monitor._get_consumed_sources():
+            if source["budget_move"][0] == table:
+                return source["type"][0]
+        return False
+
+    @api.model
+    def _rebuild(self, amount_types=None):
+        """Rebuild the balances from the budget move tables,
+        for all the amount types if none is given"""
+        cr = self.env.cr
+        Monitor = self.env["budget.monitor.report"]
+        if amount_types is None:
+            cr.execute(SQL("DELETE FROM budget_analytic_balance"))
+        for source in Monitor._get_consumed_sources():
+            budget_table = source["budget_move"][0]
+            amount_type = source["type"][0]
+            if amount_types is not None and amount_type not in amount_types:
+                continue
+            if not table_exists(cr, budget_table):
+                continue
+            cr.execute(
+                SQL(
+                    "DELETE FROM budget_analytic_balance WHERE amount_type = %s",
+                    amount_type,
+                )
+            )
+            cr.execute(
+                SQL(
+                    """
+                    INSERT INTO budget_analytic_balance
+                        (analytic_account_id, kpi_id, date, amount_type, amount)
+                    SELECT analytic_account_id, kpi_id, date, %s,
+                        SUM(credit - debit)
+                    FROM %s
+                    WHERE analytic_account_id IS NOT NULL
+                    GROUP BY analytic_account_id, kpi_id, date
+                    """,
+                    amount_type,
+                    SQL.identifier(budget_table),
+                )
+            )
+        self.invalidate_model()
+
+    @api.model
+    def _update_balances(self, budget_moves, sign=1):
+        """Add the amounts of the budget moves to the balances,
+        or subtract them with sign=-1"""
+        if not budget_moves:
+            return
+        amount_type = self._get_amount_type(budget_moves._name)
+        if not amount_type:
+            return
+        amounts = defaultdict(float)
+        for budget_move in budget_moves:
+            if not budget_move.analytic_account_id:
+                continue
+            key = (
+                budget_move.analytic_account_id.id,
+                budget_move.kpi_id.id or None,
+                budget_move.date,
+            )
+            amounts[key] += sign * (budget_move.credit - budget_move.debit)
+        if not amounts:
+            return
+        values = SQL(", ").join(
+            SQL("(%s, %s, %s, %s, %s)", *key, amount_type, amount)
+            for key, amount in amounts.items()
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO budget_analytic_balance
+                    (analytic_account_id, kpi_id, date, amount_type, amount)
+                VALUES %s
+                ON CONFLICT
+                    (analytic_account_id, (COALESCE(kpi_id, 0)), date, amount_type)
+                DO UPDATE SET amount = budget_analytic_balance.amount + EXCLUDED.amount
+                """,
+                values,
+            )
+        )
+        self.invalidate_model()
@@ -380,6 +380,20 @@ class BudgetControl(models.Model):
                     ).format(amount=rec.amount_initial, symbol=rec.currency_id.symbol)
                 )
 
+    def write(self, vals):
+        res = super().write(vals)
+        # Budget lines of the monitoring show the name and state of their sheet
+        self.env["budget.monitor.report"]._refresh_store(
+            self.with_context(active_test=False).line_ids
+        )
+        return res
+
+    def unlink(self):
+        lines = self.with_context(active_test=False).line_ids
+        res = super().unlink()
+        self.env["budget.monitor.report"]._refresh_store(lines)
+        return res
+
     def action_draft(self):
         return self.write({"state": "draft"})
 
@@ -573,3 +587,20 @@ class BudgetControlLine(models.Model):
     def _compute_active(self):
         for rec in self:
             rec.active = rec.budget_control_id.active if rec.budget_control_id else True
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env["budget.monitor.report"]._refresh_store(lines)
+        return lines
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env["budget.monitor.report"]._refresh_store(self)
+        return res
+
+    def unlink(self):
+        lines = self.browse(self.ids)
+        res = super().unlink()
+        self.env["budget.monitor.report"]._refresh_store(lines)
+        return res
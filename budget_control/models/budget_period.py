@@ -1,6 +1,8 @@
 # Copyright 2020 Ecosoft Co., Ltd. (http://ecosoft.co.th)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools import SQL, float_compare, format_amount
@@ -89,6 +91,29 @@ class BudgetPeriod(models.Model):
         for rec in self:
             rec.account = rec.control_budget
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        budget_periods = super().create(vals_list)
+        self._rebuild_budget_monitor()
+        return budget_periods
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"bm_date_from", "bm_date_to", "plan_date_range_type_id"}.intersection(vals):
+            self._rebuild_budget_monitor()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._rebuild_budget_monitor()
+        return res
+
+    def _rebuild_budget_monitor(self):
+        """Budget period of the monitoring rows is found by date"""
+        Monitor = self.env["budget.monitor.report"]
+        if Monitor._is_materialized():
+            Monitor._rebuild_store()
+
     @api.model
     def check_budget_constraint(self, budget_constraints, doclines):
         error_messages = []
@@ -411,6 +436,46 @@ class BudgetPeriod(models.Model):
         )
         return self.env.cr.dictfetchall()
 
+    def _get_budget_availables(self, analytic_ids):
+        """Return the amounts of the analytic accounts grouped by analytic,
+        KPI, budget period and amount type, in a single query.
+
+        Budget amounts are read from the budget control lines and the
+        commitments and actuals from budget.analytic.balance.
+        """
+        self.env.flush_all()
+        Monitor = self._get_budget_monitor_report()
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT a.analytic_account_id, a.kpi_id,
+                    p.id AS budget_period_id, a.amount_type,
+                    SUM(a.amount) AS amount
+                FROM (
+                    SELECT l.analytic_account_id, l.kpi_id, l.date_to AS date,
+                        '10_budget' AS amount_type, l.amount
+                    FROM budget_control_line l
+                    INNER JOIN budget_control b ON l.budget_control_id = b.id
+                    WHERE b.active = TRUE
+                        AND l.analytic_account_id IN %(analytic_ids)s
+                    UNION ALL
+                    SELECT analytic_account_id, kpi_id, date, amount_type, amount
+                    FROM budget_analytic_balance
+                    WHERE analytic_account_id IN %(analytic_ids)s
+                        AND amount_type IN %(amount_types)s
+                ) a
+                LEFT JOIN budget_period p
+                    ON a.date between p.bm_date_from AND p.bm_date_to
+                LEFT JOIN date_range d ON a.date between d.date_start AND d.date_end
+                    AND d.type_id = p.plan_date_range_type_id
+                GROUP BY a.analytic_account_id, a.kpi_id, p.id, a.amount_type
+                """,
+                analytic_ids=tuple(analytic_ids),
+                amount_types=tuple(x[0] for x in Monitor._get_budget_amount_type()),
+            )
+        )
+        return self.env.cr.dictfetchall()
+
     def _get_balance_currency(self, company, balance, doc_currency, date_commit):
         """Convert balance to balance currency (multi-currency)"""
         return company.currency_id._convert(balance, doc_currency, company, date_commit)
@@ -427,6 +492,12 @@ class BudgetPeriod(models.Model):
         company = self.env.user.company_id
         doc_currency = self.env.context.get("doc_currency")
         date_commit = self.env.context.get("date_commit")
+        # Get the amounts of all the analytic accounts of the document at once
+        analytic_data = defaultdict(list)
+        if controls:
+            analytic_ids = {control["analytic_id"] for control in controls}
+            for query in self._get_budget_availables(analytic_ids):
+                analytic_data[query["analytic_account_id"]].append(query)
         for control in controls:
             analytic_id = control["analytic_id"]
             # Get the KPI(s) to check the budget,
@@ -436,9 +507,10 @@ class BudgetPeriod(models.Model):
                     all_template_lines, control
                 )
             # Get the available budget for the specified analytic account and KPI(s)
-            query_data = self.with_context(
-                control_level=budget_period.control_level
-            )._get_budget_avaiable(analytic_id, template_lines)
+            query_data = analytic_data[analytic_id]
+            if template_lines and budget_period.control_level != "analytic":
+                kpi_ids = template_lines.kpi_id.ids
+                query_data = [q for q in query_data if q["kpi_id"] in kpi_ids]
             # Check kpi not valid for budgeting when control level analytic & kpi
             data_budget = any(
                 query["amount_type"] == "10_budget" for query in query_data
@@ -41,6 +41,10 @@ class ResConfigSettings(models.TransientModel):
         string="Enable Date Commit",
         implied_group="budget_control.group_budget_date_commit",
     )
+    budget_monitor_materialized = fields.Boolean(
+        string="Materialized Budget Monitoring",
+        config_parameter="budget_control.monitor_materialized",
+    )
     # Modules
     budget_control_account = fields.Boolean(
         string="Account",
@@ -51,3 +55,14 @@ class ResConfigSettings(models.TransientModel):
     module_budget_control_purchase = fields.Boolean(string="Purchase")
     module_budget_control_expense = fields.Boolean(string="Expense")
     module_budget_control_advance_clearing = fields.Boolean(string="Advance/Clearing")
+
+    def set_values(self):
+        Monitor = self.env["budget.monitor.report"]
+        materialized = Monitor._is_materialized()
+        res = super().set_values()
+        if self.budget_monitor_materialized and not materialized:
+            Monitor._rebuild_store()
+        return res
+
+    def action_rebuild_budget_monitor(self):
+        self.env["budget.monitor.report"]._rebuild_store()
@@ -3,6 +3,10 @@
 
 from odoo import api, fields, models
 from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Table of the materialized budget monitoring
+STORE_TABLE = "budget_monitor_report_store"
 
 
 class BudgetMonitorReport(models.Model):
@@ -59,8 +63,101 @@ class BudgetMonitorReport(models.Model):
 
     @property
     def _table_query(self) -> SQL:
+        if self._is_materialized():
+            return SQL(
+                "SELECT * FROM %s WHERE amount_type IN %s",
+                SQL.identifier(STORE_TABLE),
+                tuple(["10_budget"] + [x[0] for x in self._get_budget_amount_type()]),
+            )
+        return self._get_table_query()
+
+    @api.model
+    def _get_table_query(self) -> SQL:
         return SQL("%s %s %s", self._select(), self._from(), self._where())
 
+    def init(self):
+        if self._is_materialized():
+            self._rebuild_store()
+
+    # Materialized storage
+    @api.model
+    def _is_materialized(self):
+        """Read the monitoring from STORE_TABLE instead of the union of
+        the budget lines and all the consumed sources"""
+        return bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("budget_control.monitor_materialized")
+        )
+
+    @api.model
+    def _rebuild_store(self):
+        """Build the materialized monitoring again from scratch"""
+        self.env.flush_all()
+        cr = self.env.cr
+        cr.execute(SQL("DROP TABLE IF EXISTS %s", SQL.identifier(STORE_TABLE)))
+        cr.execute(
+            SQL(
+                "CREATE TABLE %s AS %s",
+                SQL.identifier(STORE_TABLE),
+                self._get_table_query(),
+            )
+        )
+        create_index(cr, f"{STORE_TABLE}_id_index", STORE_TABLE, ["id"])
+        create_index(
+            cr,
+            f"{STORE_TABLE}_period_index",
+            STORE_TABLE,
+            ["budget_period_id", "analytic_account_id", "kpi_id", "amount_type"],
+        )
+
+    @api.model
+    def _get_store_prefix(self, table):
+        """Return the id prefix of the monitoring rows of the table"""
+        if table == "budget_control_line":
+            return 1
+        for source in self._get_consumed_sources():
+            if source["budget_move"][0] == table:
+                return int(source["type"][0][:1])
+        return False
+
+    @api.model
+    def _refresh_store(self, records):
+        """Refresh the materialized rows of budget control lines or budget
+        moves, after they are created, changed or deleted"""
+        if not records or not self._is_materialized():
+            return
+        prefix = self._get_store_prefix(records._table)
+        if not prefix:
+            return
+        self.env.flush_all()
+        cr = self.env.cr
+        cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE id IN %s",
+                SQL.identifier(STORE_TABLE),
+                tuple(prefix * 1000000000 + id_ for id_ in records.ids),
+            )
+        )
+        query = self.with_context(
+            budget_monitor_refresh_ids={records._table: tuple(records.ids)}
+        )._get_table_query()
+        cr.execute(SQL("INSERT INTO %s %s", SQL.identifier(STORE_TABLE), query))
+
+    @api.model
+    def _get_refresh_from(self, table):
+        """Return the FROM item of the table, only with the records being
+        refreshed when refreshing the materialized monitoring"""
+        refresh_ids = self.env.context.get("budget_monitor_refresh_ids")
+        if refresh_ids is None:
+            return table
+        ids = refresh_ids.get(table)
+        # Written as literals, as _get_sql() extensions only keep the code
+        where = "FALSE"
+        if ids:
+            where = f"id IN ({', '.join(str(int(id_)) for id_ in ids)})"
+        return f"(SELECT * FROM {table} WHERE {where})"
+
     @api.model
     def _select(self) -> SQL:
         return SQL(
@@ -162,7 +259,7 @@ class BudgetMonitorReport(models.Model):
             doc_field = source["source_doc"][1]  # i.e., move_id
             amount_type = source["type"][0]  # i.e., 80_actual
             sql_from[amount_type] = f"""
-                FROM {budget_table} a
+                FROM {self._get_refresh_from(budget_table)} a
                 LEFT OUTER JOIN {doc_table} b ON a.{doc_field} = b.id
                 LEFT OUTER JOIN res_company c ON b.company_id = c.id
             """
@@ -193,8 +290,8 @@ class BudgetMonitorReport(models.Model):
     @api.model
     def _from_budget(self) -> SQL:
         return SQL(
-            """
-            FROM budget_control_line a
+            f"""
+            FROM {self._get_refresh_from("budget_control_line")} a
             INNER JOIN budget_control b ON a.budget_control_id = b.id
             LEFT JOIN budget_control_company_rel c
                 ON b.id = c.budget_control_id
@@ -479,3 +479,103 @@ class TestBudgetControl(BudgetControlCommon):
 
         budget_commit_forward.action_draft()
         self.assertEqual(budget_commit_forward.state, "draft")
+
+    @freeze_time("2001-02-01")
+    def test_17_budget_analytic_balance(self):
+        """Analytic balances follow the budget moves and match the monitoring"""
+        Balance = self.env["budget.analytic.balance"]
+        domain = [("analytic_account_id", "=", self.costcenter1.id)]
+        analytic_distribution = {self.costcenter1.id: 100}
+        bill1 = self._create_simple_bill(analytic_distribution, self.account_kpi1, 100)
+        bill1.action_post()
+        self.assertTrue(bill1.budget_move_ids)
+        balances = Balance.search(domain)
+        self.assertEqual(balances.kpi_id, self.kpi1)
+        self.assertAlmostEqual(sum(balances.mapped("amount")), -100.0)
+        monitors = self.env["budget.monitor.report"].search(
+            domain + [("amount_type", "=", "80_actual")]
+        )
+        self.assertAlmostEqual(
+            sum(monitors.mapped("amount")), sum(balances.mapped("amount"))
+        )
+        # Same result from a full rebuild
+        Balance._rebuild()
+        self.assertAlmostEqual(sum(Balance.search(domain).mapped("amount")), -100.0)
+        # Budget and actual of the analytic in a single query
+        query_data = self.budget_period._get_budget_availables([self.costcenter1.id])
+        balance = sum(
+            q["amount"]
+            for q in query_data
+            if q["budget_period_id"] == self.budget_period.id
+        )
+        self.assertAlmostEqual(balance, 2300.0)
+        # Return budget
+        bill1.button_draft()
+        self.assertFalse(bill1.budget_move_ids)
+        self.assertAlmostEqual(sum(Balance.search(domain).mapped("amount")), 0.0)
+
+    @freeze_time("2001-02-01")
+    def test_18_materialized_budget_monitor(self):
+        """Materialized monitoring is refreshed with the budget moves and lines"""
+        Monitor = self.env["budget.monitor.report"]
+        domain = [("analytic_account_id", "=", self.costcenter1.id)]
+        self.env["ir.config_parameter"].sudo().set_param(
+            "budget_control.monitor_materialized", True
+        )
+        Monitor._rebuild_store()
+        self.assertTrue(Monitor._is_materialized())
+        self.assertAlmostEqual(sum(Monitor.search(domain).mapped("amount")), 2400.0)
+        # New budget moves
+        analytic_distribution = {self.costcenter1.id: 100}
+        bill1 = self._create_simple_bill(analytic_distribution, self.account_kpi1, 100)
+        bill1.action_post()
+        Monitor.invalidate_model()
+        self.assertAlmostEqual(sum(Monitor.search(domain).mapped("amount")), 2300.0)
+        # Budget lines show the state of their sheet
+        self.budget_control.action_submit()
+        Monitor.invalidate_model()
+        budget_lines = Monitor.search(domain + [("amount_type", "=", "10_budget")])
+        self.assertEqual(set(budget_lines.mapped("budget_state")), {"submit"})
+        # Deleted budget moves
+        bill1.button_draft()
+        Monitor.invalidate_model()
+        self.assertAlmostEqual(sum(Monitor.search(domain).mapped("amount")), 2400.0)
+
+    @freeze_time("2001-02-01")
+    def test_19_commit_budget_batch(self):
+        """Batch commit creates the same budget moves as line by line"""
+        analytic_distribution = {self.costcenter1.id: 100}
+        bill1 = self._create_invoice(
+            "in_invoice",
+            self.vendor,
+            datetime.today(),
+            analytic_distribution,
+            [
+                {"account": self.account_kpi1.id, "price_unit": 100},
+                {"account": self.account_kpi2.id, "price_unit": 200},
+                {"account": self.account_kpi1.id, "price_unit": 300},
+            ],
+        )
+        bill1.action_post()
+
+        def get_moves():
+            return sorted(
+                (
+                    move.move_line_id.id,
+                    move.analytic_account_id.id,
+                    move.kpi_id.id,
+                    move.date,
+                    move.debit,
+                    move.credit,
+                )
+                for move in bill1.budget_move_ids
+            )
+
+        batch_moves = get_moves()
+        self.assertEqual(len(batch_moves), 3)
+        self.assertEqual(bill1.budget_move_ids.kpi_id, self.kpi1 | self.kpi2)
+        bill1.budget_move_ids.unlink()
+        for line in bill1.invoice_line_ids:
+            line.commit_budget()
+        bill1.invalidate_recordset()
+        self.assertEqual(get_moves(), batch_moves)
@@ -9,11 +9,13 @@
     "website": "https://www.365infotech.co.th/",
     "depends": [
         "stock",
+        "stock_account",
         "product",
         "web",
         "base"],
     "data": [
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/inventory_stock_card_action.xml",
         "wizards/inventory_stock_card_wizard_views.xml",
         "report/inventory_stock_card_report_views.xml",
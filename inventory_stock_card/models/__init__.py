@@ -1 +1,5 @@
-from . import inventory_stock_card_period
\ No newline at end of file
+from . import inventory_stock_card_period
+from . import inventory_stock_card_closing
+from . import res_company
+from . import stock_move
+from . import stock_valuation_layer
\ No newline at end of file
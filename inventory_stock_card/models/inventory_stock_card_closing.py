@@ -0,0 +1,309 @@
+# inventory_stock_card/models/inventory_stock_card_closing.py
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class InventoryStockCardClosing(models.Model):
+    """Monthly quantity and value moved in or out of an internal location.
+
+    One row per company, product, internal location and month (UTC), for
+    the months up to the closing date of the company. The opening balance
+    of a stock card is the sum of the closings before its start date plus
+    the move lines after the last closing.
+
+    The value is split by the source of the cost of the lines: their own
+    move, another move of the same origin, or the product, whose cost is
+    read when the opening is computed so that a change of the product cost
+    does not need to reopen the closings.
+
+    Rows are built by the "Stock Card: Monthly Closing" scheduled action.
+    Done move lines dated in a closed month (backdated or edited) and the
+    lines whose cost changes (new valuation layers such as landed costs,
+    new move price) reopen that month, which is built again on the next
+    run.
+    """
+
+    _name = "inventory.stock.card.closing"
+    _description = "Stock Card Monthly Closing"
+    _order = "company_id, date, product_id, location_id"
+
+    company_id = fields.Many2one(
+        "res.company", required=True, readonly=True, ondelete="cascade"
+    )
+    product_id = fields.Many2one(
+        "product.product", required=True, readonly=True, ondelete="cascade"
+    )
+    location_id = fields.Many2one(
+        "stock.location", required=True, readonly=True, ondelete="cascade"
+    )
+    date = fields.Date(
+        required=True, readonly=True, help="First day of the month of the closing."
+    )
+    qty = fields.Float(readonly=True, digits="Product Unit of Measure")
+    priced_value = fields.Float(
+        readonly=True, help="Value of the lines at the cost of their own move."
+    )
+    sibling_qty = fields.Float(
+        readonly=True,
+        digits="Product Unit of Measure",
+        help="Quantity of the lines valued at the cost of another move of "
+        "the same origin.",
+    )
+    sibling_value = fields.Float(
+        readonly=True,
+        help="Value of the lines at the cost of another move of the same origin.",
+    )
+    unpriced_qty = fields.Float(
+        readonly=True,
+        digits="Product Unit of Measure",
+        help="Quantity of the lines without cost, valued at the cost of the product.",
+    )
+
+    _sql_constraints = [
+        (
+            "company_product_location_date_unique",
+            "unique(company_id, product_id, location_id, date)",
+            "There can be only one closing per company, product, location and month.",
+        ),
+    ]
+
+    @api.model
+    def _get_closed_date(self):
+        """Last day of the previous month."""
+        return fields.Date.today() + relativedelta(day=1) - timedelta(days=1)
+
+    @api.model
+    def _get_openings(
+        self,
+        company_id,
+        product_ids,
+        location_ids,
+        date_from,
+        by_location=False,
+        siblings=True,
+    ):
+        """Return (cutoff, {product_id: (qty, value)}) where the quantities
+        and values are those of the lines before ``cutoff``, the lines from
+        ``cutoff`` to ``date_from`` remaining to be summed. ``cutoff`` is
+        None when there is no closing to use.
+
+        With ``by_location``, the keys are (product_id, location_id).
+        Without ``siblings``, the lines without a cost of their own are
+        valued at the cost of the product.
+        """
+        company = self.env["res.company"].sudo().browse(company_id)
+        closing_date = company.stock_card_closing_date
+        if not closing_date or not product_ids or not location_ids:
+            return None, {}
+        locations = self.env["stock.location"].sudo().browse(location_ids)
+        if any(loc.usage != "internal" for loc in locations):
+            return None, {}
+        date_from = fields.Datetime.to_datetime(date_from)
+        cutoff = min(
+            datetime.combine(closing_date + timedelta(days=1), time.min),
+            datetime.combine(date_from.date() + relativedelta(day=1), time.min),
+        )
+        if by_location:
+            group_by = SQL("ARRAY[product_id, location_id]")
+        else:
+            group_by = SQL("product_id")
+        self.flush_model()
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT %s,
+                       COALESCE(SUM(qty), 0),
+                       COALESCE(SUM(priced_value), 0),
+                       COALESCE(SUM(sibling_qty), 0),
+                       COALESCE(SUM(sibling_value), 0),
+                       COALESCE(SUM(unpriced_qty), 0)
+                FROM inventory_stock_card_closing
+                WHERE company_id = %s
+                  AND product_id IN %s
+                  AND location_id IN %s
+                  AND date < %s
+                GROUP BY %s
+                """,
+                group_by,
+                company_id,
+                tuple(product_ids),
+                tuple(location_ids),
+                cutoff.date(),
+                group_by,
+            )
+        )
+        rows = self.env.cr.fetchall()
+        products = (
+            self.env["product.product"]
+            .with_company(company_id)
+            .browse({row[0][0] if by_location else row[0] for row in rows})
+        )
+        costs = {product.id: product.standard_price for product in products}
+        openings = {}
+        for key, qty, priced, sibling_qty, sibling_value, unpriced in rows:
+            cost = costs[key[0] if by_location else key]
+            if siblings:
+                value = priced + sibling_value + unpriced * cost
+            else:
+                value = priced + (sibling_qty + unpriced) * cost
+            openings[tuple(key) if by_location else key] = (qty, value)
+        return cutoff, openings
+
+    @api.model
+    def _refresh(self, companies=None, full=False, auto_commit=False):
+        """Close the months ended since the previous run, or rebuild all
+        the closings of the companies if ``full`` is set.
+
+        The closing date moves forward month by month; with ``auto_commit``
+        each month is committed, an interrupted run resuming after the last
+        one."""
+        if companies is None:
+            companies = self.env["res.company"].search([])
+        closed_date = self._get_closed_date()
+        internal_ids = set(
+            self.env["stock.location"]
+            .with_context(active_test=False)
+            .search([("usage", "=", "internal")])
+            .ids
+        )
+        for company in companies.sudo():
+            closing_date = company.stock_card_closing_date
+            if full:
+                self.env.cr.execute(
+                    SQL(
+                        "DELETE FROM inventory_stock_card_closing WHERE company_id = %s",
+                        company.id,
+                    )
+                )
+                company.stock_card_closing_date = False
+                closing_date = None
+            if closing_date and closing_date >= closed_date:
+                continue
+            if closing_date:
+                month = closing_date + timedelta(days=1)
+            else:
+                first_line = self.env["stock.move.line"].search(
+                    [("state", "=", "done"), ("company_id", "=", company.id)],
+                    order="date",
+                    limit=1,
+                )
+                if not first_line:
+                    company.stock_card_closing_date = closed_date
+                    continue
+                month = first_line.date.date() + relativedelta(day=1)
+            while month <= closed_date:
+                self._close_month(company, month, internal_ids)
+                month += relativedelta(months=1)
+                company.stock_card_closing_date = month - timedelta(days=1)
+                if auto_commit:
+                    self.env.cr.commit()
+                    self.env.invalidate_all()
+            company.stock_card_closing_date = closed_date
+            if auto_commit:
+                self.env.cr.commit()
+        self.invalidate_model()
+
+    @api.model
+    def _close_month(self, company, month, internal_ids):
+        date_start = datetime.combine(month, time.min)
+        lines = (
+            self.env["stock.move.line"]
+            .with_company(company)
+            .search(
+                [
+                    ("state", "=", "done"),
+                    ("company_id", "=", company.id),
+                    ("date", ">=", date_start),
+                    ("date", "<", date_start + relativedelta(months=1)),
+                    "|",
+                    ("location_id", "in", list(internal_ids)),
+                    ("location_dest_id", "in", list(internal_ids)),
+                ]
+            )
+        )
+        query_mixin = self.env["inventory.stock.card.query.mixin"]
+        own_costs = query_mixin._get_line_unit_costs(
+            lines, company.id, siblings=False, product_cost=False
+        )
+        # cost of the line, else of the moves of the same origin
+        origin_costs = query_mixin._get_line_unit_costs(
+            lines, company.id, product_cost=False
+        )
+        # qty, priced_value, sibling_qty, sibling_value, unpriced_qty
+        totals = defaultdict(lambda: [0.0] * 5)
+        for line in lines:
+            product = line.product_id
+            qty = line.quantity
+            if line.product_uom_id and line.product_uom_id != product.uom_id:
+                qty = line.product_uom_id._compute_quantity(qty, product.uom_id)
+            amounts = [qty, 0.0, 0.0, 0.0, 0.0]
+            if own_costs[line.id]:
+                amounts[1] = qty * own_costs[line.id]
+            elif origin_costs[line.id]:
+                amounts[2] = qty
+                amounts[3] = qty * origin_costs[line.id]
+            else:
+                amounts[4] = qty
+            for location_id, sign in (
+                (line.location_id.id, -1),
+                (line.location_dest_id.id, 1),
+            ):
+                if location_id in internal_ids:
+                    total = totals[(product.id, location_id)]
+                    for i, amount in enumerate(amounts):
+                        total[i] += sign * amount
+        self.create(
+            [
+                {
+                    "company_id": company.id,
+                    "product_id": product_id,
+                    "location_id": location_id,
+                    "date": month,
+                    "qty": total[0],
+                    "priced_value": total[1],
+                    "sibling_qty": total[2],
+                    "sibling_value": total[3],
+                    "unpriced_qty": total[4],
+                }
+                for (product_id, location_id), total in totals.items()
+                if any(total)
+            ]
+        )
+        _logger.info(
+            "Stock card closing of %s for company %s: %s move lines",
+            month.strftime("%Y-%m"),
+            company.name,
+            len(lines),
+        )
+
+    @api.model
+    def _reopen(self, dates):
+        """Drop the closings from the month of the given dates on.
+
+        :param dates: {company_id: earliest date of the changed lines}
+        """
+        companies = self.env["res.company"].sudo().browse(list(dates))
+        for company in companies:
+            closing_date = company.stock_card_closing_date
+            date = fields.Datetime.to_datetime(dates[company.id]).date()
+            if not closing_date or date > closing_date:
+                continue
+            month = date + relativedelta(day=1)
+            self.env.cr.execute(
+                SQL(
+                    "DELETE FROM inventory_stock_card_closing "
+                    "WHERE company_id = %s AND date >= %s",
+                    company.id,
+                    month,
+                )
+            )
+            company.stock_card_closing_date = month - timedelta(days=1)
+            self.invalidate_model()
@@ -0,0 +1,12 @@
+# inventory_stock_card/models/res_company.py
+from odoo import models, fields
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    stock_card_closing_date = fields.Date(
+        string="Stock Card Closed Up To",
+        readonly=True,
+        help="Last day of the months whose stock card closings are stored.",
+    )
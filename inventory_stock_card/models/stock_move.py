@@ -0,0 +1,77 @@
+# inventory_stock_card/models/stock_move.py
+from odoo import models
+
+# Fields of a done move line changing the stock card closings
+CLOSING_FIELDS = {
+    "date",
+    "quantity",
+    "product_id",
+    "product_uom_id",
+    "location_id",
+    "location_dest_id",
+    "company_id",
+}
+
+
+class StockMove(models.Model):
+    _inherit = "stock.move"
+
+    def _action_done(self, cancel_backorder=False):
+        moves = super()._action_done(cancel_backorder=cancel_backorder)
+        moves._get_stock_card_cost_dependents().move_line_ids._reopen_stock_card_closings()
+        return moves
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "price_unit" in vals:
+            self.filtered(
+                lambda move: move.state == "done"
+            )._get_stock_card_cost_dependents().move_line_ids._reopen_stock_card_closings()
+        return res
+
+    def _get_stock_card_cost_dependents(self):
+        """Return the moves valued with the cost of these moves: themselves
+        and the done moves of the same origin and product without a cost of
+        their own."""
+        moves = self
+        with_origin = self.filtered("origin")
+        if not with_origin or not any(
+            with_origin.company_id.sudo().mapped("stock_card_closing_date")
+        ):
+            return moves
+        query_mixin = self.env["inventory.stock.card.query.mixin"]
+        siblings = self.search(
+            [
+                ("origin", "in", list(set(with_origin.mapped("origin")))),
+                ("product_id", "in", with_origin.product_id.ids),
+                ("state", "=", "done"),
+                ("id", "not in", self.ids),
+            ]
+        )
+        return moves | siblings.filtered(
+            lambda move: not query_mixin._get_move_own_cost(move)
+        )
+
+
+class StockMoveLine(models.Model):
+    _inherit = "stock.move.line"
+
+    def _reopen_stock_card_closings(self):
+        """Reopen the closed months in which the done lines are dated."""
+        dates = {}
+        for line in self:
+            if line.state != "done" or not line.date:
+                continue
+            company_id = line.company_id.id
+            if company_id not in dates or line.date < dates[company_id]:
+                dates[company_id] = line.date
+        if dates:
+            self.env["inventory.stock.card.closing"]._reopen(dates)
+
+    def write(self, vals):
+        if not CLOSING_FIELDS.intersection(vals):
+            return super().write(vals)
+        self._reopen_stock_card_closings()
+        res = super().write(vals)
+        self._reopen_stock_card_closings()
+        return res
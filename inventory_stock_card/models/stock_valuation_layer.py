@@ -0,0 +1,15 @@
+# inventory_stock_card/models/stock_valuation_layer.py
+from odoo import api, models
+
+
+class StockValuationLayer(models.Model):
+    _inherit = "stock.valuation.layer"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        layers = super().create(vals_list)
+        # landed costs and revaluations change the cost of done moves
+        layers.stock_move_id.filtered(
+            lambda move: move.state == "done"
+        )._get_stock_card_cost_dependents().move_line_ids._reopen_stock_card_closings()
+        return layers
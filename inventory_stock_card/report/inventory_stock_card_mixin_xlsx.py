@@ -15,11 +15,11 @@ class InventoryStockCardXlsxMixin(models.AbstractModel):
         if not self.product_ids:
             raise UserError(_("Please select at least one product."))
 
-        payload = self._build_report_payload()
+        payload = self._build_report_payload(lazy=True)
         sheets_data = payload.get('sheets', [])
 
         bio = io.BytesIO()
-        wb = xlsxwriter.Workbook(bio, {"in_memory": True})
+        wb = xlsxwriter.Workbook(bio, {"constant_memory": True})
         
         # Font Config
         font_config = {
@@ -122,27 +122,37 @@ class InventoryStockCardXlsxMixin(models.AbstractModel):
             ws.merge_range(0, 0, 0, 12, "รายงานสินค้าคงคลัง (Stock Card Report)", fmt_title_big)
             ws.set_row(0, 30)
             
+            # The workbook is in constant memory mode: each row is flushed
+            # once a following row is written, so rows are written in order.
             row_label, row_value = 2, 3
             ws.write(row_label, 0, "บริษัท (Company)", fmt_kv_label)
-            ws.write(row_value, 0, sheet.get('company'), fmt_value_fit)
             ws.merge_range(row_label, 1, row_label, 2, "สินค้า (Product)", fmt_kv_label)
-            ws.merge_range(row_value, 1, row_value, 2, sheet.get('product'), fmt_value_fit)
             ws.merge_range(row_label, 3, row_label, 4, "คลังสินค้า (Location)", fmt_kv_label)
-            ws.merge_range(row_value, 3, row_value, 4, sheet.get('location'), fmt_value_fit)
             ws.write(row_label, 5, "วันที่เริ่มต้น (Date From)", fmt_kv_label)
-            ws.write_datetime(row_value, 5, utc_naive_to_local_naive(self.env, sheet.get('date_from')), date_fmt)
             ws.write(row_label, 6, "วันที่สิ้นสุด (Date To)", fmt_kv_label)
+            ws.write(row_value, 0, sheet.get('company'), fmt_value_fit)
+            ws.merge_range(row_value, 1, row_value, 2, sheet.get('product'), fmt_value_fit)
+            ws.merge_range(row_value, 3, row_value, 4, sheet.get('location'), fmt_value_fit)
+            ws.write_datetime(row_value, 5, utc_naive_to_local_naive(self.env, sheet.get('date_from')), date_fmt)
             ws.write_datetime(row_value, 6, utc_naive_to_local_naive(self.env, sheet.get('date_to')), date_fmt)
 
             header_row = 5
             ws.set_row(header_row, 24)
             ws.set_row(header_row + 1, 24)
             
-            ws.merge_range(header_row, 0, header_row + 1, 0, "วันที่\n(Date)", fmt_hdr)
-            ws.merge_range(header_row, 1, header_row + 1, 1, "เลขที่เอกสาร\n(Reference)", fmt_hdr)
-            ws.merge_range(header_row, 2, header_row + 1, 2, "เอกสารอ้างอิง\n(Origin)", fmt_hdr)
-            ws.merge_range(header_row, 3, header_row + 1, 3, "คู่ค้า\n(Partner)", fmt_hdr)
-            ws.merge_range(header_row, 4, header_row + 1, 4, "Lot Number", fmt_hdr)
+            # Without a format, merge_range leaves the second row untouched:
+            # the titles are written on the first row and the second row is
+            # padded with the sub headers.
+            titles = [
+                "วันที่\n(Date)",
+                "เลขที่เอกสาร\n(Reference)",
+                "เอกสารอ้างอิง\n(Origin)",
+                "คู่ค้า\n(Partner)",
+                "Lot Number",
+            ]
+            for col, title in enumerate(titles):
+                ws.merge_range(header_row, col, header_row + 1, col, "")
+                ws.write(header_row, col, title, fmt_hdr)
             
             ws.merge_range(header_row, 5, header_row, 6, "ยอดยกมา (Opening)", fmt_hdr)
             ws.merge_range(header_row, 7, header_row, 8, "รับเข้า (Incoming)", fmt_hdr)
@@ -159,7 +169,7 @@ class InventoryStockCardXlsxMixin(models.AbstractModel):
                 qty_title, val_title,
                 qty_title, val_title
             ]
-            ws.write_row(header_row + 1, 5, sub_headers, fmt_hdr)
+            ws.write_row(header_row + 1, 0, [""] * len(titles) + sub_headers, fmt_hdr)
             
             ws.freeze_panes(header_row + 2, 0)
 
@@ -0,0 +1,2 @@
+from . import test_stock_card_closing
+from . import test_unit_costs
@@ -0,0 +1,115 @@
+# inventory_stock_card/tests/test_stock_card_closing.py
+from dateutil.relativedelta import relativedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestStockCardClosing(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.ref("base.main_company")
+        # no product cost when the moves are done, so that the moves without
+        # price are valued from their origin or the later product cost
+        cls.product = cls.env["product.product"].create(
+            {
+                "name": "Stock Card Closing Product",
+                "type": "consu",
+                "is_storable": True,
+                "standard_price": 0.0,
+            }
+        )
+        cls.stock_loc = cls.env.ref("stock.stock_location_stock")
+        cls.supplier_loc = cls.env.ref("stock.stock_location_suppliers")
+        cls.customer_loc = cls.env.ref("stock.stock_location_customers")
+        cls.closing = cls.env["inventory.stock.card.closing"]
+
+    def _done_move(self, origin, src, dest, qty, price_unit=0.0):
+        move = self.env["stock.move"].create(
+            {
+                "name": origin,
+                "origin": origin,
+                "product_id": self.product.id,
+                "product_uom": self.product.uom_id.id,
+                "product_uom_qty": qty,
+                "location_id": src.id,
+                "location_dest_id": dest.id,
+                "price_unit": price_unit,
+            }
+        )
+        move._action_confirm()
+        move._action_assign()
+        move.quantity = qty
+        move.picked = True
+        move._action_done()
+        return move
+
+    def _close_current_month(self):
+        month = fields.Date.today() + relativedelta(day=1)
+        self.closing._close_month(self.company, month, {self.stock_loc.id})
+        self.company.stock_card_closing_date = month + relativedelta(months=1, days=-1)
+        return month
+
+    def _get_opening(self, siblings=True):
+        __, openings = self.closing._get_openings(
+            self.company.id,
+            self.product.ids,
+            [self.stock_loc.id],
+            fields.Datetime.now() + relativedelta(months=1),
+            siblings=siblings,
+        )
+        return openings[self.product.id]
+
+    def test_openings_follow_product_cost(self):
+        self._done_move("PO-G", self.supplier_loc, self.stock_loc, 5, 10.0)
+        self._done_move("PO-G", self.supplier_loc, self.stock_loc, 3)
+        self._done_move("SO-G", self.stock_loc, self.customer_loc, 2)
+        self._close_current_month()
+        # the cost of the product changes after the closing
+        self.product.with_company(self.company).standard_price = 9.0
+
+        # 5 x 10 + 3 x 10 (cost of the origin) - 2 x 9 (product cost)
+        qty, value = self._get_opening()
+        self.assertAlmostEqual(qty, 6.0)
+        self.assertAlmostEqual(value, 62.0)
+        # 5 x 10 + 3 x 9 - 2 x 9
+        qty, value = self._get_opening(siblings=False)
+        self.assertAlmostEqual(qty, 6.0)
+        self.assertAlmostEqual(value, 59.0)
+
+    def test_new_layer_reopens_closing(self):
+        move = self._done_move("PO-H", self.supplier_loc, self.stock_loc, 5, 10.0)
+        month = self._close_current_month()
+
+        # landed cost added to the receipt
+        self.env["stock.valuation.layer"].create(
+            {
+                "company_id": self.company.id,
+                "product_id": self.product.id,
+                "stock_move_id": move.id,
+                "quantity": 0.0,
+                "value": 5.0,
+            }
+        )
+        self.assertEqual(
+            self.company.stock_card_closing_date, month + relativedelta(days=-1)
+        )
+        self.assertFalse(
+            self.closing.search(
+                [("company_id", "=", self.company.id), ("date", ">=", month)]
+            )
+        )
+
+    def test_openings_by_location(self):
+        self._done_move("PO-I", self.supplier_loc, self.stock_loc, 4, 10.0)
+        self._close_current_month()
+
+        __, openings = self.closing._get_openings(
+            self.company.id,
+            self.product.ids,
+            [self.stock_loc.id],
+            fields.Datetime.now() + relativedelta(months=1),
+            by_location=True,
+        )
+        self.assertEqual(openings, {(self.product.id, self.stock_loc.id): (4.0, 40.0)})
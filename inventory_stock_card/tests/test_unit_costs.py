@@ -0,0 +1,115 @@
+# inventory_stock_card/tests/test_unit_costs.py
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestStockCardUnitCosts(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.ref("base.main_company")
+        cls.product = cls.env["product.product"].create(
+            {
+                "name": "Stock Card Product",
+                "type": "consu",
+                "is_storable": True,
+                "standard_price": 7.0,
+            }
+        )
+        cls.stock_loc = cls.env.ref("stock.stock_location_stock")
+        cls.supplier_loc = cls.env.ref("stock.stock_location_suppliers")
+        cls.customer_loc = cls.env.ref("stock.stock_location_customers")
+        cls.query_mixin = cls.env["inventory.stock.card.query.mixin"]
+
+    def _done_move(self, origin, src, dest, qty, price_unit=0.0, product=None):
+        product = product or self.product
+        move = self.env["stock.move"].create(
+            {
+                "name": origin,
+                "origin": origin,
+                "product_id": product.id,
+                "product_uom": product.uom_id.id,
+                "product_uom_qty": qty,
+                "location_id": src.id,
+                "location_dest_id": dest.id,
+                "price_unit": price_unit,
+            }
+        )
+        move._action_confirm()
+        move._action_assign()
+        move.quantity = qty
+        move.picked = True
+        move._action_done()
+        return move
+
+    def test_batch_costs_match_line_costs(self):
+        moves = (
+            self._done_move("PO-A", self.supplier_loc, self.stock_loc, 5, 10.0)
+            | self._done_move("PO-A", self.supplier_loc, self.stock_loc, 3)
+            | self._done_move("PO-B", self.supplier_loc, self.stock_loc, 2, 12.5)
+            | self._done_move("PO-A", self.stock_loc, self.customer_loc, 4)
+            | self._done_move("SO-C", self.stock_loc, self.customer_loc, 1)
+            | self._done_move("", self.stock_loc, self.customer_loc, 1)
+        )
+        lines = moves.move_line_ids
+        product = self.product.with_company(self.company)
+
+        costs = self.query_mixin._get_line_unit_costs(lines, self.company.id)
+
+        self.assertEqual(set(costs), set(lines.ids))
+        for line in lines:
+            self.assertAlmostEqual(
+                costs[line.id], self.query_mixin._get_line_unit_cost(line, product)
+            )
+
+    def test_batch_costs_without_siblings(self):
+        moves = self._done_move(
+            "PO-D", self.supplier_loc, self.stock_loc, 5, 10.0
+        ) | self._done_move("PO-D", self.supplier_loc, self.stock_loc, 3)
+        lines = moves.move_line_ids
+
+        costs = self.query_mixin._get_line_unit_costs(
+            lines, self.company.id, siblings=False
+        )
+
+        for line in lines:
+            expected = 0.0
+            layers = line.move_id.stock_valuation_layer_ids
+            if layers and sum(layers.mapped("quantity")):
+                expected = abs(
+                    sum(layers.mapped("value")) / sum(layers.mapped("quantity"))
+                )
+            expected = expected or line.move_id.price_unit or 7.0
+            self.assertAlmostEqual(costs[line.id], expected)
+
+    def test_multi_product_rows_match_single_queries(self):
+        product_2 = self.product.copy({"name": "Stock Card Product 2"})
+        self._done_move("PO-E", self.supplier_loc, self.stock_loc, 5, 10.0)
+        self._done_move("SO-E", self.stock_loc, self.customer_loc, 2)
+        self._done_move(
+            "PO-F", self.supplier_loc, self.stock_loc, 4, 3.0, product=product_2
+        )
+        products = product_2 | self.product
+        date_from = fields.Datetime.now() - timedelta(hours=1)
+        date_to = fields.Datetime.now() + timedelta(hours=1)
+        location_ids = [self.stock_loc.id]
+
+        rows = dict(
+            self.query_mixin._iter_stock_card_rows(
+                products, location_ids, date_from, date_to, self.company.id
+            )
+        )
+
+        self.assertEqual([p.id for p in rows], products.ids)
+        for product in products:
+            expected = self.query_mixin._run_stock_card_query(
+                product.id,
+                location_ids,
+                location_ids,
+                date_from,
+                date_to,
+                self.company.id,
+            )
+            self.assertEqual(rows[product][self.stock_loc.id], expected)
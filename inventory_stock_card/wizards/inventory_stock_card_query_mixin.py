@@ -25,6 +25,128 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             else:
                 return []
 
+    def _get_line_unit_cost(self, line, product):
+        """Unit cost of a move line: from the valuation layers of its move,
+        else the price of the move, else the layers or price of the other
+        moves of the same origin, else the cost of the product."""
+        return (
+            self._get_move_own_cost(line.move_id)
+            or self._get_move_sibling_cost(line.move_id, product)
+            or product.standard_price
+        )
+
+    def _get_move_own_cost(self, move):
+        """Unit cost of a move from its valuation layers, else its price."""
+        unit_cost = 0.0
+        layers = move.stock_valuation_layer_ids
+        if layers:
+            val_sum = sum(layers.mapped("value"))
+            qty_sum = sum(layers.mapped("quantity"))
+            if qty_sum:
+                unit_cost = abs(val_sum / qty_sum)
+        return unit_cost or move.price_unit
+
+    def _get_move_sibling_cost(self, move, product):
+        """Unit cost of a move from the layers or price of the other moves
+        of the same origin, 0.0 if none has one."""
+        if not move.origin:
+            return 0.0
+        siblings = self.env["stock.move"].search(
+            [
+                ("origin", "=", move.origin),
+                ("product_id", "=", product.id),
+                ("state", "=", "done"),
+                ("id", "!=", move.id),
+            ],
+            limit=5,
+        )
+        for sib in siblings:
+            if sib.stock_valuation_layer_ids:
+                s_val = sum(sib.stock_valuation_layer_ids.mapped("value"))
+                s_qty = sum(sib.stock_valuation_layer_ids.mapped("quantity"))
+                if s_qty:
+                    return abs(s_val / s_qty)
+            if sib.price_unit > 0:
+                return sib.price_unit
+        return 0.0
+
+    @api.model
+    def _get_line_unit_costs(self, lines, company_id, siblings=True, product_cost=True):
+        """Batch version of _get_line_unit_cost: return {line id: unit cost}
+        for the move lines, reading the valuation layers and the moves of
+        the same origin with grouped queries.
+
+        Without ``siblings``, the moves of the same origin are not looked
+        at (price of the move, else cost of the product). Without
+        ``product_cost``, the lines left without a cost get 0.0 instead of
+        the cost of the product.
+        """
+        moves = lines.move_id
+        layer_costs = self._get_move_layer_costs(moves)
+
+        costs = {}
+        for move in moves:
+            if move.id in layer_costs:
+                costs[move.id] = layer_costs[move.id][1]
+            if not costs.get(move.id):
+                costs[move.id] = move.price_unit
+
+        if siblings:
+            todo = moves.filtered(lambda m: costs[m.id] == 0.0 and m.origin)
+            if todo:
+                sibling_moves = self.env["stock.move"].search(
+                    [
+                        ("origin", "in", list(set(todo.mapped("origin")))),
+                        ("product_id", "in", todo.product_id.ids),
+                        ("state", "=", "done"),
+                    ]
+                )
+                layer_costs.update(self._get_move_layer_costs(sibling_moves - moves))
+                by_origin = {}
+                for sib in sibling_moves:
+                    by_origin.setdefault((sib.origin, sib.product_id.id), []).append(sib)
+                for move in todo:
+                    candidates = [
+                        sib
+                        for sib in by_origin.get((move.origin, move.product_id.id), [])
+                        if sib.id != move.id
+                    ][:5]
+                    unit_cost = 0.0
+                    for sib in candidates:
+                        if sib.id in layer_costs:
+                            s_qty, s_cost = layer_costs[sib.id]
+                            if s_qty:
+                                unit_cost = s_cost
+                                break
+                        if unit_cost == 0.0 and sib.price_unit > 0:
+                            unit_cost = sib.price_unit
+                            break
+                    costs[move.id] = unit_cost
+
+        res = {}
+        for line in lines.with_company(company_id):
+            unit_cost = costs.get(line.move_id.id, 0.0)
+            if unit_cost == 0.0 and product_cost:
+                unit_cost = line.product_id.standard_price
+            res[line.id] = unit_cost
+        return res
+
+    @api.model
+    def _get_move_layer_costs(self, moves):
+        """Return {move id: (layer qty, unit cost)} for the moves having
+        valuation layers."""
+        if not moves or "stock.valuation.layer" not in self.env:
+            return {}
+        groups = self.env["stock.valuation.layer"]._read_group(
+            [("stock_move_id", "in", moves.ids)],
+            ["stock_move_id"],
+            ["value:sum", "quantity:sum"],
+        )
+        return {
+            move.id: (qty_sum, abs(val_sum / qty_sum) if qty_sum else 0.0)
+            for move, val_sum, qty_sum in groups
+        }
+
     def _run_stock_card_query(
         self,
         product_id,
@@ -39,6 +161,13 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
         )
         product_uom = Product.uom_id
 
+        # closed months are read from the monthly closings, only the lines
+        # after the last one are summed
+        cutoff, closings = self.env["inventory.stock.card.closing"]._get_openings(
+            company_id, [product_id], opening_location_ids, date_from
+        )
+        opening_qty, opening_val = closings.get(product_id, (0.0, 0.0))
+
         domain_op = [
             ("state", "=", "done"),
             ("product_id", "=", product_id),
@@ -48,11 +177,11 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             ("location_id", "in", opening_location_ids),
             ("location_dest_id", "in", opening_location_ids),
         ]
+        if cutoff:
+            domain_op.append(("date", ">=", cutoff))
 
         smls_op = self.env["stock.move.line"].search(domain_op)
-
-        opening_qty = 0.0
-        opening_val = 0.0
+        unit_costs = self._get_line_unit_costs(smls_op, company_id)
 
         for line in smls_op:
             qty = line.quantity if "quantity" in line else line.qty_done
@@ -60,40 +189,7 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             if line.product_uom_id and line.product_uom_id != product_uom:
                 qty = line.product_uom_id._compute_quantity(qty, product_uom)
 
-            unit_cost = 0.0
-            layers = line.move_id.stock_valuation_layer_ids
-            if layers:
-                val_sum = sum(layers.mapped("value"))
-                qty_sum = sum(layers.mapped("quantity"))
-                if qty_sum:
-                    unit_cost = abs(val_sum / qty_sum)
-
-            if unit_cost == 0.0:
-                unit_cost = line.move_id.price_unit
-
-            if unit_cost == 0.0 and line.move_id.origin:
-                siblings = self.env["stock.move"].search(
-                    [
-                        ("origin", "=", line.move_id.origin),
-                        ("product_id", "=", product_id),
-                        ("state", "=", "done"),
-                        ("id", "!=", line.move_id.id),
-                    ],
-                    limit=5,
-                )
-                for sib in siblings:
-                    if sib.stock_valuation_layer_ids:
-                        s_val = sum(sib.stock_valuation_layer_ids.mapped("value"))
-                        s_qty = sum(sib.stock_valuation_layer_ids.mapped("quantity"))
-                        if s_qty:
-                            unit_cost = abs(s_val / s_qty)
-                            break
-                    if unit_cost == 0.0 and sib.price_unit > 0:
-                        unit_cost = sib.price_unit
-                        break
-
-            if unit_cost == 0.0:
-                unit_cost = Product.standard_price
+            unit_cost = unit_costs[line.id]
 
             is_in = (line.location_dest_id.id in opening_location_ids) and (
                 line.location_id.id not in opening_location_ids
@@ -124,6 +220,8 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             domain_period, order="date, id"
         )
 
+        unit_costs = self._get_line_unit_costs(smls_period, company_id)
+        partner_names = {}
         results = []
 
         for line in smls_period:
@@ -132,40 +230,7 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             if line.product_uom_id and line.product_uom_id != product_uom:
                 qty = line.product_uom_id._compute_quantity(qty, product_uom)
 
-            unit_cost = 0.0
-            layers = line.move_id.stock_valuation_layer_ids
-            if layers:
-                val_sum = sum(layers.mapped("value"))
-                qty_sum = sum(layers.mapped("quantity"))
-                if qty_sum:
-                    unit_cost = abs(val_sum / qty_sum)
-
-            if unit_cost == 0.0:
-                unit_cost = line.move_id.price_unit
-
-            if unit_cost == 0.0 and line.move_id.origin:
-                siblings = self.env["stock.move"].search(
-                    [
-                        ("origin", "=", line.move_id.origin),
-                        ("product_id", "=", product_id),
-                        ("state", "=", "done"),
-                        ("id", "!=", line.move_id.id),
-                    ],
-                    limit=5,
-                )
-                for sib in siblings:
-                    if sib.stock_valuation_layer_ids:
-                        s_val = sum(sib.stock_valuation_layer_ids.mapped("value"))
-                        s_qty = sum(sib.stock_valuation_layer_ids.mapped("quantity"))
-                        if s_qty:
-                            unit_cost = abs(s_val / s_qty)
-                            break
-                    if unit_cost == 0.0 and sib.price_unit > 0:
-                        unit_cost = sib.price_unit
-                        break
-
-            if unit_cost == 0.0:
-                unit_cost = Product.standard_price
+            unit_cost = unit_costs[line.id]
 
             is_in = (line.location_dest_id.id in location_ids) and (
                 line.location_id.id not in location_ids
@@ -177,68 +242,86 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             if not is_in and not is_out:
                 continue
 
-            qty_in = qty if is_in else 0.0
-            qty_out = qty if is_out else 0.0
-            delta = qty_in - qty_out
-            valuation_amount = qty * unit_cost
+            results.append(
+                self._prepare_stock_card_line(
+                    line, qty, is_in, unit_cost, partner_names
+                )
+            )
 
-            origin_raw = line.move_id.origin or ""
-            picking = line.picking_id.name or ""
-            lot_name = line.lot_id.name or ""
+        opening_row = self._prepare_stock_card_opening(opening_qty, opening_val)
 
-            partner_name = (
-                line.picking_id.partner_id.display_name
-                or line.move_id.partner_id.display_name
-            )
-            if not partner_name and origin_raw:
-                if "purchase.order" in self.env:
-                    po = self.env["purchase.order"].search(
-                        [("name", "=", origin_raw)], limit=1
-                    )
-                    if po:
-                        partner_name = po.partner_id.display_name
-                if not partner_name and "sale.order" in self.env:
-                    so = self.env["sale.order"].search(
-                        [("name", "=", origin_raw)], limit=1
-                    )
-                    if so:
-                        partner_name = so.partner_id.display_name
-            partner_name = partner_name or ""
-
-            origin_display = origin_raw
-            if origin_raw:
-                org_items = [x.strip() for x in origin_raw.split(",") if x.strip()]
-                origin_display = ", \n".join(org_items)
-
-            am_name = ""
-            accounting_date = None
-            if layers:
-                am = layers.mapped("account_move_id")
-                if am:
-                    am_name = am[0].name
-                    accounting_date = am[0].date
+        results.insert(0, opening_row)
 
-            results.append(
-                {
-                    "rowtype": "line",
-                    "line_id": line.id,
-                    "date": line.date,
-                    "picking": picking,
-                    "origin": origin_display,
-                    "partner": partner_name,
-                    "lot_id": line.lot_id.id,
-                    "lot_name": lot_name,
-                    "qty_in": qty_in,
-                    "qty_out": qty_out,
-                    "delta": delta,
-                    "unit_price": unit_cost,
-                    "valuation_amount": valuation_amount,
-                    "journal_entry": am_name,
-                    "accounting_date": accounting_date,
-                }
-            )
+        return results
+
+    def _prepare_stock_card_line(self, line, qty, is_in, unit_cost, partner_names=None):
+        """Row of a move line in or out of the stock card locations.
+
+        ``partner_names`` caches the partners found from the origins.
+        """
+        qty_in = qty if is_in else 0.0
+        qty_out = 0.0 if is_in else qty
+        layers = line.move_id.stock_valuation_layer_ids
+
+        origin_raw = line.move_id.origin or ""
+        partner_name = (
+            line.picking_id.partner_id.display_name
+            or line.move_id.partner_id.display_name
+        )
+        if not partner_name and origin_raw:
+            if partner_names is None:
+                partner_names = {}
+            if origin_raw not in partner_names:
+                partner_names[origin_raw] = self._get_origin_partner_name(origin_raw)
+            partner_name = partner_names[origin_raw]
+        partner_name = partner_name or ""
+
+        origin_display = origin_raw
+        if origin_raw:
+            org_items = [x.strip() for x in origin_raw.split(",") if x.strip()]
+            origin_display = ", \n".join(org_items)
+
+        am_name = ""
+        accounting_date = None
+        if layers:
+            am = layers.mapped("account_move_id")
+            if am:
+                am_name = am[0].name
+                accounting_date = am[0].date
+
+        return {
+            "rowtype": "line",
+            "line_id": line.id,
+            "date": line.date,
+            "picking": line.picking_id.name or "",
+            "origin": origin_display,
+            "partner": partner_name,
+            "lot_id": line.lot_id.id,
+            "lot_name": line.lot_id.name or "",
+            "qty_in": qty_in,
+            "qty_out": qty_out,
+            "delta": qty_in - qty_out,
+            "unit_price": unit_cost,
+            "valuation_amount": qty * unit_cost,
+            "journal_entry": am_name,
+            "accounting_date": accounting_date,
+        }
 
-        opening_row = {
+    def _get_origin_partner_name(self, origin):
+        """Partner of the purchase or sale order named ``origin``."""
+        partner_name = ""
+        if "purchase.order" in self.env:
+            po = self.env["purchase.order"].search([("name", "=", origin)], limit=1)
+            if po:
+                partner_name = po.partner_id.display_name
+        if not partner_name and "sale.order" in self.env:
+            so = self.env["sale.order"].search([("name", "=", origin)], limit=1)
+            if so:
+                partner_name = so.partner_id.display_name
+        return partner_name
+
+    def _prepare_stock_card_opening(self, opening_qty, opening_val):
+        return {
             "rowtype": "opening",
             "line_id": None,
             "date": None,
@@ -256,6 +339,84 @@ class InventoryStockCardQueryMixin(models.AbstractModel):
             "accounting_date": None,
         }
 
-        results.insert(0, opening_row)
-
-        return results
+    @api.model
+    def _iter_product_move_lines(self, products, domain):
+        """Yield (product, move lines by date) for each of the products, in
+        their order, the lines of all the products matching ``domain`` being
+        found by a single search.
+
+        Only the lines of one product are loaded at a time, the cache of the
+        lines and moves being cleared between products.
+        """
+        MoveLine = self.env["stock.move.line"]
+        line_ids = {product.id: [] for product in products}
+        if products:
+            lines = MoveLine.search_fetch(
+                domain + [("product_id", "in", products.ids)],
+                ["product_id"],
+                order="product_id, date, id",
+            )
+            for line in lines:
+                line_ids[line.product_id.id].append(line.id)
+        for product in products:
+            yield product, MoveLine.browse(line_ids.pop(product.id))
+            MoveLine.invalidate_model()
+            self.env["stock.move"].invalidate_model()
+
+    @api.model
+    def _iter_stock_card_rows(self, products, location_ids, date_from, date_to, company_id):
+        """Yield (product, {location id: rows}) for the stock card of each
+        product in each location, the rows being those of
+        _run_stock_card_query for that single location."""
+        location_set = set(location_ids)
+        cutoff, closings = self.env["inventory.stock.card.closing"]._get_openings(
+            company_id, products.ids, location_ids, date_from, by_location=True
+        )
+        domain = [
+            ("state", "=", "done"),
+            ("company_id", "=", company_id),
+            ("date", "<", date_to),
+            "|",
+            ("location_id", "in", location_ids),
+            ("location_dest_id", "in", location_ids),
+        ]
+        if cutoff:
+            domain.append(("date", ">=", cutoff))
+
+        partner_names = {}
+        products = products.with_company(company_id)
+        for product, lines in self._iter_product_move_lines(products, domain):
+            product_uom = product.uom_id
+            unit_costs = self._get_line_unit_costs(lines, company_id)
+            openings = {
+                loc_id: list(closings.get((product.id, loc_id), (0.0, 0.0)))
+                for loc_id in location_ids
+            }
+            rows = {loc_id: [] for loc_id in location_ids}
+            for line in lines:
+                src_id = line.location_id.id
+                dest_id = line.location_dest_id.id
+                if src_id == dest_id:
+                    continue
+                qty = line.quantity
+                if line.product_uom_id and line.product_uom_id != product_uom:
+                    qty = line.product_uom_id._compute_quantity(qty, product_uom)
+                unit_cost = unit_costs[line.id]
+                for loc_id, is_in in ((dest_id, True), (src_id, False)):
+                    if loc_id not in location_set:
+                        continue
+                    if line.date < date_from:
+                        sign = 1 if is_in else -1
+                        openings[loc_id][0] += sign * qty
+                        openings[loc_id][1] += sign * qty * unit_cost
+                    else:
+                        rows[loc_id].append(
+                            self._prepare_stock_card_line(
+                                line, qty, is_in, unit_cost, partner_names
+                            )
+                        )
+            yield product, {
+                loc_id: [self._prepare_stock_card_opening(*openings[loc_id])]
+                + rows[loc_id]
+                for loc_id in location_ids
+            }
@@ -76,7 +76,17 @@ class InventoryStockCardWizard(models.TransientModel):
             if rec.date_from and rec.date_to and rec.date_from >= rec.date_to:
                 raise UserError(_("Date From must be before Date To."))
 
-    def _build_report_payload(self):
+    def _build_report_payload(self, lazy=False):
+        """Return the stock cards of the products in each location.
+
+        With ``lazy``, the sheets are a generator built as they are
+        iterated, from one scan of the move lines of all the products.
+        """
+        self.ensure_one()
+        sheets = self._iter_report_sheets()
+        return {"sheets": sheets if lazy else list(sheets)}
+
+    def _iter_report_sheets(self):
         self.ensure_one()
         all_loc_ids = self._collect_location_ids()
 
@@ -84,206 +94,204 @@ class InventoryStockCardWizard(models.TransientModel):
             loc.id: loc for loc in self.env["stock.location"].browse(all_loc_ids)
         }
 
-        sheets = []
-
-        for product in self.product_ids:
+        for product, rows_by_location in self._iter_stock_card_rows(
+            self.product_ids,
+            all_loc_ids,
+            self.date_from,
+            self.date_to,
+            self.company_id.id,
+        ):
             for loc_id in all_loc_ids:
-
-                rows = self._run_stock_card_query(
-                    product_id=product.id,
-                    location_ids=[loc_id],
-                    opening_location_ids=[loc_id],
-                    date_from=self.date_from,
-                    date_to=self.date_to,
-                    company_id=self.company_id.id,
+                sheet = self._prepare_report_sheet(
+                    product, loc_map.get(loc_id), rows_by_location[loc_id]
                 )
+                if sheet:
+                    yield sheet
+
+    def _prepare_report_sheet(self, product, location, rows):
+        """Stock card of a product in a location from the rows of
+        _run_stock_card_query, or None if there is nothing to show."""
+        opening_qty = 0.0
+        opening_val = 0.0
+        has_movements = False
+
+        for rr in rows:
+            if rr.get("rowtype") == "opening":
+                opening_qty = rr.get("delta") or 0.0
+                opening_val = rr.get("valuation_amount") or 0.0
+            elif rr.get("rowtype") == "line":
+                has_movements = True
+
+        opening_qty = round(opening_qty, 6)
+        opening_val = round(opening_val, 6)
+
+        if not has_movements and abs(opening_qty) == 0:
+            return None
+
+        if product.default_code and f"[{product.default_code}]" in (
+            product.name or ""
+        ):
+            clean_name = (
+                (product.name or "")
+                .replace(f"[{product.default_code}]", "")
+                .strip()
+            )
+        else:
+            clean_name = product.name or product.display_name or ""
+        prod_label = (
+            f"[{product.default_code}] {clean_name}".strip()
+            if product.default_code
+            else clean_name
+        )
 
-                opening_qty = 0.0
-                opening_val = 0.0
-                has_movements = False
+        location_name = location.display_name if location else ""
+
+        sheet = {
+            "title": "Stock Card",
+            "company": self.company_id.display_name or "",
+            "product": prod_label,
+            "uom": product.uom_id.display_name or "",
+            "location": location_name,
+            "date_from": self.date_from,
+            "date_to": self.date_to,
+            "currency_symbol": self.company_id.currency_id.symbol or "",
+            "at_date_only": bool(self.at_date_only),
+            "opening_qty": opening_qty,
+            "opening_val": opening_val,
+            "opening_price": (
+                (opening_val / opening_qty) if opening_qty else 0.0
+            ),
+            "lines": [],
+        }
+
+        if self.at_date_only:
+            balance_qty = opening_qty + sum(
+                (r.get("delta") or 0.0)
+                for r in rows
+                if r.get("rowtype") == "line"
+            )
+            balance_val = opening_val + sum(
+                (r.get("valuation_amount") or 0.0)
+                * (-1 if (r.get("qty_out") or 0.0) > 0 else 1)
+                for r in rows
+                if r.get("rowtype") == "line"
+            )
 
-                for rr in rows:
-                    if rr.get("rowtype") == "opening":
-                        opening_qty = rr.get("delta") or 0.0
-                        opening_val = rr.get("valuation_amount") or 0.0
-                    elif rr.get("rowtype") == "line":
-                        has_movements = True
+            balance_qty = round(balance_qty, 6)
+            balance_val = round(balance_val, 6)
+
+            sheet["opening_qty"] = None
+            sheet["lines"] = [
+                {
+                    "is_opening": False,
+                    "date": self.date_to,
+                    "picking": "-",
+                    "origin": "-",
+                    "partner": "-",
+                    "lot_name": "",
+                    "unit_price": 0.0,
+                    "valuation_amount": 0.0,
+                    "qty_in": 0.0,
+                    "qty_out": 0.0,
+                    "journal_entry": "",
+                    "balance_qty": balance_qty,
+                    "balance_val": balance_val,
+                    "balance_price": (
+                        (balance_val / balance_qty) if balance_qty else 0.0
+                    ),
+                }
+            ]
+        else:
+            bal_qty = opening_qty
+            bal_val = opening_val
 
-                opening_qty = round(opening_qty, 6)
-                opening_val = round(opening_val, 6)
+            incoming_cost_map = {}
 
-                if not has_movements and abs(opening_qty) == 0:
+            for rr in rows:
+                if rr.get("rowtype") != "line":
                     continue
 
-                if product.default_code and f"[{product.default_code}]" in (
-                    product.name or ""
+                bal_qty = round(bal_qty, 6)
+                bal_val = round(bal_val, 6)
+
+                line_open_qty = bal_qty
+                line_open_val = bal_val
+                line_open_price = (bal_val / bal_qty) if bal_qty else 0.0
+
+                qty_in = rr.get("qty_in") or 0.0
+                qty_out = rr.get("qty_out") or 0.0
+                origin_key = rr.get("origin")
+
+                unit_price = rr.get("unit_price") or 0.0
+                val_trans = rr.get("valuation_amount") or 0.0
+
+                if (
+                    val_trans == 0.0
+                    and (qty_in > 0 or qty_out > 0)
+                    and unit_price > 0
                 ):
-                    clean_name = (
-                        (product.name or "")
-                        .replace(f"[{product.default_code}]", "")
-                        .strip()
-                    )
-                else:
-                    clean_name = product.name or product.display_name or ""
-                prod_label = (
-                    f"[{product.default_code}] {clean_name}".strip()
-                    if product.default_code
-                    else clean_name
-                )
+                    val_trans = (qty_in if qty_in > 0 else qty_out) * unit_price
 
-                current_location = loc_map.get(loc_id)
-                location_name = (
-                    current_location.display_name if current_location else ""
-                )
+                if qty_in > 0 and origin_key and val_trans > 0:
+                    current_cost = val_trans / qty_in
+                    incoming_cost_map[origin_key] = current_cost
 
-                sheet = {
-                    "title": "Stock Card",
-                    "company": self.company_id.display_name or "",
-                    "product": prod_label,
-                    "uom": product.uom_id.display_name or "",
-                    "location": location_name,
-                    "date_from": self.date_from,
-                    "date_to": self.date_to,
-                    "currency_symbol": self.company_id.currency_id.symbol or "",
-                    "at_date_only": bool(self.at_date_only),
-                    "opening_qty": opening_qty,
-                    "opening_val": opening_val,
-                    "opening_price": (
-                        (opening_val / opening_qty) if opening_qty else 0.0
-                    ),
-                    "lines": [],
-                }
+                if (
+                    qty_out > 0
+                    and origin_key
+                    and origin_key in incoming_cost_map
+                ):
+                    cached_cost = incoming_cost_map[origin_key]
+                    val_trans = qty_out * cached_cost
+                    unit_price = cached_cost
+
+                val_trans = round(val_trans, 6)
 
-                if self.at_date_only:
-                    balance_qty = opening_qty + sum(
-                        (r.get("delta") or 0.0)
-                        for r in rows
-                        if r.get("rowtype") == "line"
-                    )
-                    balance_val = opening_val + sum(
-                        (r.get("valuation_amount") or 0.0)
-                        * (-1 if (r.get("qty_out") or 0.0) > 0 else 1)
-                        for r in rows
-                        if r.get("rowtype") == "line"
-                    )
-
-                    balance_qty = round(balance_qty, 6)
-                    balance_val = round(balance_val, 6)
-
-                    sheet["opening_qty"] = None
-                    sheet["lines"] = [
-                        {
-                            "is_opening": False,
-                            "date": self.date_to,
-                            "picking": "-",
-                            "origin": "-",
-                            "partner": "-",
-                            "lot_name": "",
-                            "unit_price": 0.0,
-                            "valuation_amount": 0.0,
-                            "qty_in": 0.0,
-                            "qty_out": 0.0,
-                            "journal_entry": "",
-                            "balance_qty": balance_qty,
-                            "balance_val": balance_val,
-                            "balance_price": (
-                                (balance_val / balance_qty) if balance_qty else 0.0
-                            ),
-                        }
-                    ]
+                if qty_out > 0:
+                    bal_val -= val_trans
                 else:
-                    bal_qty = opening_qty
-                    bal_val = opening_val
-
-                    incoming_cost_map = {}
-
-                    for rr in rows:
-                        if rr.get("rowtype") != "line":
-                            continue
-
-                        bal_qty = round(bal_qty, 6)
-                        bal_val = round(bal_val, 6)
-
-                        line_open_qty = bal_qty
-                        line_open_val = bal_val
-                        line_open_price = (bal_val / bal_qty) if bal_qty else 0.0
-
-                        qty_in = rr.get("qty_in") or 0.0
-                        qty_out = rr.get("qty_out") or 0.0
-                        origin_key = rr.get("origin")
-
-                        unit_price = rr.get("unit_price") or 0.0
-                        val_trans = rr.get("valuation_amount") or 0.0
-
-                        if (
-                            val_trans == 0.0
-                            and (qty_in > 0 or qty_out > 0)
-                            and unit_price > 0
-                        ):
-                            val_trans = (qty_in if qty_in > 0 else qty_out) * unit_price
-
-                        if qty_in > 0 and origin_key and val_trans > 0:
-                            current_cost = val_trans / qty_in
-                            incoming_cost_map[origin_key] = current_cost
-
-                        if (
-                            qty_out > 0
-                            and origin_key
-                            and origin_key in incoming_cost_map
-                        ):
-                            cached_cost = incoming_cost_map[origin_key]
-                            val_trans = qty_out * cached_cost
-                            unit_price = cached_cost
-
-                        val_trans = round(val_trans, 6)
-
-                        if qty_out > 0:
-                            bal_val -= val_trans
-                        else:
-                            bal_val += val_trans
-
-                        bal_qty += rr.get("delta") or 0.0
-
-                        bal_qty = round(bal_qty, 6)
-                        bal_val = round(bal_val, 6)
-
-                        if abs(bal_qty) < 0.000001:
-                            bal_qty = 0.0
-                        if abs(bal_val) < 0.000001:
-                            bal_val = 0.0
-
-                        line_bal_price = (bal_val / bal_qty) if bal_qty else 0.0
-
-                        picking_val = rr.get("picking") if self.show_doc else ""
-                        origin_val = rr.get("origin") if self.show_doc else ""
-                        partner_val = rr.get("partner") if self.show_partner else ""
-                        lot_name_val = rr.get("lot_name") if self.show_lot else ""
-                        journal_entry_val = rr.get("journal_entry") or ""
-
-                        sheet["lines"].append(
-                            {
-                                "is_opening": False,
-                                "date": rr.get("date"),
-                                "picking": picking_val,
-                                "origin": origin_val,
-                                "partner": partner_val,
-                                "lot_name": lot_name_val,
-                                "journal_entry": journal_entry_val,
-                                "line_open_qty": line_open_qty,
-                                "line_open_price": line_open_price,
-                                "line_open_val": line_open_val,
-                                "qty_in": qty_in,
-                                "qty_out": qty_out,
-                                "unit_price": unit_price,
-                                "valuation_amount": val_trans,
-                                "balance_qty": bal_qty,
-                                "balance_val": bal_val,
-                                "balance_price": line_bal_price,
-                            }
-                        )
-                sheets.append(sheet)
-
-        return {"sheets": sheets}
+                    bal_val += val_trans
+
+                bal_qty += rr.get("delta") or 0.0
+
+                bal_qty = round(bal_qty, 6)
+                bal_val = round(bal_val, 6)
+
+                if abs(bal_qty) < 0.000001:
+                    bal_qty = 0.0
+                if abs(bal_val) < 0.000001:
+                    bal_val = 0.0
+
+                line_bal_price = (bal_val / bal_qty) if bal_qty else 0.0
+
+                picking_val = rr.get("picking") if self.show_doc else ""
+                origin_val = rr.get("origin") if self.show_doc else ""
+                partner_val = rr.get("partner") if self.show_partner else ""
+                lot_name_val = rr.get("lot_name") if self.show_lot else ""
+                journal_entry_val = rr.get("journal_entry") or ""
+
+                sheet["lines"].append(
+                    {
+                        "is_opening": False,
+                        "date": rr.get("date"),
+                        "picking": picking_val,
+                        "origin": origin_val,
+                        "partner": partner_val,
+                        "lot_name": lot_name_val,
+                        "journal_entry": journal_entry_val,
+                        "line_open_qty": line_open_qty,
+                        "line_open_price": line_open_price,
+                        "line_open_val": line_open_val,
+                        "qty_in": qty_in,
+                        "qty_out": qty_out,
+                        "unit_price": unit_price,
+                        "valuation_amount": val_trans,
+                        "balance_qty": bal_qty,
+                        "balance_val": bal_val,
+                        "balance_price": line_bal_price,
+                    }
+                )
+        return sheet
 
     def _report_action(self, report_xmlid, report_type="qweb-pdf"):
         self.ensure_one()
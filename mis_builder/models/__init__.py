@@ -8,3 +8,6 @@ from . import mis_report_style
 from . import aep
 from . import mis_kpi_data
 from . import prorata_read_group_mixin
+from . import mis_account_period_balance
+from . import res_company
+from . import account_move
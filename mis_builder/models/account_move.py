@@ -0,0 +1,27 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def write(self, vals):
+        if "state" not in vals:
+            return super().write(vals)
+        posted = self.filtered(lambda move: move.state == "posted")
+        res = super().write(vals)
+        # posting or unposting a move changes the balances of its month
+        self.filtered(
+            lambda move: (move in posted) != (move.state == "posted")
+        )._reopen_mis_period_balances()
+        return res
+
+    def _reopen_mis_period_balances(self):
+        dates = {}
+        for move in self:
+            company_id = move.company_id.id
+            if company_id not in dates or move.date < dates[company_id]:
+                dates[company_id] = move.date
+        if dates:
+            self.env["mis.account.period.balance"].sudo()._reopen(dates)
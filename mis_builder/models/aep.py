@@ -1,11 +1,16 @@
 # Copyright 2014 ACSONE SA/NV (<http://acsone.eu>)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
+import copy
+import datetime as py_datetime
 import logging
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from odoo import fields
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields
 from odoo.exceptions import UserError
 from odoo.models import expression
 from odoo.tools.float_utils import float_is_zero
@@ -68,7 +73,11 @@ class AccountingExpressionProcessor:
           (note: it seems the orm then does one query per account to fetch
           the account name...);
         * additionally, one query per view/consolidation account is done to
-          discover the children accounts.
+          discover the children accounts;
+        * for posted move lines of months closed by the lock date, the sums
+          are read from the monthly balances of mis.account.period.balance
+          when they have been computed, and only the remaining move lines
+          are aggregated.
     """
 
     MODE_VARIATION = "p"
@@ -112,6 +121,13 @@ class AccountingExpressionProcessor:
         self.smart_end = True
         # Account model
         self._account_model = self.env[account_model].with_context(active_test=False)
+        # read the sums of closed months from mis.account.period.balance
+        # when available, instead of aggregating their move lines
+        self.use_period_balances = True
+        # ids of accounts with include_initial_balance, computed on demand
+        self._include_initial_balance_ids = None
+        # {do_queries arguments key: _data} filled by prefetch_queries()
+        self._prefetched_data = {}
 
     def _account_codes_to_domain(self, account_codes):
         """Convert a comma separated list of account codes
@@ -308,6 +324,58 @@ class AccountingExpressionProcessor:
             company_rates[company.id] = (rate, company.currency_id.decimal_places)
         return company_rates
 
+    def _with_env(self, env):
+        """Return a copy of the processor bound to another environment.
+
+        The copy shares the parsing results, but queries and stores its
+        data independently.
+        """
+        aep = copy.copy(self)
+        aep.env = env
+        aep.companies = self.companies.with_env(env)
+        aep.currency = self.currency.with_env(env)
+        aep._account_model = self._account_model.with_env(env)
+        aep._prefetched_data = {}
+        return aep
+
+    @staticmethod
+    def _get_queries_key(
+        date_from, date_to, additional_move_line_filter=None, aml_model=None
+    ):
+        return (
+            fields.Date.to_string(date_from),
+            fields.Date.to_string(date_to),
+            repr(additional_move_line_filter or []),
+            aml_model or "account.move.line",
+        )
+
+    def prefetch_queries(self, queries_args, max_workers=4):
+        """Run do_queries() for several periods concurrently.
+
+        Each period is queried in a worker thread with its own cursor, so
+        only committed data is seen. Results are kept in the order of
+        queries_args, and are used by the next do_queries() invoked with
+        the same arguments instead of querying the database again.
+
+        :param queries_args: a list of (date_from, date_to,
+                             additional_move_line_filter, aml_model) tuples
+        """
+        registry = self.env.registry
+        uid = self.env.uid
+        context = dict(self.env.context)
+
+        def run(args):
+            with registry.cursor(readonly=True) as cr:
+                aep = self._with_env(api.Environment(cr, uid, context))
+                aep.do_queries(*args)
+                return aep._data
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for args, data in zip(
+                queries_args, executor.map(run, queries_args), strict=True
+            ):
+                self._prefetched_data[self._get_queries_key(*args)] = data
+
     def do_queries(
         self,
         date_from,
@@ -320,6 +388,15 @@ class AccountingExpressionProcessor:
 
         This method must be executed after done_parsing().
         """
+        prefetched_data = self._prefetched_data.pop(
+            self._get_queries_key(
+                date_from, date_to, additional_move_line_filter, aml_model
+            ),
+            None,
+        )
+        if prefetched_data is not None:
+            self._data = prefetched_data
+            return
         if not aml_model:
             aml_model = self.env["account.move.line"]
         else:
@@ -334,6 +411,9 @@ class AccountingExpressionProcessor:
         )
         domain_by_mode = {}
         ends = []
+        period_balance_dates = self._get_period_balance_dates(
+            aml_model, additional_move_line_filter
+        )
         for key in self._map_account_ids:
             domain, mode = key
             if mode == self.MODE_END and self.smart_end:
@@ -348,6 +428,36 @@ class AccountingExpressionProcessor:
             domain.append(("account_id", "in", self._map_account_ids[key]))
             if additional_move_line_filter:
                 domain.extend(additional_move_line_filter)
+            period_balance_parts = []
+            if period_balance_dates and not key[0]:
+                period_balance_parts = self._get_period_balance_parts(
+                    period_balance_dates,
+                    self._map_account_ids[key],
+                    date_from,
+                    date_to,
+                    mode,
+                )
+            if period_balance_parts:
+                # leave out the move lines summed in the period balances
+                domain = expression.AND(
+                    [
+                        domain,
+                        ["!"]
+                        + expression.OR(
+                            [
+                                [
+                                    ("company_id", "=", company_id),
+                                    ("account_id", "in", account_ids),
+                                    ("date", "<=", part_to),
+                                ]
+                                + ([("date", ">=", part_from)] if part_from else [])
+                                for company_id, account_ids, part_from, part_to in (
+                                    period_balance_parts
+                                )
+                            ]
+                        ),
+                    ]
+                )
             # fetch sum of debit/credit, grouped by account_id
             _logger.debug("read_group domain: %s", domain)
             try:
@@ -369,10 +479,21 @@ class AccountingExpressionProcessor:
                         exception=e,
                     )
                 ) from e
+            # {(account_id, company_id): [debit, credit]}
+            balances = defaultdict(lambda: [0.0, 0.0])
             for account_id, company_id, debit, credit in accs:
-                rate, dp = company_rates[company_id.id]
-                debit = debit or 0.0
-                credit = credit or 0.0
+                balance = balances[(account_id.id, company_id.id)]
+                balance[0] += debit or 0.0
+                balance[1] += credit or 0.0
+            if period_balance_parts:
+                for account_id, company_id, debit, credit in self.env[
+                    "mis.account.period.balance"
+                ]._read_balances(period_balance_parts):
+                    balance = balances[(account_id, company_id)]
+                    balance[0] += debit or 0.0
+                    balance[1] += credit or 0.0
+            for (account_id, company_id), (debit, credit) in balances.items():
+                rate, dp = company_rates[company_id]
                 if mode in (self.MODE_INITIAL, self.MODE_UNALLOCATED) and float_is_zero(
                     debit - credit, precision_digits=self.dp
                 ):
@@ -380,7 +501,7 @@ class AccountingExpressionProcessor:
                     continue
                 # due to branches, it's possible to have multiple acc
                 # with the same account_id
-                self._data[key][account_id.id] += (debit * rate, credit * rate)
+                self._data[key][account_id] += (debit * rate, credit * rate)
         # compute ending balances by summing initial and variation
         for key in ends:
             domain, mode = key
@@ -394,6 +515,80 @@ class AccountingExpressionProcessor:
                 )
                 self._data[key][account_id] = (di + dv, ci + cv)
 
+    def _get_period_balance_dates(self, aml_model, additional_move_line_filter):
+        """Return {company_id: date} up to which move line sums can be read
+        from mis.account.period.balance, or an empty dict when the query
+        is not on posted move lines only."""
+        if (
+            not self.use_period_balances
+            or aml_model._name != "account.move.line"
+            or self._account_model._name != "account.account"
+        ):
+            return {}
+        if [tuple(d) for d in additional_move_line_filter or []] != [
+            ("parent_state", "=", "posted")
+        ]:
+            return {}
+        return self.env["mis.account.period.balance"]._get_snapshot_dates(
+            self.companies
+        )
+
+    def _get_period_balance_parts(
+        self, period_balance_dates, account_ids, date_from, date_to, mode
+    ):
+        """Return the parts of a query that can be read from the period
+        balances, as a list of (company_id, account_ids, date_from, date_to)
+        made of whole closed months."""
+        if self._include_initial_balance_ids is None:
+            accounts = self._account_model.browse(
+                {
+                    account_id
+                    for account_ids in self._map_account_ids.values()
+                    for account_id in account_ids
+                }
+            )
+            self._include_initial_balance_ids = set(
+                accounts.filtered("include_initial_balance").ids
+            )
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        fy_date_from = self.companies[0].compute_fiscalyear_dates(date_from)[
+            "date_from"
+        ]
+        day = py_datetime.timedelta(days=1)
+        # (include_initial_balance): (first date, last date) of the mode,
+        # as in get_aml_domain_for_dates()
+        if mode == self.MODE_VARIATION:
+            ranges = {True: (date_from, date_to), False: (date_from, date_to)}
+        elif mode == self.MODE_INITIAL:
+            ranges = {True: (None, date_from - day), False: (fy_date_from, date_from - day)}
+        elif mode == self.MODE_END:
+            ranges = {True: (None, date_to), False: (fy_date_from, date_to)}
+        elif mode == self.MODE_UNALLOCATED:
+            ranges = {False: (None, fy_date_from - day)}
+        else:
+            return []
+        parts = []
+        for include_initial_balance, (range_from, range_to) in ranges.items():
+            part_account_ids = [
+                account_id
+                for account_id in account_ids
+                if (account_id in self._include_initial_balance_ids)
+                == include_initial_balance
+            ]
+            if not part_account_ids:
+                continue
+            if range_from and range_from.day != 1:
+                range_from = range_from + relativedelta(months=1, day=1)
+            for company_id, balance_date in period_balance_dates.items():
+                part_to = min(range_to, balance_date)
+                if part_to != part_to + relativedelta(day=31):
+                    part_to = part_to + relativedelta(day=1) - day
+                if range_from and range_from > part_to:
+                    continue
+                parts.append((company_id, part_account_ids, range_from, part_to))
+        return parts
+
     def replace_expr(self, expr):
         """Replace accounting variables in an expression by their amount.
 
@@ -165,6 +165,9 @@ class KpiMatrix:
         # { account_id: account_name }
         self._account_names = {}
         self._multi_company = multi_company
+        # kpis sorted by dependencies, set once for all columns
+        # by mis.report.prepare_kpi_matrix()
+        self.kpi_evaluation_order = None
 
     def declare_kpi(self, kpi):
         """Declare a new kpi (row) in the matrix.
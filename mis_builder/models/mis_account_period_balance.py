@@ -0,0 +1,225 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+import datetime
+import logging
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class MisAccountPeriodBalance(models.Model):
+    """Monthly debit and credit of the posted move lines of closed periods.
+
+    One row per company, account and month, for the months ending on or
+    before the lock date of the company. The accounting expression processor
+    reads these rows instead of aggregating the move lines of such months.
+
+    Rows are maintained by the "Refresh MIS period balances" scheduled
+    action; companies that were never refreshed are queried from the move
+    lines as usual. Posting or unposting a move dated in a stored month
+    (e.g. through a lock date exception) and moving a lock date back drop
+    the stored months from that month on, until the next refresh.
+    """
+
+    _name = "mis.account.period.balance"
+    _description = "MIS Account Period Balance"
+    _order = "company_id, date, account_id"
+
+    company_id = fields.Many2one(
+        comodel_name="res.company", required=True, readonly=True, ondelete="cascade"
+    )
+    account_id = fields.Many2one(
+        comodel_name="account.account",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    date = fields.Date(
+        required=True, readonly=True, help="First day of the month of the balance."
+    )
+    debit = fields.Float(readonly=True)
+    credit = fields.Float(readonly=True)
+
+    _sql_constraints = [
+        (
+            "company_account_date_unique",
+            "unique(company_id, account_id, date)",
+            "There can be only one balance per company, account and month.",
+        ),
+    ]
+
+    @api.model
+    def _get_closed_date(self, company):
+        """Return the last day of the last month closed for the company,
+        or None if no period is closed."""
+        lock_dates = [
+            d for d in (company.fiscalyear_lock_date, company.hard_lock_date) if d
+        ]
+        if not lock_dates:
+            return None
+        lock_date = max(lock_dates)
+        month_end = lock_date + relativedelta(day=31)
+        if lock_date != month_end:
+            # the month of the lock date is not entirely closed
+            lock_date = lock_date + relativedelta(day=1) - datetime.timedelta(days=1)
+        return lock_date
+
+    @api.model
+    def _get_snapshot_dates(self, companies):
+        """Return {company_id: date} up to which the balances of each company
+        can be read from this table."""
+        res = {}
+        for company in companies.sudo():
+            snapshot_date = company.mis_period_balance_date
+            closed_date = self._get_closed_date(company)
+            if snapshot_date and closed_date:
+                # the lock date may have been moved back since the refresh
+                res[company.id] = min(snapshot_date, closed_date)
+        return res
+
+    @api.model
+    def _read_balances(self, parts):
+        """Sum the balances of the given parts.
+
+        :param parts: a list of (company_id, account_ids, date_from, date_to)
+                      where date_from and date_to are month boundaries and
+                      date_from may be None for "since the beginning".
+
+        Returns a list of (account_id, company_id, debit, credit).
+        """
+        clauses = []
+        for company_id, account_ids, date_from, date_to in parts:
+            clause = SQL(
+                "(company_id = %s AND account_id IN %s AND date <= %s)",
+                company_id,
+                tuple(account_ids),
+                date_to,
+            )
+            if date_from:
+                clause = SQL("(%s AND date >= %s)", clause, date_from)
+            clauses.append(clause)
+        if not clauses:
+            return []
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT account_id, company_id, SUM(debit), SUM(credit)
+                FROM mis_account_period_balance
+                WHERE %s
+                GROUP BY account_id, company_id
+                """,
+                SQL(" OR ").join(clauses),
+            )
+        )
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _refresh(self, companies=None, full=False):
+        """Bring the balances of the companies up to their closed date.
+
+        Only the months closed since the previous refresh are aggregated,
+        unless ``full`` is set, in which case all balances are rebuilt.
+        """
+        if companies is None:
+            companies = self.env["res.company"].search([])
+        self.env["account.move.line"].flush_model(
+            ["company_id", "account_id", "date", "debit", "credit", "parent_state"]
+        )
+        for company in companies.sudo():
+            closed_date = self._get_closed_date(company)
+            snapshot_date = company.mis_period_balance_date
+            if full or not closed_date:
+                self.env.cr.execute(
+                    SQL(
+                        "DELETE FROM mis_account_period_balance WHERE company_id = %s",
+                        company.id,
+                    )
+                )
+                snapshot_date = None
+            elif snapshot_date and snapshot_date >= closed_date:
+                # nothing newly closed, or the lock date has been moved
+                # back: forget the reopened months
+                self.env.cr.execute(
+                    SQL(
+                        "DELETE FROM mis_account_period_balance "
+                        "WHERE company_id = %s AND date > %s",
+                        company.id,
+                        closed_date,
+                    )
+                )
+                company.mis_period_balance_date = closed_date
+                continue
+            if closed_date:
+                date_filter = SQL("aml.date <= %s", closed_date)
+                if snapshot_date:
+                    date_filter = SQL("%s AND aml.date > %s", date_filter, snapshot_date)
+                self.env.cr.execute(
+                    SQL(
+                        """
+                        INSERT INTO mis_account_period_balance (
+                            company_id, account_id, date, debit, credit,
+                            create_uid, create_date, write_uid, write_date
+                        )
+                        SELECT aml.company_id, aml.account_id,
+                               date_trunc('month', aml.date)::date,
+                               SUM(aml.debit), SUM(aml.credit),
+                               %(uid)s, NOW() AT TIME ZONE 'UTC',
+                               %(uid)s, NOW() AT TIME ZONE 'UTC'
+                        FROM account_move_line aml
+                        WHERE aml.company_id = %(company_id)s
+                          AND aml.parent_state = 'posted'
+                          AND %(date_filter)s
+                        GROUP BY aml.company_id, aml.account_id,
+                                 date_trunc('month', aml.date)
+                        """,
+                        uid=self.env.uid,
+                        company_id=company.id,
+                        date_filter=date_filter,
+                    )
+                )
+                _logger.info(
+                    "%s MIS period balances added for company %s up to %s",
+                    self.env.cr.rowcount,
+                    company.name,
+                    closed_date,
+                )
+            company.mis_period_balance_date = closed_date
+        self.invalidate_model()
+
+    @api.model
+    def _reopen(self, dates):
+        """Drop the balances from the month of the given dates on.
+
+        :param dates: {company_id: earliest date of the changed move lines},
+                      None dropping all the balances of the company
+        """
+        companies = self.env["res.company"].sudo().browse(list(dates))
+        for company in companies:
+            snapshot_date = company.mis_period_balance_date
+            date = dates[company.id]
+            if not snapshot_date or (date and date > snapshot_date):
+                continue
+            if date:
+                month = date + relativedelta(day=1)
+                self.env.cr.execute(
+                    SQL(
+                        "DELETE FROM mis_account_period_balance "
+                        "WHERE company_id = %s AND date >= %s",
+                        company.id,
+                        month,
+                    )
+                )
+                company.mis_period_balance_date = month - datetime.timedelta(days=1)
+            else:
+                self.env.cr.execute(
+                    SQL(
+                        "DELETE FROM mis_account_period_balance WHERE company_id = %s",
+                        company.id,
+                    )
+                )
+                company.mis_period_balance_date = False
+        self.invalidate_model()
@@ -3,6 +3,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
 import datetime
+import heapq
 import logging
 import re
 import time
@@ -69,6 +70,15 @@ def _is_valid_python_var(name):
     return re.match("[_A-Za-z][_a-zA-Z0-9]*$", name)
 
 
+_STRING_LITERAL_RE = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NAME_RE = re.compile(r"[_A-Za-z][_a-zA-Z0-9]*")
+
+
+def _expression_names(expr):
+    """Return the set of python names an expression may reference"""
+    return set(_NAME_RE.findall(_STRING_LITERAL_RE.sub("", expr)))
+
+
 class MisReportKpi(models.Model):
     """A KPI is an element (ie a line) of a MIS report.
 
@@ -537,8 +547,46 @@ class MisReport(models.Model):
         kpi_matrix = KpiMatrix(self.env, multi_company, self.account_model)
         for kpi in self.kpi_ids:
             kpi_matrix.declare_kpi(kpi)
+        kpi_matrix.kpi_evaluation_order = self._get_kpi_evaluation_order()
         return kpi_matrix
 
+    def _get_kpi_evaluation_order(self):
+        """Return the kpis sorted so each one comes after the kpis it uses.
+
+        The report order is preserved among independent kpis. Kpis that are
+        part of a dependency cycle are appended in report order, so the
+        evaluation loop reports them as name errors as before.
+        """
+        self.ensure_one()
+        kpis = list(self.kpi_ids)
+        index_by_name = {kpi.name: i for i, kpi in enumerate(kpis)}
+        dependents = defaultdict(list)
+        pending = [0] * len(kpis)
+        for i, kpi in enumerate(kpis):
+            names = set()
+            for expression in kpi.expression_ids:
+                if expression.name:
+                    names |= _expression_names(expression.name)
+            for name in names:
+                j = index_by_name.get(name)
+                if j is not None and j != i:
+                    dependents[j].append(i)
+                    pending[i] += 1
+        ready = [i for i in range(len(kpis)) if not pending[i]]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            for j in dependents[i]:
+                pending[j] -= 1
+                if not pending[j]:
+                    heapq.heappush(ready, j)
+        if len(order) < len(kpis):
+            done = set(order)
+            order.extend(i for i in range(len(kpis)) if i not in done)
+        return [kpis[i] for i in order]
+
     def _prepare_aep(self, companies, currency=None):
         self.ensure_one()
         aep = AEP(companies, currency, self.account_model)
@@ -669,7 +717,11 @@ class MisReport(models.Model):
             col_key, col_label, col_description, locals_dict, subkpis
         )
 
-        compute_queue = self.kpi_ids
+        # with kpis in dependency order, a single pass normally suffices;
+        # the recompute loop only deals with names it could not resolve
+        compute_queue = kpi_matrix.kpi_evaluation_order
+        if compute_queue is None:
+            compute_queue = self._get_kpi_evaluation_order()
         recompute_queue = []
         while True:
             for kpi in compute_queue:
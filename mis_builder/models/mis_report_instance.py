@@ -543,6 +543,13 @@ class MisReportInstance(models.Model):
     display_columns_description = fields.Boolean(
         help="Display the date range details in the column headers."
     )
+    parallel_columns = fields.Boolean(
+        string="Compute columns in parallel",
+        help="Query the journal items of the actuals columns concurrently, "
+        "each in its own database connection. Sum and comparison columns "
+        "are still computed afterwards from the columns they depend on. "
+        "Only data committed to the database is reported.",
+    )
     comparison_mode = fields.Boolean(
         compute="_compute_comparison_mode", inverse="_inverse_comparison_mode"
     )
@@ -861,6 +868,41 @@ class MisReportInstance(models.Model):
         elif period.source == SRC_CMPCOL:
             return self._add_column_cmpcol(aep, kpi_matrix, period, label, description)
 
+    def _prefetch_columns(self, aep):
+        """Run the accounting queries of the actuals columns concurrently.
+
+        Only columns sourced from move lines are prefetched: sum and
+        comparison columns depend on other columns and are computed from
+        the matrix once all columns are declared, and other sources are
+        left to their own _add_column implementation. The columns are then
+        evaluated and declared in the matrix in period order as usual.
+        """
+        self.ensure_one()
+        periods = self.period_ids.filtered(
+            lambda p: p.source in (SRC_ACTUALS, SRC_ACTUALS_ALT)
+            and p.date_from
+            and p.date_to
+        )
+        if len(periods) < 2:
+            return
+        max_workers = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("mis_builder.parallel_columns_workers", 4)
+        )
+        aep.prefetch_queries(
+            [
+                (
+                    period.date_from,
+                    period.date_to,
+                    period._get_additional_move_line_filter(),
+                    period.source_aml_model_name,
+                )
+                for period in periods
+            ],
+            max_workers=max_workers,
+        )
+
     def _compute_matrix(self):
         """Compute a report and return a KpiMatrix.
 
@@ -870,6 +912,8 @@ class MisReportInstance(models.Model):
         self.ensure_one()
         aep = self.report_id._prepare_aep(self.query_company_ids, self.currency_id)
         kpi_matrix = self.report_id.prepare_kpi_matrix(self.multi_company)
+        if self.parallel_columns:
+            self._prefetch_columns(aep)
         for period in self.period_ids:
             description = None
             if period.mode == MODE_NONE:
@@ -0,0 +1,32 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+import datetime
+
+from odoo import fields, models
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    mis_period_balance_date = fields.Date(
+        string="MIS Period Balances Up To",
+        readonly=True,
+        help="Last day of the closed months whose balances are stored "
+        "for MIS reports.",
+    )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"fiscalyear_lock_date", "hard_lock_date"}.intersection(vals):
+            # a lock date moved back reopens the stored months after it
+            balance_model = self.env["mis.account.period.balance"]
+            dates = {}
+            for company in self.sudo().filtered("mis_period_balance_date"):
+                closed_date = balance_model._get_closed_date(company)
+                if not closed_date:
+                    dates[company.id] = None
+                elif closed_date < company.mis_period_balance_date:
+                    dates[company.id] = closed_date + datetime.timedelta(days=1)
+            if dates:
+                balance_model._reopen(dates)
+        return res
@@ -455,3 +455,122 @@ class TestAEP(common.TransactionCase):
         )
         initial = self._eval_by_account_id("bali[]")
         self.assertEqual(initial, {self.account_ar.id: 950, self.account_in.id: -850})
+
+    def test_aep_period_balances(self):
+        exprs = [
+            "bali[]",
+            "bale[]",
+            "balp[]",
+            "balu[]",
+            "bali[700IN]",
+            "bale[700IN]",
+            "bale[400AR]",
+            "debp[400A%]",
+        ]
+        self.aep.done_parsing()
+        # close january of this year and store its balances
+        self.company.fiscalyear_lock_date = datetime.date(self.curr_year, 1, 31)
+        self.env["mis.account.period.balance"]._refresh(self.company)
+        self.assertEqual(
+            self.company.mis_period_balance_date, datetime.date(self.curr_year, 1, 31)
+        )
+        self.assertEqual(
+            self.env["mis.account.period.balance"].search_count(
+                [("company_id", "=", self.company.id)]
+            ),
+            4,
+        )
+        for date_from, date_to in [
+            (datetime.date(self.prev_year, 12, 1), datetime.date(self.prev_year, 12, 31)),
+            (datetime.date(self.curr_year, 1, 1), datetime.date(self.curr_year, 1, 31)),
+            (datetime.date(self.curr_year, 1, 15), datetime.date(self.curr_year, 3, 31)),
+            (datetime.date(self.curr_year, 4, 1), datetime.date(self.curr_year, 4, 30)),
+        ]:
+            results = {}
+            for use_period_balances in (True, False):
+                self.aep.use_period_balances = use_period_balances
+                self.aep.do_queries(
+                    date_from=fields.Date.to_string(date_from),
+                    date_to=fields.Date.to_string(date_to),
+                    additional_move_line_filter=[("parent_state", "=", "posted")],
+                )
+                results[use_period_balances] = [self._eval(expr) for expr in exprs]
+            self.assertEqual(results[True], results[False])
+        # moving the lock date back forgets the reopened months
+        self.company.fiscalyear_lock_date = datetime.date(self.prev_year, 12, 31)
+        self.env["mis.account.period.balance"]._refresh(self.company)
+        self.assertEqual(
+            self.env["mis.account.period.balance"].search_count(
+                [("company_id", "=", self.company.id)]
+            ),
+            2,
+        )
+
+    def test_aep_period_balances_reopen(self):
+        balance_model = self.env["mis.account.period.balance"]
+        self.company.fiscalyear_lock_date = datetime.date(self.curr_year, 1, 31)
+        balance_model._refresh(self.company)
+        # a move of January changing state drops the months from January on
+        move = self.move_model.search(
+            [
+                ("journal_id", "=", self.journal.id),
+                ("date", "<=", "%s-01-31" % self.curr_year),
+            ],
+            order="date desc",
+            limit=1,
+        )
+        move._reopen_mis_period_balances()
+        self.assertEqual(
+            self.company.mis_period_balance_date, datetime.date(self.prev_year, 12, 31)
+        )
+        self.assertEqual(
+            balance_model.search_count([("company_id", "=", self.company.id)]), 2
+        )
+        balance_model._refresh(self.company)
+        self.assertEqual(
+            balance_model.search_count([("company_id", "=", self.company.id)]), 4
+        )
+        # moving the lock date back drops the reopened months right away
+        self.company.fiscalyear_lock_date = datetime.date(self.prev_year, 12, 31)
+        self.assertEqual(
+            self.company.mis_period_balance_date, datetime.date(self.prev_year, 12, 31)
+        )
+        self.assertEqual(
+            balance_model.search_count([("company_id", "=", self.company.id)]), 2
+        )
+        # and removing it drops them all
+        self.company.fiscalyear_lock_date = False
+        self.assertFalse(self.company.mis_period_balance_date)
+        self.assertFalse(
+            balance_model.search_count([("company_id", "=", self.company.id)])
+        )
+
+    def test_aep_prefetch_queries(self):
+        exprs = ["balp[]", "bale[700IN]", "crdp[400A%]"]
+        self.aep.done_parsing()
+        periods = [
+            (datetime.date(self.prev_year, 12, 1), datetime.date(self.prev_year, 12, 31)),
+            (datetime.date(self.curr_year, 1, 1), datetime.date(self.curr_year, 3, 31)),
+            (datetime.date(self.curr_year, 4, 1), datetime.date(self.curr_year, 4, 30)),
+        ]
+        serial = []
+        for date_from, date_to in periods:
+            self.aep.do_queries(date_from, date_to)
+            serial.append([self._eval(expr) for expr in exprs])
+        self.env.flush_all()
+        # the worker threads must see the uncommitted moves of the test:
+        # in test mode their cursors share the test cursor
+        self.registry.enter_test_mode(self.env.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        self.aep.prefetch_queries(
+            [(date_from, date_to, None, None) for date_from, date_to in periods],
+            max_workers=2,
+        )
+        self.assertEqual(len(self.aep._prefetched_data), 3)
+        parallel = []
+        for date_from, date_to in periods:
+            self.aep.do_queries(date_from, date_to)
+            parallel.append([self._eval(expr) for expr in exprs])
+        self.assertEqual(parallel, serial)
+        # prefetched data is consumed
+        self.assertFalse(self.aep._prefetched_data)
@@ -400,6 +400,13 @@ class TestMisReportInstance(common.HttpCase):
         self.assertEqual(r["k6"], ("bla", "blabla"))
         self.assertEqual(r["k7"], (AccountingNone, 1.0))
 
+    def test_kpi_evaluation_order(self):
+        # k4 uses k3, which comes after it in the report
+        kpis = self.report._get_kpi_evaluation_order()
+        self.assertEqual(
+            [kpi.name for kpi in kpis], ["k1", "k2", "k3", "k4", "k5", "k6", "k7"]
+        )
+
     def test_json(self):
         self.report_instance.compute()
 
@@ -18,6 +18,7 @@ STOCK_PICKING_MODEL = "stock.picking"
 STOCK_MOVE_MODEL = "stock.move"
 STOCK_LOT_MODEL = "stock.lot"
 STOCK_QUANT_MODEL = "stock.quant"
+SINCE_MARGIN_SECONDS = 30
 
 
 PICKING_PRINT_REPORTS = [
@@ -80,12 +81,10 @@ class MrpParallelConsoleController(http.Controller):
         if not production_id:
             return
 
-        channel = f"mrp_parallel_console.production.{production_id}"
-        try:
-            request.env["bus.bus"]._sendone(channel, event_type, data)
-        except Exception:
-            # Log but don't fail the operation if bus notification fails
-            pass
+        # Batched with the notifications of the work orders, sent at commit
+        workorder_model = request.env[MRP_WORKORDER_MODEL]
+        channel = workorder_model._get_notification_channel_by_id(production_id)
+        workorder_model._send_bus_notification(channel, event_type, data)
 
     # ---------------------------------------------------------
     # Root dashboard: list Manufacturing Orders
@@ -174,8 +173,20 @@ class MrpParallelConsoleController(http.Controller):
     # Data load for console (single MO)
     # ---------------------------------------------------------
     @http.route("/mrp_parallel_console/get_data", type="json", auth="user")
-    def get_data(self, production_id=None):
+    def get_data(self, production_id=None, since=None):
+        """Return the console payload.
+
+        The related records of all work orders are read with one query per
+        model. When ``since`` is the ``server_time`` of a previous call, only
+        the work orders changed after it are serialized; ``workorder_ids``
+        always lists all of them so that the client can drop the others.
+        """
         _require_group("mrp.group_mrp_user")
+        # Work orders written by transactions still running when the
+        # previous payload was built are sent again on the next call.
+        server_time = fields.Datetime.now() - relativedelta(
+            seconds=SINCE_MARGIN_SECONDS
+        )
         # When opening from a specific MO, show all its workorders except canceled.
         if production_id:
             domain = [("production_id", "=", production_id), ("state", "!=", "cancel")]
@@ -185,9 +196,9 @@ class MrpParallelConsoleController(http.Controller):
             ]
 
         workorder_model = request.env[MRP_WORKORDER_MODEL]
-        workorders = workorder_model.search(domain, order="id")
+        all_workorders = workorder_model.search(domain, order="id")
 
-        wc_ids = workorders.mapped("workcenter_id").ids
+        wc_ids = all_workorders.mapped("workcenter_id").ids
         busy_map = {}
         if wc_ids:
             progress_wos = workorder_model.search(
@@ -197,7 +208,7 @@ class MrpParallelConsoleController(http.Controller):
                 busy_map.setdefault(pwo.workcenter_id.id, set()).add(pwo.id)
 
         maintenance_wcs = set()
-        workcenters = workorders.mapped("workcenter_id")
+        workcenters = all_workorders.mapped("workcenter_id")
         for wc in workcenters:
             if getattr(wc, "maintenance_state", False) == "maintenance":
                 maintenance_wcs.add(wc.id)
@@ -216,45 +227,44 @@ class MrpParallelConsoleController(http.Controller):
                 domain.append(("maintenance_type", "in", ["corrective", "preventive"]))
             maintenance_wcs |= set(MaintReq.search(domain).mapped("workcenter_id.id"))
 
+        workorders = all_workorders
+        if since:
+            changed_ids = self._mpc_get_changed_workorder_ids(
+                all_workorders, fields.Datetime.to_datetime(since)
+            )
+            workorders = all_workorders.filtered(lambda w: w.id in changed_ids)
+
+        components_map = self._mpc_get_components_map(workorders.production_id)
+        qty_logs_map = self._mpc_group_by_workorder(
+            "mrp.workorder.qty.log", workorders, order="create_date asc, id asc"
+        )
+        prod_lines_map = self._mpc_group_by_workorder(
+            "mrp.workcenter.productivity",
+            workorders,
+            order="date_start desc, id desc",
+        )
         # Draft scrap log per workorder (for modal display)
-        draft_scraps_map = defaultdict(list)
-        if workorders:
-            draft_scraps = request.env["stock.scrap"].search(
-                [
-                    ("workorder_id", "in", workorders.ids),
-                    ("state", "=", "draft"),
-                ]
+        draft_scraps_map = self._mpc_group_by_workorder(
+            "stock.scrap", workorders, extra_domain=[("state", "=", "draft")]
+        )
+        qc_pending_ids = set(
+            self._mpc_group_by_workorder(
+                "quality.check",
+                workorders,
+                extra_domain=[("quality_state", "not in", ("pass", "fail"))],
             )
-            for scrap in draft_scraps:
-                draft_scraps_map[scrap.workorder_id.id].append(scrap)
+        )
 
         result = []
-        production_state = None
         for wo in workorders:
             mo = wo.production_id
-            production_state = production_state or mo.state
             # components at MO level (simple summary)
-            components = []
-            for move in mo.move_raw_ids:
-                required = move.product_uom_qty
-                consumed = getattr(move, "quantity_done", move.quantity)
-                remaining = required - consumed
-                components.append(
-                    {
-                        "product_id": move.product_id.id,
-                        "product_name": move.product_id.display_name,
-                        "required_qty": required,
-                        "consumed_qty": consumed,
-                        "remaining_qty": remaining,
-                    }
-                )
+            components = components_map.get(mo.id, [])
 
             employees = [{"id": emp.id, "name": emp.name} for emp in wo.employee_ids]
 
-            qty_logs = request.env["mrp.workorder.qty.log"].search(
-                [("workorder_id", "=", wo.id)], order="create_date asc, id asc"
-            )
-            qty_logs_sum = sum(qty_logs.mapped("qty"))
+            qty_logs = qty_logs_map.get(wo.id, [])
+            qty_logs_sum = sum(log.qty for log in qty_logs)
             qty_logs_payload = [
                 {
                     "id": log.id,
@@ -283,39 +293,29 @@ class MrpParallelConsoleController(http.Controller):
             planned_qty = (
                 wo.planned_qty if is_parallel and wo.planned_qty else mo.product_qty
             )
-            qc_pending = bool(
-                getattr(wo, "check_ids", False)
-                and wo.check_ids.filtered(
-                    lambda c: c.quality_state not in ("pass", "fail")
-                )
-            )
+            qc_pending = wo.id in qc_pending_ids
 
             time_tracking = []
-            Productivity = request.env.get("mrp.workcenter.productivity")
-            if Productivity:
-                prod_lines = Productivity.search(
-                    [("workorder_id", "=", wo.id)], order="date_start desc, id desc"
+            for line in prod_lines_map.get(wo.id, []):
+                duration = getattr(line, "duration", 0.0) or 0.0
+                hours = int(duration // 60)
+                minutes = int(round(duration % 60))
+                duration_display = f"{hours:02d}:{minutes:02d}"
+                time_tracking.append(
+                    {
+                        "id": line.id,
+                        "employee": getattr(line, "employee_id", False)
+                        and line.employee_id.display_name
+                        or "",
+                        "duration": duration,
+                        "duration_display": duration_display,
+                        "start": getattr(line, "date_start", False),
+                        "end": getattr(line, "date_end", False),
+                        "productivity": getattr(line, "loss_id", False)
+                        and line.loss_id.display_name
+                        or "",
+                    }
                 )
-                for line in prod_lines:
-                    duration = getattr(line, "duration", 0.0) or 0.0
-                    hours = int(duration // 60)
-                    minutes = int(round(duration % 60))
-                    duration_display = f"{hours:02d}:{minutes:02d}"
-                    time_tracking.append(
-                        {
-                            "id": line.id,
-                            "employee": getattr(line, "employee_id", False)
-                            and line.employee_id.display_name
-                            or "",
-                            "duration": duration,
-                            "duration_display": duration_display,
-                            "start": getattr(line, "date_start", False),
-                            "end": getattr(line, "date_end", False),
-                            "productivity": getattr(line, "loss_id", False)
-                            and line.loss_id.display_name
-                            or "",
-                        }
-                    )
 
             draft_scraps = draft_scraps_map.get(wo.id, [])
             scraps_data = []
@@ -409,8 +409,8 @@ class MrpParallelConsoleController(http.Controller):
         production = None
         if production_id:
             production = request.env[MRP_PRODUCTION_MODEL].browse(production_id)
-        elif workorders:
-            production = workorders[0].production_id
+        elif all_workorders:
+            production = all_workorders[0].production_id
         if production and production.exists():
             # pending component moves with remaining quantity to process
             pending_moves = production.move_raw_ids.filtered(
@@ -425,6 +425,7 @@ class MrpParallelConsoleController(http.Controller):
             if pending_moves:
                 can_close_production = False
 
+        production_state = all_workorders[:1].production_id.state or None
         production_display = ""
         mo_closed = False
         if production and production.exists():
@@ -438,7 +439,106 @@ class MrpParallelConsoleController(http.Controller):
             "production_state": production_state,
             "production_display": production_display,
             "mo_closed": mo_closed,
+            "workorder_ids": all_workorders.ids,
+            "server_time": server_time,
+            "partial": bool(since),
+        }
+
+    def _mpc_group_by_workorder(
+        self, model_name, workorders, extra_domain=None, order=None
+    ):
+        """Return {workorder_id: [records]} of ``model_name`` linked to the
+        work orders, read with a single query."""
+        if model_name not in request.env.registry or not workorders:
+            return {}
+        records = request.env[model_name].search(
+            expression.AND(
+                [[("workorder_id", "in", workorders.ids)], extra_domain or []]
+            ),
+            order=order,
+        )
+        res = defaultdict(list)
+        for record in records:
+            res[record.workorder_id.id].append(record)
+        return res
+
+    def _mpc_get_components_map(self, productions):
+        """Return {production_id: [component summary]} of the raw moves of
+        the productions."""
+        res = {}
+        # reading the moves of the first production fetches those of all
+        for production in productions:
+            res[production.id] = components = []
+            for move in production.move_raw_ids:
+                required = move.product_uom_qty
+                consumed = getattr(move, "quantity_done", move.quantity)
+                remaining = required - consumed
+                components.append(
+                    {
+                        "product_id": move.product_id.id,
+                        "product_name": move.product_id.display_name,
+                        "required_qty": required,
+                        "consumed_qty": consumed,
+                        "remaining_qty": remaining,
+                    }
+                )
+        return res
+
+    def _mpc_get_changed_workorder_ids(self, workorders, since):
+        """Return the ids of the work orders whose console payload may have
+        changed after ``since``: the work orders or their production were
+        written, one of their related records was, or the availability of
+        their work center changed."""
+        env = request.env
+        changed = set(
+            workorders.filtered(
+                lambda w: w.write_date > since or w.production_id.write_date > since
+            ).ids
+        )
+        for model_name in (
+            "mrp.workorder.qty.log",
+            "mrp.workcenter.productivity",
+            "stock.scrap",
+            "quality.check",
+        ):
+            if model_name not in env.registry:
+                continue
+            groups = env[model_name]._read_group(
+                [("workorder_id", "in", workorders.ids), ("write_date", ">", since)],
+                ["workorder_id"],
+            )
+            changed.update(workorder.id for [workorder] in groups)
+        groups = env[STOCK_MOVE_MODEL]._read_group(
+            [
+                ("raw_material_production_id", "in", workorders.production_id.ids),
+                ("write_date", ">", since),
+            ],
+            ["raw_material_production_id"],
+        )
+        production_ids = {production.id for [production] in groups}
+        changed.update(
+            workorders.filtered(lambda w: w.production_id.id in production_ids).ids
+        )
+        # machine status depends on the other work orders of the work center
+        wc_domain = [
+            ("workcenter_id", "in", workorders.workcenter_id.ids),
+            ("write_date", ">", since),
+        ]
+        wc_ids = {
+            wc.id
+            for [wc] in env[MRP_WORKORDER_MODEL]._read_group(
+                wc_domain, ["workcenter_id"]
+            )
         }
+        if "maintenance.request" in env.registry:
+            wc_ids.update(
+                wc.id
+                for [wc] in env["maintenance.request"]._read_group(
+                    wc_domain, ["workcenter_id"]
+                )
+            )
+        changed.update(workorders.filtered(lambda w: w.workcenter_id.id in wc_ids).ids)
+        return changed
 
     # ---------------------------------------------------------
     # Update console fields (qty, dates, employees)
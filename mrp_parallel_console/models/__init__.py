@@ -16,3 +16,4 @@ from . import (
     res_company,
     stock_move_line,
 )
+from . import mrp_production_finite_planner
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+import pytz
+
+from odoo import api, fields, models
+
+from ..utils.finite_planner import FiniteCapacityPlanner, Machine, Task, WorkingTime
+
+# Days of calendar read ahead, later dates are extrapolated
+FINITE_PLANNING_HORIZON_DAYS = 90
+
+
+class MrpProduction(models.Model):
+    _inherit = "mrp.production"
+
+    def action_mpc_plan_finite_capacity(self):
+        """Plan the selected MOs on the free capacity of their workcenters."""
+        self._mpc_plan_finite_capacity()
+        return True
+
+    def _mpc_plan_finite_capacity(self, date_start=None):
+        """Assign the quantities and dates of the open workorders of the MOs.
+
+        The MOs are planned by priority and start date, after the load
+        already queued on each workcenter (workorders outside of the
+        batch). Each parallel operation is spread over its workcenters not
+        under maintenance so that they finish together, within their
+        working calendar; workorders getting no quantity are left as they
+        are.
+        Operations of an MO are planned in sequence.
+        """
+        productions = self.filtered(
+            lambda mo: mo.state in ("confirmed", "progress")
+        ).sorted(lambda mo: (-int(mo.priority or 0), mo.date_start, mo.id))
+        workorders = productions.workorder_ids.filtered(
+            lambda wo: wo.state not in ("done", "cancel") and wo.workcenter_id
+        )
+        if not workorders:
+            return {}
+        date_start = date_start or fields.Datetime.now()
+        workcenters = workorders.workcenter_id
+        blocked_wc_ids = self._mpc_get_blocked_wc_ids(workcenters.ids)
+
+        machines = self._mpc_get_planner_machines(workcenters, workorders, date_start)
+        jobs = []
+        groups_by_key = {}
+        for mo in productions:
+            tasks = []
+            for key, group in mo._mpc_get_operation_groups(workorders):
+                task = mo._mpc_prepare_planner_task(key, group, blocked_wc_ids)
+                if task:
+                    tasks.append(task)
+                    groups_by_key[key] = group
+            jobs.append(tasks)
+        ready = date_start.replace(tzinfo=pytz.utc).timestamp()
+        result = FiniteCapacityPlanner(machines).plan(jobs, ready=ready)
+
+        touched = self.env["mrp.workorder"]
+        for key, allocations in result.items():
+            group = groups_by_key[key]
+            touched |= self._mpc_apply_planner_allocations(group, allocations)
+        if touched:
+            touched._recompute_parallel_siblings()
+        return result
+
+    def _mpc_get_planner_machines(self, workcenters, workorders, date_start):
+        """Return the planner machines of the workcenters, with the working
+        intervals of their calendar and the end of their queued load."""
+        load_groups = self.env["mrp.workorder"]._read_group(
+            [
+                ("workcenter_id", "in", workcenters.ids),
+                ("state", "in", ("pending", "waiting", "ready", "progress")),
+                ("id", "not in", workorders.ids),
+                ("date_finished", ">", date_start),
+            ],
+            ["workcenter_id"],
+            ["date_finished:max"],
+        )
+        busy_until = {wc.id: date_finished for wc, date_finished in load_groups}
+
+        start = date_start.replace(tzinfo=pytz.utc)
+        end = start + timedelta(days=FINITE_PLANNING_HORIZON_DAYS)
+        origin = start.timestamp()
+        intervals = {}
+        for calendar in workcenters.resource_calendar_id:
+            calendar_wcs = workcenters.filtered(
+                lambda wc, calendar=calendar: wc.resource_calendar_id == calendar
+            )
+            # one query for all the workcenters of the calendar, with their
+            # own leaves (e.g. planned maintenance)
+            batch = calendar._work_intervals_batch(
+                start, end, resources=calendar_wcs.resource_id
+            )
+            for wc in calendar_wcs:
+                intervals[wc.id] = [
+                    (interval_start.timestamp(), interval_end.timestamp())
+                    for interval_start, interval_end, __ in batch[wc.resource_id.id]
+                ]
+
+        machines = []
+        for wc in workcenters:
+            available_from = busy_until.get(wc.id)
+            machines.append(
+                Machine(
+                    wc.id,
+                    WorkingTime(origin, intervals.get(wc.id)),
+                    available_from
+                    and available_from.replace(tzinfo=pytz.utc).timestamp(),
+                )
+            )
+        return machines
+
+    def _mpc_get_operation_groups(self, workorders):
+        """Yield (key, workorders) per operation of the MO, in sequence."""
+        self.ensure_one()
+        groups = {}
+        for wo in workorders.filtered(lambda w: w.production_id == self):
+            op = wo.operation_id
+            if op and op.parallel_mode == "parallel":
+                key = (self.id, "operation", op.id)
+            else:
+                key = (self.id, "workorder", wo.id)
+            groups.setdefault(key, self.env["mrp.workorder"])
+            groups[key] |= wo
+        for key, group in sorted(
+            groups.items(),
+            key=lambda item: (item[1][:1].operation_id.sequence, min(item[1].ids)),
+        ):
+            yield key, group
+
+    def _mpc_prepare_planner_task(self, key, group, blocked_wc_ids):
+        """Return the planner task of an operation group, or None."""
+        self.ensure_one()
+        op = group[:1].operation_id
+        if op and op.parallel_mode == "parallel":
+            qty = int(round(self.product_qty or 0.0))
+            if qty <= 0 or not op.time_cycle:
+                return None
+            candidates = group.filtered(
+                lambda wo: wo.workcenter_id.id not in blocked_wc_ids
+            ) or group
+            task_candidates = []
+            for wo in candidates:
+                wc = wo.workcenter_id
+                capacity = wc._get_capacity(self.product_id) or 1.0
+                efficiency = (wc.time_efficiency or 100.0) / 100.0
+                minutes_per_unit = op.time_cycle / efficiency / capacity
+                setup = wc._get_expected_duration(self.product_id)
+                task_candidates.append((wc.id, minutes_per_unit, setup))
+            return Task(key, qty, task_candidates)
+        wo = group[:1]
+        qty = wo.planned_qty or self.product_qty
+        if not qty:
+            return None
+        minutes_per_unit = (wo.duration_expected or 0.0) / qty
+        return Task(key, qty, [(wo.workcenter_id.id, minutes_per_unit, 0.0)], False)
+
+    @api.model
+    def _mpc_apply_planner_allocations(self, group, allocations):
+        """Write the planned quantities and dates on the workorders.
+
+        The workorders without a positive allocation are left as they are.
+        """
+        by_wc = {
+            wc_id: (qty, start, end)
+            for wc_id, qty, start, end in allocations
+            if qty > 0
+        }
+        if not by_wc:
+            return self.env["mrp.workorder"]
+        is_parallel = group[:1].operation_id.parallel_mode == "parallel"
+        touched = self.env["mrp.workorder"]
+        for wo in group:
+            planned = by_wc.get(wo.workcenter_id.id)
+            if not planned:
+                continue
+            qty, start, end = planned
+            vals = {
+                "date_start": _from_timestamp(start),
+                "date_finished": _from_timestamp(end),
+            }
+            if is_parallel:
+                vals.update({"planned_qty": qty, "console_qty": qty})
+            wo.write(vals)
+            touched |= wo
+        return touched
+
+
+def _from_timestamp(ts):
+    """Naive UTC datetime of a timestamp, rounded to the second."""
+    return datetime.fromtimestamp(round(ts), tz=pytz.utc).replace(tzinfo=None)
@@ -210,14 +210,20 @@ class MrpProduction(models.Model):
     # Maintenance / blocked workcenter helpers
     # ------------------------------------------------------------------
     def _mpc_is_wc_blocked(self, wc_id):
-        wc = self.env["mrp.workcenter"].browse(wc_id)
-        m_state = getattr(wc, "maintenance_state", False)
-        if m_state and m_state not in ("normal", "available"):
-            return True
-
-        if "maintenance.request" in self.env.registry:
+        return wc_id in self._mpc_get_blocked_wc_ids([wc_id])
+
+    def _mpc_get_blocked_wc_ids(self, wc_ids):
+        """Return the ids of the given workcenters under maintenance."""
+        workcenters = self.env["mrp.workcenter"].browse(wc_ids)
+        blocked = set()
+        for wc in workcenters:
+            m_state = getattr(wc, "maintenance_state", False)
+            if m_state and m_state not in ("normal", "available"):
+                blocked.add(wc.id)
+
+        if "maintenance.request" in self.env.registry and wc_ids:
             maintenance_model = self.env["maintenance.request"].sudo()
-            domain = [("workcenter_id", "=", wc_id)]
+            domain = [("workcenter_id", "in", list(wc_ids))]
             if "state" in maintenance_model._fields:
                 domain.append(("state", "not in", ["done", "cancel"]))
             elif "stage_id" in maintenance_model._fields:
@@ -225,9 +231,9 @@ class MrpProduction(models.Model):
                 stage_model = getattr(stage_field, "comodel_name", False)
                 if stage_model and "done" in self.env[stage_model]._fields:
                     domain.append(("stage_id.done", "=", False))
-            if maintenance_model.search_count(domain):
-                return True
-        return False
+            groups = maintenance_model._read_group(domain, ["workcenter_id"])
+            blocked.update(wc.id for [wc] in groups)
+        return blocked
 
     def _mpc_remove_blocked_workorders(self):
         """Cancel workorders assigned to blocked workcenters (maintenance)."""
@@ -240,8 +246,11 @@ class MrpProduction(models.Model):
                 ops.setdefault(wo.operation_id, self.env["mrp.workorder"])
                 ops[wo.operation_id] |= wo
 
+            blocked_wc_ids = self._mpc_get_blocked_wc_ids(
+                mo.workorder_ids.workcenter_id.ids
+            )
             for op, op_wos in ops.items():
-                blocked = op_wos.filtered(lambda wo: self._mpc_is_wc_blocked(wo.workcenter_id.id))
+                blocked = op_wos.filtered(lambda wo: wo.workcenter_id.id in blocked_wc_ids)
                 unblocked = op_wos - blocked
                 # If everything is blocked, keep them (user will start after maintenance).
                 if blocked and unblocked:
@@ -11,14 +11,26 @@ Phase 3 enhancements:
 - Batch notifications to reduce network traffic
 - Delta updates (only send changed fields)
 - Debouncing to prevent notification spam
+
+Notifications are buffered per transaction and merged per work order; each
+production channel receives a single ``workorder_batch`` message when the
+transaction commits, and nothing when it is rolled back.
 """
 
 import logging
+import threading
+from collections import defaultdict
 
 from odoo import api, fields, models
 
 _logger = logging.getLogger(__name__)
 
+BUS_BUFFER_KEY = "mrp_parallel_console.bus_buffer"
+
+# Notifications queued and bus messages sent by this process
+_bus_stats = {"queued": 0, "sent": 0}
+_bus_stats_lock = threading.Lock()
+
 
 class MrpWorkorderRealtime(models.Model):
     _inherit = "mrp.workorder"
@@ -38,20 +50,21 @@ class MrpWorkorderRealtime(models.Model):
         When critical fields are modified, this sends real-time notifications
         to all clients viewing the related manufacturing order's console.
         """
-        # Store original values for delta updates (only send what changed)
+        changed_fields = [f for f in self._REALTIME_TRACKED_FIELDS if f in vals]
+        # Store original values for delta updates (only send what changed),
+        # only the old state and quantity are part of the messages
         original_values = {}
-        for record in self:
-            original_values[record.id] = {
-                field: getattr(record, field)
-                for field in self._REALTIME_TRACKED_FIELDS
-                if field in vals
-            }
+        old_fields = [f for f in ("state", "console_qty") if f in vals]
+        if old_fields:
+            for record in self:
+                original_values[record.id] = {
+                    field: record[field] for field in old_fields
+                }
 
         # Perform the write operation
         res = super(MrpWorkorderRealtime, self).write(vals)
 
         # Broadcast changes if any tracked fields were modified
-        changed_fields = [f for f in self._REALTIME_TRACKED_FIELDS if f in vals]
         if changed_fields:
             self._broadcast_workorder_changes(vals, original_values)
 
@@ -73,26 +86,20 @@ class MrpWorkorderRealtime(models.Model):
 
             # Build delta change payload (only what changed)
             changes = {}
-            event_type = 'workorder_update'
 
             # Track what changed
             if 'state' in new_vals:
                 old_state = original_vals.get(record.id, {}).get('state')
                 changes['state'] = new_vals['state']
                 changes['old_state'] = old_state
-                event_type = f'workorder_{new_vals["state"]}'
 
             if 'console_qty' in new_vals:
                 old_qty = original_vals.get(record.id, {}).get('console_qty', 0.0)
                 changes['console_qty'] = new_vals['console_qty']
                 changes['old_qty'] = old_qty
-                if event_type == 'workorder_update':
-                    event_type = 'quantity_changed'
 
             if 'console_timer_running' in new_vals:
                 changes['timer_running'] = new_vals['console_timer_running']
-                if event_type == 'workorder_update':
-                    event_type = 'timer_toggled'
 
             if 'console_employee_ids' in new_vals:
                 # Get employee names for display
@@ -108,9 +115,6 @@ class MrpWorkorderRealtime(models.Model):
                     changes['employee_ids'] = []
                     changes['employee_names'] = []
 
-                if event_type == 'workorder_update':
-                    event_type = 'employees_assigned'
-
             # Build minimal notification message (delta update - only essential fields)
             message = {
                 'workorder_id': record.id,
@@ -120,11 +124,28 @@ class MrpWorkorderRealtime(models.Model):
                 'user_name': self.env.user.name,
             }
 
-            # Send notification
+            # Queue notification, merged with the previous changes of the
+            # work order in this transaction
             channel = self._get_notification_channel(record.production_id)
-            self._send_bus_notification(channel, event_type, message)
-
+            self._mpc_queue_notification(
+                channel,
+                self._get_change_event_type(changes),
+                message,
+                key=('changes', record.id),
+            )
 
+    @staticmethod
+    def _get_change_event_type(changes):
+        """Return the event type of a delta update, the state first."""
+        if 'state' in changes:
+            return f'workorder_{changes["state"]}'
+        if 'old_qty' in changes:
+            return 'quantity_changed'
+        if 'timer_running' in changes:
+            return 'timer_toggled'
+        if 'employee_ids' in changes:
+            return 'employees_assigned'
+        return 'workorder_update'
 
     def _resolve_m2m_ids(self, m2m_value):
         """
@@ -229,20 +250,91 @@ class MrpWorkorderRealtime(models.Model):
 
     def _send_bus_notification(self, channel, event_type, message):
         """
-        Send a notification on the bus.
+        Queue a notification for the bus, sent when the transaction commits.
 
         Args:
             channel: Bus channel name
             event_type: Event type identifier
             message: Message payload (dict)
         """
-        try:
-            self.env['bus.bus']._sendone(channel, event_type, message)
-        except Exception as e:
-            _logger.error(
-                "Failed to send bus notification: channel=%s, error=%s",
-                channel, str(e)
-            )
+        self._mpc_queue_notification(
+            channel,
+            event_type,
+            message,
+            key=(event_type, message.get('workorder_id')),
+        )
+
+    @api.model
+    def _mpc_queue_notification(self, channel, event_type, message, key=None):
+        """
+        Buffer a notification until the end of the transaction.
+
+        Notifications of the same channel and key are merged: the latest
+        values win, except the ``old_*`` values of delta updates which keep
+        the value from before the first change.
+        """
+        precommit = self.env.cr.precommit
+        buffer = precommit.data.get(BUS_BUFFER_KEY)
+        if buffer is None:
+            buffer = precommit.data[BUS_BUFFER_KEY] = {
+                'queued': 0,
+                'channels': defaultdict(dict),
+            }
+            precommit.add(self._mpc_flush_notifications)
+        buffer['queued'] += 1
+        updates = buffer['channels'][channel]
+        if key is None:
+            key = ('message', buffer['queued'])
+        if key in updates:
+            previous_type, previous = updates[key]
+            merged = {**previous, **message}
+            if 'changes' in previous and 'changes' in message:
+                changes = {**previous['changes'], **message['changes']}
+                for field in ('old_state', 'old_qty'):
+                    if field in previous['changes']:
+                        changes[field] = previous['changes'][field]
+                merged['changes'] = changes
+                event_type = self._get_change_event_type(changes)
+            updates[key] = (event_type, merged)
+        else:
+            updates[key] = (event_type, message)
+
+    def _mpc_flush_notifications(self):
+        """Send one batched bus message per channel (precommit hook)."""
+        buffer = self.env.cr.precommit.data.pop(BUS_BUFFER_KEY, None)
+        if not buffer:
+            return
+        sent = 0
+        for channel, updates in buffer['channels'].items():
+            payload = {
+                'updates': [
+                    {'type': event_type, 'payload': message}
+                    for event_type, message in updates.values()
+                ],
+            }
+            try:
+                self.env['bus.bus']._sendone(channel, 'workorder_batch', payload)
+                sent += 1
+            except Exception as e:
+                _logger.error(
+                    "Failed to send bus notification: channel=%s, error=%s",
+                    channel, str(e)
+                )
+        with _bus_stats_lock:
+            _bus_stats['queued'] += buffer['queued']
+            _bus_stats['sent'] += sent
+        _logger.debug(
+            "Sent %s bus messages for %s notifications", sent, buffer['queued']
+        )
+
+    @api.model
+    def _mpc_get_bus_stats(self):
+        """Return the notifications queued, sent and coalesced by this
+        process since it started."""
+        with _bus_stats_lock:
+            stats = dict(_bus_stats)
+        stats['coalesced'] = stats['queued'] - stats['sent']
+        return stats
 
     def _broadcast_event(self, event_type, extra_data=None):
         """
@@ -254,6 +254,7 @@ export class ParallelWorkorderConsole extends Component {
         this.dialogService = useService("dialog");
         this.busService = useService("bus_service");
         this._productionId = null;
+        this._serverTime = null;
         this._lineUid = 0;
         this.scrapQtyRef = useRef("scrapQtyInput");
 
@@ -303,19 +304,29 @@ export class ParallelWorkorderConsole extends Component {
             },
         });
 
+        const handleNotification = (type, payload) => {
+            // Handle all workorder event types
+            if (type === "workorder_update" ||
+                type === "workorder_started" ||
+                type === "workorder_progress" ||
+                type === "workorder_ready" ||
+                type === "workorder_done" ||
+                type === "workorder_cancel" ||
+                type === "employees_assigned" ||
+                type === "quantity_changed" ||
+                type === "timer_toggled") {
+                this._handleWorkorderUpdate(payload);
+            }
+        };
         useBus(this.busService, "notification", (notifications) => {
             notifications.forEach((notif) => {
-                // Handle all workorder event types
-                if (notif.type === "workorder_update" ||
-                    notif.type === "workorder_started" ||
-                    notif.type === "workorder_progress" ||
-                    notif.type === "workorder_ready" ||
-                    notif.type === "workorder_done" ||
-                    notif.type === "workorder_cancel" ||
-                    notif.type === "employees_assigned" ||
-                    notif.type === "quantity_changed" ||
-                    notif.type === "timer_toggled") {
-                    this._handleWorkorderUpdate(notif.payload);
+                if (notif.type === "workorder_batch") {
+                    // The updates of a transaction are sent in one message
+                    for (const update of notif.payload.updates || []) {
+                        handleNotification(update.type, update.payload);
+                    }
+                } else {
+                    handleNotification(notif.type, notif.payload);
                 }
             });
         });
@@ -466,20 +477,34 @@ export class ParallelWorkorderConsole extends Component {
     }
 
     async loadData(productionId = null, options = {}) {
-        const { preserveSelection = false } = options || {};
+        const { preserveSelection = false, incremental = false } = options || {};
         const previousSelection = preserveSelection
             ? new Set(this.state.selectedIds)
             : null;
-        if (productionId) {
+        if (productionId && productionId !== this._productionId) {
             this._productionId = productionId;
+            this._serverTime = null;
         } else if (!this._productionId) {
             this._productionId = this._computeProductionId();
         }
         this.state.loading = true;
-        const res = await rpc("/mrp_parallel_console/get_data", {
-            production_id: this._productionId,
-        });
-        const workorders = res.workorders || [];
+        const params = { production_id: this._productionId };
+        if (incremental && this._serverTime) {
+            // Only fetch the work orders changed since the previous load
+            params.since = this._serverTime;
+        }
+        const res = await rpc("/mrp_parallel_console/get_data", params);
+        this._serverTime = res.server_time || null;
+        let workorders = res.workorders || [];
+        if (res.partial) {
+            const byId = new Map(this.state.workorders.map((wo) => [wo.id, wo]));
+            for (const wo of workorders) {
+                byId.set(wo.id, wo);
+            }
+            workorders = (res.workorder_ids || [])
+                .map((id) => byId.get(id))
+                .filter(Boolean);
+        }
         const firstWo = workorders.length ? workorders[0] : null;
         this.state.workorders = workorders;
         this.state.productionDisplay =
@@ -504,7 +529,10 @@ export class ParallelWorkorderConsole extends Component {
     }
 
     async reloadWorkorders() {
-        await this.loadData(this._productionId, { preserveSelection: true });
+        await this.loadData(this._productionId, {
+            preserveSelection: true,
+            incremental: true,
+        });
     }
 
     async loadEmployees() {
@@ -0,0 +1 @@
+from . import test_finite_planner
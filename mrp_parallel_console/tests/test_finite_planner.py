@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import random
+import time
+
+from odoo.tests import BaseCase, tagged
+
+from ..utils.finite_planner import (
+    FINISH_PRECISION,
+    FiniteCapacityPlanner,
+    Machine,
+    Task,
+    WorkingTime,
+)
+
+DAY = 86400.0
+
+
+@tagged("post_install", "-at_install")
+class TestFiniteCapacityPlanner(BaseCase):
+    def _make_machines(self, rnd, origin, machine_count):
+        # odd machines work on office hours, the others around the clock
+        office_hours = [
+            (origin + d * DAY + 8 * 3600, origin + d * DAY + 17 * 3600)
+            for d in range(120)
+        ]
+        machines = []
+        for machine_id in range(machine_count):
+            intervals = office_hours if machine_id % 2 else None
+            busy_until = origin + rnd.uniform(0, 2 * DAY)
+            machines.append(
+                Machine(machine_id, WorkingTime(origin, intervals), busy_until)
+            )
+        return machines
+
+    def _assert_not_overbooked(self, result):
+        booked = {}
+        for allocations in result.values():
+            for machine_id, __, start, end in allocations:
+                booked.setdefault(machine_id, []).append((start, end))
+        for intervals in booked.values():
+            intervals.sort()
+            for (__, end), (start, __) in zip(intervals, intervals[1:]):
+                self.assertGreaterEqual(start, end - FINISH_PRECISION)
+
+    def test_plan_skips_tasks_without_duration(self):
+        origin = time.time()
+        machines = [Machine(m, WorkingTime(origin, None), origin) for m in range(2)]
+        jobs = [
+            [
+                Task("no_time", 10, [(0, 0.0, 0.0), (1, 0.0, 0.0)]),
+                Task("no_qty", 0.4, [(0, 1.0, 0.0), (1, 1.0, 0.0)]),
+                Task("planned", 10, [(0, 1.0, 0.0), (1, 0.0, 0.0)]),
+            ]
+        ]
+
+        result = FiniteCapacityPlanner(machines).plan(jobs, ready=origin)
+
+        self.assertFalse(result.get("no_time"))
+        self.assertFalse(result.get("no_qty"))
+        self.assertEqual([a[:2] for a in result["planned"]], [(0, 10)])
+
+    def test_plan_benchmark(self):
+        """Plan 500 MOs of two operations on 40 machines."""
+        rnd = random.Random(42)
+        origin = time.time()
+        machine_count = 40
+        machines = self._make_machines(rnd, origin, machine_count)
+        jobs = []
+        for mo in range(500):
+            parallel = rnd.sample(range(machine_count), rnd.randint(2, 8))
+            jobs.append(
+                [
+                    Task(
+                        (mo, "parallel"),
+                        rnd.randint(10, 500),
+                        [
+                            (m, rnd.uniform(0.2, 2.0), rnd.uniform(0, 30))
+                            for m in parallel
+                        ],
+                    ),
+                    Task(
+                        (mo, "single"),
+                        rnd.randint(10, 500),
+                        [(rnd.randrange(machine_count), rnd.uniform(0.1, 0.5), 10.0)],
+                    ),
+                ]
+            )
+
+        started = time.perf_counter()
+        result = FiniteCapacityPlanner(machines).plan(jobs, ready=origin)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(result), 1000)
+        self._assert_not_overbooked(result)
+        for mo, tasks in enumerate(jobs):
+            self.assertEqual(
+                sum(qty for __, qty, __, __ in result[(mo, "parallel")]),
+                tasks[0].qty,
+            )
+        # about 40 ms on a laptop, the bound leaves room for slow runners
+        self.assertLess(elapsed, 5.0)
@@ -0,0 +1 @@
+from . import finite_planner
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Finite capacity planning of parallel work orders.
+
+The planner keeps, per workcenter, the working intervals of its calendar and
+the time until which it is already loaded. Manufacturing orders are planned
+one after the other in priority order, each operation being spread over its
+candidate workcenters so that they all finish at the same time, given the
+moment each of them becomes free.
+
+It has no Odoo dependency, its benchmark is in tests/test_finite_planner.py.
+"""
+
+import bisect
+import heapq
+import math
+
+# Precision of the common finish time of an operation, in seconds
+FINISH_PRECISION = 1.0
+
+
+class WorkingTime:
+    """Conversion between timestamps and working minutes of a calendar.
+
+    ``intervals`` are the sorted and disjoint (start, end) working intervals
+    (POSIX timestamps) after ``origin``; ``None`` means always working.
+    Beyond the last interval, the average working rate of the known
+    intervals is extrapolated.
+    """
+
+    def __init__(self, origin, intervals=None):
+        self.origin = origin
+        self._starts = []
+        self._ends = []
+        self._cumul = []
+        total = 0.0
+        for start, end in intervals or []:
+            start = max(start, origin)
+            if end <= start:
+                continue
+            self._starts.append(start)
+            self._ends.append(end)
+            self._cumul.append(total)
+            total += (end - start) / 60.0
+        self._total = total
+        self.always = intervals is None
+        if self._ends and self._ends[-1] > origin:
+            self._rate = total * 60.0 / (self._ends[-1] - origin)
+        else:
+            self._rate = 1.0
+
+    def to_minutes(self, ts):
+        """Working minutes between the origin and ``ts``."""
+        if ts <= self.origin:
+            return 0.0
+        if self.always:
+            return (ts - self.origin) / 60.0
+        if not self._ends or ts >= self._ends[-1]:
+            last_end = self._ends[-1] if self._ends else self.origin
+            return self._total + (ts - last_end) * self._rate / 60.0
+        i = bisect.bisect_right(self._starts, ts) - 1
+        if i < 0:
+            return 0.0
+        return self._cumul[i] + (min(ts, self._ends[i]) - self._starts[i]) / 60.0
+
+    def to_timestamp(self, minutes, start=False):
+        """Timestamp at which ``minutes`` working minutes have elapsed.
+
+        At the boundary of two intervals, the beginning of the next one is
+        returned for a ``start``, the end of the previous one otherwise.
+        """
+        if self.always:
+            return self.origin + minutes * 60.0
+        if not self._ends or minutes > self._total or (
+            start and minutes >= self._total
+        ):
+            last_end = self._ends[-1] if self._ends else self.origin
+            return last_end + (minutes - self._total) * 60.0 / self._rate
+        if start:
+            i = bisect.bisect_right(self._cumul, minutes) - 1
+        else:
+            i = max(bisect.bisect_left(self._cumul, minutes) - 1, 0)
+        return self._starts[i] + (minutes - self._cumul[i]) * 60.0
+
+
+class Machine:
+    """A workcenter: its working time and the working minute until which
+    it is loaded."""
+
+    __slots__ = ("id", "working_time", "clock")
+
+    def __init__(self, machine_id, working_time, available_from=None):
+        self.id = machine_id
+        self.working_time = working_time
+        self.clock = working_time.to_minutes(available_from or working_time.origin)
+
+
+class Task:
+    """An operation of a manufacturing order.
+
+    ``candidates`` are (machine_id, minutes_per_unit, setup_minutes) tuples,
+    the quantity is spread over them. Tasks of the same job are planned in
+    sequence.
+    """
+
+    __slots__ = ("key", "qty", "candidates", "integer")
+
+    def __init__(self, key, qty, candidates, integer=True):
+        self.key = key
+        self.qty = qty
+        self.candidates = candidates
+        self.integer = integer
+
+
+class FiniteCapacityPlanner:
+    def __init__(self, machines):
+        self.machines = {machine.id: machine for machine in machines}
+
+    def plan(self, jobs, ready=None):
+        """Plan the jobs, lists of tasks, in the given order.
+
+        Returns {task key: [(machine_id, qty, start, end)]}, timestamps
+        included; a job starts at ``ready`` at the earliest.
+        """
+        result = {}
+        for tasks in jobs:
+            task_ready = ready
+            for task in tasks:
+                allocations = self._plan_task(task, task_ready)
+                result[task.key] = allocations
+                if allocations:
+                    task_ready = max(end for __, __, __, end in allocations)
+        return result
+
+    def _get_slots(self, candidates, ready):
+        """Return the (start minute, machine, minutes per unit, setup) of
+        the candidates of a task, by machine start time."""
+        slots = []
+        for machine_id, minutes_per_unit, setup in candidates:
+            machine = self.machines[machine_id]
+            start = machine.clock
+            if ready is not None:
+                start = max(start, machine.working_time.to_minutes(ready))
+            # heap on the timestamp at which the machine can start producing
+            first_unit = machine.working_time.to_timestamp(start + setup, start=True)
+            slots.append((first_unit, machine_id, start, minutes_per_unit, setup))
+        heapq.heapify(slots)
+        return slots
+
+    def _capacity(self, active, finish):
+        """Quantity the active machines produce until ``finish``."""
+        qty = 0.0
+        for __, machine_id, start, minutes_per_unit, setup in active:
+            machine = self.machines[machine_id]
+            minutes = machine.working_time.to_minutes(finish) - start - setup
+            if minutes > 0:
+                qty += minutes / minutes_per_unit if minutes_per_unit else math.inf
+        return qty
+
+    def _plan_task(self, task, ready):
+        if task.qty <= 0 or (task.integer and int(round(task.qty)) <= 0):
+            return []
+        # a machine without time per unit gives no duration to plan on
+        candidates = [candidate for candidate in task.candidates if candidate[1] > 0]
+        if not candidates:
+            return []
+        slots = self._get_slots(candidates, ready)
+        # Activate the machines by start time until those active can produce
+        # the quantity before the next one starts, then search the common
+        # finish time between both.
+        active = []
+        lo = None
+        while slots:
+            slot = heapq.heappop(slots)
+            active.append(slot)
+            lo = slot[0]
+            if not slots:
+                break
+            if self._capacity(active, slots[0][0]) >= task.qty:
+                break
+        hi = slots[0][0] if slots else None
+        if hi is None:
+            # all machines active: grow the window until it is large enough
+            span = 3600.0
+            hi = lo + span
+            while self._capacity(active, hi) < task.qty:
+                span *= 2
+                hi = lo + span
+        while hi - lo > FINISH_PRECISION:
+            mid = (lo + hi) / 2
+            if self._capacity(active, mid) >= task.qty:
+                hi = mid
+            else:
+                lo = mid
+        quantities = []
+        for __, machine_id, start, minutes_per_unit, setup in active:
+            machine = self.machines[machine_id]
+            minutes = machine.working_time.to_minutes(hi) - start - setup
+            quantities.append(
+                max(minutes / minutes_per_unit if minutes_per_unit else 0.0, 0.0)
+            )
+        if task.integer:
+            quantities = _round_quantities(quantities, task.qty)
+        else:
+            total = sum(quantities) or 1.0
+            quantities = [q * task.qty / total for q in quantities]
+        allocations = []
+        for slot, qty in zip(active, quantities):
+            if qty <= 0:
+                continue
+            __, machine_id, start, minutes_per_unit, setup = slot
+            machine = self.machines[machine_id]
+            end = start + setup + qty * minutes_per_unit
+            machine.clock = end
+            allocations.append(
+                (
+                    machine_id,
+                    qty,
+                    machine.working_time.to_timestamp(start, start=True),
+                    machine.working_time.to_timestamp(end),
+                )
+            )
+        return allocations
+
+
+def _round_quantities(quantities, total_qty):
+    """Round to integers summing to the total, largest remainders first."""
+    total_qty = int(round(total_qty))
+    scale = sum(quantities)
+    if scale <= 0:
+        return [0] * len(quantities)
+    ideal = [q * total_qty / scale for q in quantities]
+    base = [int(math.floor(q)) for q in ideal]
+    remainder = total_qty - sum(base)
+    order = sorted(range(len(ideal)), key=lambda i: ideal[i] - base[i], reverse=True)
+    for i in order[:remainder]:
+        base[i] += 1
+    return base
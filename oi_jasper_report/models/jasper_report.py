@@ -61,11 +61,23 @@ class JasperReport(models.Model):
                 'context' : context
                 }    
         
-        wizard = self.env['jasper.report.run'].create({
+        wizard = self.env['jasper.report.run'].create(self._prepare_report_run_vals())
+        return wizard.with_context(context).run_report()
+    
+    def _prepare_report_run_vals(self):
+        return {
             'report_id' : self.id,
             'format' : self.format,
             'ignore_pagination' : self.ignore_pagination,
             'one_page_per_sheet' : self.one_page_per_sheet,
             'preview' : self.preview
-            })
-        return wizard.with_context(context).run_report()
\ No newline at end of file
+            }
+    
+    def _render_documents(self, docids, data=None):
+        """ run the report for each document, in parallel, return {docid: (filename, base64 content)} """
+        # the report params are read from the context, as in run_report
+        context = dict(self._context)
+        if data:
+            context.update(data)
+        wizard = self.env['jasper.report.run'].create(self._prepare_report_run_vals())
+        return wizard.with_context(context)._render_documents(docids)
\ No newline at end of file
@@ -13,6 +13,8 @@ class ResConfigSettings(models.TransientModel):
     jasper_report_url = fields.Char("Jasper Report Server URL", config_parameter='jasper_report.url')
     jasper_report_user = fields.Char("Jasper Report Server User", config_parameter='jasper_report.user')
     jasper_report_password = fields.Char("Jasper Report Server Passowrd", config_parameter='jasper_report.password')
+    jasper_report_max_workers = fields.Integer("Jasper Report Parallel Requests", config_parameter='jasper_report.max_workers', default=4, help="Maximum number of reports fetched at the same time when printing several records")
+    jasper_report_cache_ttl = fields.Integer("Jasper Report Cache (Seconds)", config_parameter='jasper_report.cache_ttl', help="Reuse the result of identical report requests for this number of seconds, 0 to disable the cache")
     jasper_post_chatter = fields.Boolean(string="Post to Chatter on Print", config_parameter='jasper_report.post_chatter', help="โพสต์ข้อความลง Chatter เมื่อมีการพิมพ์/พรีวิวรายงาน Jasper")
     
     def jasper_test(self):
@@ -0,0 +1 @@
+from . import test_jasper_fetch
@@ -0,0 +1,152 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
+
+from ..wizard.jasper_report_run import fetch_reports, merge_pdf_files, remove_results
+
+
+def make_pdf(pages):
+    writer = PdfFileWriter()
+    add_blank_page = getattr(writer, 'add_blank_page', None) or writer.addBlankPage
+    for __ in range(pages):
+        add_blank_page(100, 100)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def count_pages(data):
+    return PdfFileReader(io.BytesIO(data), strict=False).getNumPages()
+
+
+class JasperStubHandler(BaseHTTPRequestHandler):
+    """ reports of ``docid`` pages, docid 0 fails """
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        with self.server.lock:
+            self.server.requests.append((url.path, params))
+        pages = int(params.get('docid', 1))
+        if not pages:
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b'report failed')
+            return
+        data = make_pdf(pages)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@tagged('post_install', '-at_install')
+class TestJasperFetch(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), JasperStubHandler)
+        cls.server.lock = threading.Lock()
+        cls.server.requests = []
+        thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        thread.start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+        cls.server_url = 'http://127.0.0.1:%s' % cls.server.server_address[1]
+        cls.url = cls.server_url + '/rest_v2/reports/test.pdf'
+        cls.auth = ('jasper', 'jasper')
+
+    def setUp(self):
+        super().setUp()
+        self.server.requests.clear()
+
+    def _fetch(self, params_list, **kwargs):
+        results = fetch_reports(self.url, params_list, self.auth, **kwargs)
+        self.addCleanup(remove_results, results)
+        return results
+
+    def _read(self, result):
+        with open(result.path, 'rb') as f:
+            return f.read()
+
+    def test_fetch_reports_parallel(self):
+        results = self._fetch([{'docid': docid} for docid in range(1, 6)], max_workers=3)
+
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual([result.status_code for result in results], [200] * 5)
+        self.assertEqual({result.mimetype for result in results}, {'application/pdf'})
+        self.assertTrue(all(result.temporary for result in results))
+        # the results are in the order of the params
+        self.assertEqual([count_pages(self._read(result)) for result in results], [1, 2, 3, 4, 5])
+
+    def test_fetch_reports_error(self):
+        results = self._fetch([{'docid': 1}, {'docid': 0}, {'docid': 2}])
+
+        self.assertEqual([result.status_code for result in results], [200, 500, 200])
+        self.assertEqual(results[1].content, b'report failed')
+        self.assertIsNone(results[1].path)
+        paths = [results[0].path, results[2].path]
+        remove_results(results)
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+
+    def test_fetch_reports_cache(self):
+        cache_dir = tempfile.mkdtemp(prefix='jasper-test-')
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        params_list = [{'docid': 1}, {'docid': 2}]
+
+        first = self._fetch(params_list, cache_dir=cache_dir, cache_ttl=60)
+        second = self._fetch(params_list, cache_dir=cache_dir, cache_ttl=60)
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertFalse(any(result.temporary for result in first + second))
+        self.assertEqual([result.path for result in second], [result.path for result in first])
+        self.assertEqual([result.mimetype for result in second], ['application/pdf'] * 2)
+        self.assertEqual([count_pages(self._read(result)) for result in second], [1, 2])
+
+    def test_merge_pdf_files(self):
+        paths = []
+        for pages in (1, 2, 3):
+            fd, path = tempfile.mkstemp(prefix='jasper-test-', suffix='.pdf')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(make_pdf(pages))
+            self.addCleanup(os.unlink, path)
+            paths.append(path)
+        output = io.BytesIO()
+
+        merge_pdf_files(paths, output)
+
+        self.assertEqual(count_pages(output.getvalue()), 6)
+
+    def test_render_documents_context(self):
+        set_param = self.env['ir.config_parameter'].sudo().set_param
+        set_param('jasper_report.url', self.server_url)
+        set_param('jasper_report.user', 'jasper')
+        set_param('jasper_report.password', 'jasper')
+        set_param('jasper_report.cache_ttl', '0')
+        report = self.env['jasper.report'].create({
+            'name': 'Test Report',
+            'report_path': '/test',
+        })
+
+        documents = report.with_context(tz='Europe/Brussels')._render_documents([1, 2], data={'title': 'Test'})
+
+        self.assertEqual(list(documents), [1, 2])
+        self.assertEqual(documents[2][0], 'Test Report.pdf')
+        requests = sorted(self.server.requests, key=lambda request: request[1]['docid'])
+        self.assertEqual([params['docid'] for __, params in requests], ['1', '2'])
+        for path, params in requests:
+            self.assertEqual(path, '/rest_v2/reports/test.pdf')
+            self.assertEqual(params['tz'], 'Europe/Brussels')
+            self.assertEqual(params['title'], 'Test')
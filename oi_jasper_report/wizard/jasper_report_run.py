@@ -3,13 +3,22 @@ Created on Jun 8, 2020
 
 @author: Zuhair Hammadi
 '''
-from odoo import models, fields
+from odoo import models, fields, api
 from odoo.exceptions import UserError
+from odoo.tools import config
 import requests
+from requests.adapters import HTTPAdapter
 import base64
-from odoo.tools.pdf import merge_pdf
+from odoo.tools.pdf import merge_pdf, PdfFileReader, PdfFileWriter
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from contextlib import ExitStack
 import zipfile
+import hashlib
+import json
+import tempfile
+import time
 from .. import EXPORT_FORMAT
 
 import logging
@@ -17,6 +26,94 @@ import io
 import os
 _logger = logging.getLogger(__name__)
 
+JASPER_MAX_WORKERS = 4
+JASPER_POOL_SIZE = 16
+JASPER_TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+
+# connections to the jasper server are kept alive and shared by the requests of the worker
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_maxsize=JASPER_POOL_SIZE))
+_session.mount('https://', HTTPAdapter(pool_maxsize=JASPER_POOL_SIZE))
+
+JasperResult = namedtuple('JasperResult', ['status_code', 'mimetype', 'path', 'temporary', 'content'])
+
+
+def fetch_report(url, params, auth, timeout=JASPER_TIMEOUT, cache_dir=None, cache_ttl=0):
+    """
+    GET a report from the jasper server and stream it to a file, does not use the ORM so it can run in a thread.
+    With a cache_dir, the result of identical (url, params) requests is reused for cache_ttl seconds.
+
+    Returns:
+        JasperResult: path is the file of the report, to be removed by the caller when temporary,
+            content is the response body of a failed request
+    """
+    cache_path = None
+    if cache_dir and cache_ttl:
+        key = hashlib.sha256(json.dumps([url, params], sort_keys=True, default=str).encode()).hexdigest()
+        cache_path = os.path.join(cache_dir, key)
+        try:
+            if os.path.getmtime(cache_path) > time.time() - cache_ttl:
+                with open(cache_path + '.mimetype') as f:
+                    return JasperResult(200, f.read(), cache_path, False, None)
+        except OSError:
+            pass
+
+    with _session.get(url, params=params, auth=auth, timeout=timeout, stream=True) as res:
+        if res.status_code != 200:
+            return JasperResult(res.status_code, None, None, False, res.content)
+        mimetype = res.headers['content-type']
+        fd, path = tempfile.mkstemp(prefix='jasper-', dir=cache_path and cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in res.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+
+    if not cache_path:
+        return JasperResult(200, mimetype, path, True, None)
+    with open(cache_path + '.mimetype', 'w') as f:
+        f.write(mimetype)
+    os.replace(path, cache_path)
+    return JasperResult(200, mimetype, cache_path, False, None)
+
+
+def fetch_reports(url, params_list, auth, max_workers=JASPER_MAX_WORKERS, **kwargs):
+    """ fetch_report for each params, at most max_workers at a time, the results are in the order of params_list """
+    if len(params_list) == 1:
+        return [fetch_report(url, params_list[0], auth, **kwargs)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(params_list), JASPER_POOL_SIZE))) as executor:
+        futures = [executor.submit(fetch_report, url, params, auth, **kwargs) for params in params_list]
+    results = []
+    error = None
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error:
+        remove_results(results)
+        raise error
+    return results
+
+
+def remove_results(results):
+    for result in results:
+        if result.temporary:
+            try:
+                os.unlink(result.path)
+            except OSError:
+                pass
+
+
+def merge_pdf_files(paths, output):
+    """ merge the pdf files into the output stream, the pages are read from the files """
+    writer = PdfFileWriter()
+    with ExitStack() as stack:
+        for path in paths:
+            reader = PdfFileReader(stack.enter_context(open(path, 'rb')), strict=False)
+            for page in range(0, reader.getNumPages()):
+                writer.addPage(reader.getPage(page))
+        writer.write(output)
+
 
 class JasperReportRun(models.TransientModel):
     _name = 'jasper.report.run'
@@ -129,25 +226,71 @@ class JasperReportRun(models.TransientModel):
         datas = base64.encodebytes(zip_buffer.getvalue())
         return self[0].copy({'datas': datas, 'filename': self[0].filename + ".zip", 'mimetype': 'application/zip'}).action_download()
 
+    def _download_merged_pdf(self, paths):
+        with tempfile.TemporaryFile(prefix='jasper-') as output:
+            merge_pdf_files(paths, output)
+            output.seek(0)
+            datas = base64.encodebytes(output.read())
+        return self.copy({'datas': datas}).action_download()
+
+    def _download_zip(self, filename, paths):
+        name, extension = os.path.splitext(filename)
+        with tempfile.TemporaryFile(prefix='jasper-') as output:
+            with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, False) as zip_file:
+                for no, path in enumerate(paths, 1):
+                    zip_file.write(path, "%s%s%s" % (name, no, extension))
+            output.seek(0)
+            datas = base64.encodebytes(output.read())
+        return self.copy({'datas': datas, 'filename': filename + ".zip", 'mimetype': 'application/zip'}).action_download()
+
     def run_report(self, values=None):
         if self.report_id.multi:
-            records = self.browse()
-            for docid in self._context.get('docids'):
-                record = self.copy()
-                record.with_context(docid=docid)._run_report(
-                    values=values, return_action=False)
-                records += record
-            return records.action_download()
+            params_list = [self.with_context(docid=docid)._prepare_report_params(values) for docid in self._context.get('docids')]
+            results = self._fetch_reports(params_list)
+            try:
+                # the per record copies are not stored, the results are combined from the files
+                filename = self._get_report_filename(params_list[0])
+                self.write({'filename': filename, 'mimetype': results[0].mimetype})
+                paths = [result.path for result in results]
+                if len(paths) == 1:
+                    with open(paths[0], 'rb') as f:
+                        self.datas = base64.encodebytes(f.read())
+                    return self.action_download()
+                if {result.mimetype for result in results} == {'application/pdf'}:
+                    return self._download_merged_pdf(paths)
+                return self._download_zip(filename, paths)
+            finally:
+                remove_results(results)
 
         return self._run_report(values=values)
 
-    def _run_report(self, values=None, return_action=True):
+    def _render_documents(self, docids, values=None):
+        """
+        run the report for each document, in parallel
+
+        Returns:
+            dict: {docid: (filename, base64 content)}
+        """
+        params_list = [self.with_context(docids=[docid], docid=docid)._prepare_report_params(values) for docid in docids]
+        results = self._fetch_reports(params_list)
+        try:
+            documents = {}
+            for docid, params, result in zip(docids, params_list, results, strict=True):
+                with open(result.path, 'rb') as f:
+                    documents[docid] = (self._get_report_filename(params), base64.encodebytes(f.read()))
+            return documents
+        finally:
+            remove_results(results)
+
+    def _get_report_url(self):
         get_param = self.env['ir.config_parameter'].sudo().get_param
-        url = "%(server_url)s/rest_v2/reports%(report_path)s.%(format)s" % {
+        return "%(server_url)s/rest_v2/reports%(report_path)s.%(format)s" % {
             'server_url': get_param('jasper_report.url'),
             'report_path': self.report_id.report_path,
             'format': self.format
         }
+
+    def _prepare_report_params(self, values=None):
         params = dict(self._context)
         if values:
             params.update(values)
@@ -159,10 +302,63 @@ class JasperReportRun(models.TransientModel):
         for name in ['docids', 'active_ids']:
             if isinstance(params.get(name), list):
                 params[name] = ','.join(map(str, params[name]))
+        return params
+
+    @api.model
+    def _get_report_cache_dir(self):
+        return os.path.join(config['data_dir'], 'jasper_report', self.env.cr.dbname)
 
-        res = requests.get(url, params=params, auth=(get_param(
-            'jasper_report.user'), get_param('jasper_report.password')), timeout=30)
+    def _fetch_reports(self, params_list):
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        cache_ttl = int(get_param('jasper_report.cache_ttl') or 0)
+        cache_dir = None
+        if cache_ttl:
+            cache_dir = self._get_report_cache_dir()
+            os.makedirs(cache_dir, exist_ok=True)
+        results = fetch_reports(
+            self._get_report_url(), params_list,
+            auth=(get_param('jasper_report.user'), get_param('jasper_report.password')),
+            max_workers=int(get_param('jasper_report.max_workers') or JASPER_MAX_WORKERS),
+            cache_dir=cache_dir, cache_ttl=cache_ttl)
+
+        for result in results:
+            if result.status_code != 200:
+                remove_results(results)
+                status = requests.status_codes._codes[result.status_code][0]
+                _logger.warning(result.content)
+                raise UserError(status)
+        return results
+
+    @api.autovacuum
+    def _gc_report_cache(self):
+        cache_dir = self._get_report_cache_dir()
+        if not os.path.isdir(cache_dir):
+            return
+        cache_ttl = int(self.env['ir.config_parameter'].sudo().get_param('jasper_report.cache_ttl') or 0)
+        expiry = time.time() - cache_ttl
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            try:
+                if os.path.getmtime(path) < expiry:
+                    os.unlink(path)
+            except OSError:
+                pass
+
+    def _run_report(self, values=None, return_action=True):
+        params = self._prepare_report_params(values)
+        [result] = self._fetch_reports([params])
+        try:
+            with open(result.path, 'rb') as f:
+                self.write({
+                    'datas': base64.encodebytes(f.read()),
+                    'filename': self._get_report_filename(params),
+                    'mimetype': result.mimetype
+                })
+        finally:
+            remove_results([result])
+        return self.action_download() if return_action else self
 
+    def _get_report_filename(self, params):
         # --- Custom: set filename to record.name (เลขที่เอกสาร) ---
         filename = None
         # Try to get the model and docids from context
@@ -187,16 +383,4 @@ class JasperReportRun(models.TransientModel):
             filename = self.report_id.name
         filename = f"{filename}.{self.format}"
         # --- End custom ---
-
-        if res.status_code == 200:
-            mimetype = res.headers['content-type']
-            self.write({
-                'datas': base64.encodebytes(res.content),
-                'filename': filename,
-                'mimetype': mimetype
-            })
-            return self.action_download() if return_action else self
-
-        status = requests.status_codes._codes[res.status_code][0]
-        _logger.warning(res.content)
-        raise UserError(status)
+        return filename
@@ -1,7 +1,9 @@
 from . import name_sequence_mixin
+from . import approval_view_mixin
 from . import approval_config
 from . import approval_record
 from . import approval_log
+from . import approval_inbox
 from . import res_users
 from . import approval_escalation
 from . import mail_activity
@@ -2,6 +2,7 @@ from odoo import fields, models, api
 from odoo.tools.safe_eval import test_python_expr, safe_eval
 from odoo.exceptions import ValidationError
 from .approval_record import ApprovalRecord
+from collections import defaultdict
 
 import logging
 _logger = logging.getLogger(__name__)
@@ -12,6 +13,7 @@ class ApprovalAutomation(models.Model):
     _inherit = ['cache.mixin', 'xml_id.mixin']
     _order ='sequence,id'
     _auto_update_registry = True
+    _approval_rule_methods = {}
     
     settings_id = fields.Many2one("approval.settings", required=True, ondelete = 'cascade')
     model = fields.Char(related='settings_id.model', readonly = True, store = True)
@@ -82,9 +84,16 @@ class ApprovalAutomation(models.Model):
                         
         return actions
                         
+    @api.model
+    def _get_rule_trigger_methods(self, model, trigger):
+        """ trigger methods of the automation rules of the model, run after the methods of the model """
+        return type(self)._approval_rule_methods.get(model, {}).get(trigger, [])
+    
     def _register_hook(self):
         super()._register_hook()
         
+        # the rules are kept on approval.automation, setup_models discovers the methods of the approval models again
+        rule_methods = defaultdict(lambda: defaultdict(list))
         for automation_rule in self.with_context({}).search_fetch([], ["model", "trigger", "from_states", "to_states"]):
             Model = self.env.get(automation_rule.model)
             if Model is None:
@@ -106,16 +115,19 @@ class ApprovalAutomation(models.Model):
             old_states = automation_rule.from_states and tuple(automation_rule.from_states) or None
             new_states = automation_rule.to_states and tuple(automation_rule.to_states) or None
                                     
-            Model._approval_trigger_methods[automation_rule.trigger].append(make_approval_trigger_method(automation_rule.id, old_states, new_states))
+            rule_methods[automation_rule.model][automation_rule.trigger].append(make_approval_trigger_method(automation_rule.id, old_states, new_states))
+            
+        type(self)._approval_rule_methods = rule_methods
             
+    def _update_registry(self):
+        super()._update_registry()
+        if self.env.registry.ready:
+            # register the current automation rules
+            self._register_hook()
             
     def _unregister_hook(self):
         super()._unregister_hook()
-        for Model in self.env.registry.values():
-            try:
-                delattr(Model, "_approval_trigger_methods")
-            except AttributeError:
-                pass    
+        type(self)._approval_rule_methods = {}
         
     def action_view_template(self):
         action = self.env["ir.actions.act_window"]._for_xml_id("mail.action_email_template_tree_all")
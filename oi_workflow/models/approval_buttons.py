@@ -8,7 +8,7 @@ _button_classes = [f"btn-{name}" for name in _button_classes] + [f"btn-outline-{
 class ApprovalButtons(models.Model):
     _name = 'approval.buttons'
     _description = 'Approval Buttons'
-    _inherit = ['cache.mixin', 'xml_id.mixin']
+    _inherit = ['cache.mixin', 'xml_id.mixin', 'approval.view.mixin']
     _order ='sequence,id'
             
     settings_id = fields.Many2one("approval.settings", ondelete = 'cascade', required=True)
@@ -9,7 +9,7 @@ _logger = logging.getLogger(__name__)
 
 class ApprovalConfig(models.Model):
     _name = 'approval.config'
-    _inherit = ['cache.mixin', 'xml_id.mixin']
+    _inherit = ['cache.mixin', 'xml_id.mixin', 'approval.view.mixin']
     _description = 'Approval Workflow Settings'
     _order = 'sequence,id'
     _rec_names_search = ['name', 'state']
@@ -112,6 +112,27 @@ class ApprovalConfig(models.Model):
             if record.committee_limit and record.is_voting:
                 raise ValidationError(_("Committee limit cannot be set when voting is enabled."))
         
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['approval.inbox']._rebuild(records.mapped('model'))
+        return records
+    
+    def write(self, vals):
+        models = self.mapped('model')
+        res = super().write(vals)
+        if {'model_id', 'state', 'active'}.intersection(vals):
+            self.env['approval.inbox']._rebuild(list(set(models + self.mapped('model'))))
+        elif {'group_ids', 'user_ids', 'user_python_code', 'committee'}.intersection(vals):
+            self.env['approval.inbox']._refresh_states(self)
+        return res
+    
+    def unlink(self):
+        models = self.mapped('model')
+        res = super().unlink()
+        self.env['approval.inbox']._rebuild(models)
+        return res
+
     @api.returns('self')
     def copy(self, default=None):
         default = dict(default or {})
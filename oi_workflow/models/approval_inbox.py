@@ -0,0 +1,61 @@
+from odoo import models, fields, api
+from odoo.tools import create_index, split_every, SQL
+
+class ApprovalInbox(models.Model):
+    _name = 'approval.inbox'
+    _description = 'Approval Inbox'
+    _log_access = False
+
+    model_id = fields.Many2one('ir.model', string='Object', required = True, ondelete='cascade')
+    record_id = fields.Integer(required = True)
+    user_id = fields.Many2one('res.users', 'User', required = True, ondelete='cascade')
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        create_index(self._cr, 'approval_inbox_user_idx', self._table, ['model_id', 'user_id'])
+        create_index(self._cr, 'approval_inbox_res_idx', self._table, ['model_id', 'record_id'])
+        return res
+
+    @api.model
+    def _get_record_ids(self, model, user_ids):
+        """ ids of the records of model waiting approval of any of the users """
+        model_id = self.env['ir.model']._get_id(model)
+        inbox_ids = self.sudo().search_fetch([('model_id','=', model_id), ('user_id','in', user_ids)], ['record_id'])
+        return list(set(inbox_ids.mapped('record_id')))
+
+    @api.model
+    def _refresh(self, records):
+        """ replace the inbox rows of the records by their current waiting approval users """
+        records = records.filtered('id')
+        if not records:
+            return
+        model_id = self.env['ir.model']._get_id(records._name)
+        for sub_records in split_every(1000, records.ids, records.browse):
+            users = sub_records.sudo()._get_approval_users()
+            self._cr.execute(SQL("DELETE FROM approval_inbox WHERE model_id = %s AND record_id IN %s", model_id, tuple(sub_records.ids)))
+            rows = [SQL("(%s, %s, %s)", model_id, record_id, user_id) for record_id, user_ids in users.items() for user_id in user_ids.ids]
+            if rows:
+                self._cr.execute(SQL("INSERT INTO approval_inbox (model_id, record_id, user_id) VALUES %s", SQL(", ").join(rows)))
+        self.invalidate_model()
+        records.invalidate_recordset(['approval_user_ids', 'approval_done_user_ids', 'approval_partner_ids', 'user_can_approve'])
+
+    @api.model
+    def _refresh_states(self, configs):
+        """ refresh the inbox of the records waiting in the approval status settings """
+        for model, config_ids in configs.sudo().grouped('model').items():
+            if model not in self.env:
+                continue
+            records = self.env[model].sudo().with_context(active_test = False).search([('state','in', config_ids.mapped('state'))])
+            self._refresh(records)
+
+    @api.model
+    def _rebuild(self, models = None):
+        """ rebuild the inbox of the given models, all the approval models if none """
+        configs = self.env['approval.config'].sudo().search(models is not None and [('model', 'in', models)] or [])
+        if models is None:
+            self._cr.execute(SQL("DELETE FROM approval_inbox"))
+        else:
+            model_ids = [self.env['ir.model']._get_id(model) for model in models]
+            self._cr.execute(SQL("DELETE FROM approval_inbox WHERE model_id IN %s", tuple(model_ids or [0])))
+        self.invalidate_model()
+        self._refresh_states(configs)
@@ -1,6 +1,6 @@
 from odoo import models, fields, api,tools, SUPERUSER_ID, _
 from odoo.tools.safe_eval import safe_eval
-from odoo.tools import config
+from odoo.tools import config, SQL
 from datetime import timedelta
 from odoo.exceptions import UserError, AccessError, ValidationError
 from dateutil.relativedelta import relativedelta
@@ -324,66 +324,138 @@ class ApprovalRecord(models.AbstractModel):
     def _get_delegation_users(self, users: Users):
         return self.env['res.users']
                                      
+    def _get_approval_done_users(self):
+        approval_done_user_ids = self.env['res.users']
+        if self.approval_state_id.sudo().committee:
+            for log in self.log_ids:
+                if log.new_state == log.old_state == self.state:
+                    approval_done_user_ids |= log.user_id
+                else:
+                    break
+        return approval_done_user_ids
+
+    def _get_approval_users(self):
+        """
+        compute the waiting approval users from the approval status settings, the forwards and the delegations,
+        the approval inbox stores the result for the saved records
+
+        Returns:
+            dict: {record id: res.users}
+        """
+        model_id = self.env['ir.model']._get_id(self._name)
+        forward_user_ids = {}
+        for approval_forward_id in self.env['approval.forward'].sudo().search_fetch([('model_id', '=', model_id), ('record_id', 'in', self.ids), ('active', '=', True)], ['user_id','record_id','approval_state_id']):
+            forward_user_ids[approval_forward_id.record_id, approval_forward_id.approval_state_id.id] = approval_forward_id.user_id
+        
+        result = {}
+        candidate_user_ids = {}
+        for approval_state_id, records in self.grouped('approval_state_id').items():
+            approval_state_id = approval_state_id.sudo()
+            if not approval_state_id:
+                for record in records:
+                    result[record.id] = self.env['res.users']
+                continue
+            
+            # static users, once per status
+            user_python_code = approval_state_id.user_python_code and approval_state_id.user_python_code.strip()      
+            state_user_ids = approval_state_id.user_ids
+            if not user_python_code:
+                state_user_ids |= approval_state_id.group_ids.users
+            
+            for record in records:
+                if forward_user_id := forward_user_ids.get((record.id, approval_state_id.id)):
+                    result[record.id] = forward_user_id
+                    continue
+                user_ids = state_user_ids
+                if user_python_code:
+                    locals_dict = record._get_eval_context()
+                    safe_eval(user_python_code, locals_dict, mode='exec', nocopy=True)
+                    user_ids |= locals_dict.get('result') or self.env['res.users']
+                user_ids |= record.sudo()._get_delegation_users(user_ids)
+                candidate_user_ids[record.id] = user_ids
+        
+        result.update(self._filter_approval_access(candidate_user_ids))
+        
+        for record in self:
+            if result[record.id]:
+                result[record.id] -= record._get_approval_done_users()
+        return result
+    
+    def _filter_approval_access(self, users):
+        """
+        keep the users with read access to the records, the record rules are checked with one search per user
+
+        Args:
+            users (dict): {record id: res.users}
+
+        Returns:
+            dict: {record id: res.users}
+        """
+        user_record_ids = defaultdict(list)
+        for record_id, user_ids in users.items():
+            for user in user_ids:
+                user_record_ids[user].append(record_id)
+        
+        readable = set()
+        for user, record_ids in user_record_ids.items():
+            records = self.with_env(self.env(user = user, context={'active_test': False})).browse(record_ids)
+            saved_ids = [record_id for record_id in record_ids if record_id]
+            if saved_ids and records.browse().has_access('read'):
+                readable.update((user.id, record_id) for record_id in records.search([('id', 'in', saved_ids)], order='id').ids)
+            for record in records.filtered(lambda record: not record.id):
+                if record.has_access('read'):
+                    readable.add((user.id, record.id))
+        
+        result = {}
+        for record_id, user_ids in users.items():
+            result[record_id] = user_ids.browse([user_id for user_id in user_ids.ids if (user_id, record_id) in readable])
+        return result
+                                     
     @api.depends('state', 'approval_state_id')
     def _calc_approval_user_ids(self):
-        model_id = self.env['ir.model']._get_id(self._name)
-        approval_forward_ids = self.env['approval.forward'].sudo().search_fetch([('model_id', '=', model_id), ('record_id', 'in', self.ids), ('active', '=', True)], ['user_id','record_id','approval_state_id'])
+        # computed live, the approval inbox is only used to search the records
+        approval_user_ids = self._get_approval_users()
         
         for record in self:
-            approval_state_id = record.approval_state_id.sudo()
-            if approval_state_id:                                
-                approval_forward_id = approval_forward_ids.filtered(lambda r: r.record_id == record.id and r.approval_state_id == approval_state_id)                
-                if approval_forward_id:
-                    user_ids = approval_forward_id.user_id                    
-                else:
-                    user_python_code = approval_state_id.user_python_code and approval_state_id.user_python_code.strip()      
-                    user_ids = approval_state_id.user_ids           
-                    
-                    if user_python_code:
-                        locals_dict = record._get_eval_context()
-                        safe_eval(user_python_code, locals_dict, mode='exec', nocopy=True)
-                        user_ids += locals_dict.get('result') or self.env['res.users']
-                    else:
-                        user_ids += approval_state_id.group_ids.users
-                    
-                    user_ids += record.sudo()._get_delegation_users(user_ids)
-                                                                
-                    for user in list(user_ids):
-                        if not record.with_env(self.env(user = user, context={})).has_access('read'):
-                            user_ids -=user
-                
-                approval_done_user_ids = self.env['res.users']
-                if approval_state_id.committee:                   
-                   for log in record.log_ids:
-                       if log.new_state == log.old_state == record.state:
-                           approval_done_user_ids |= log.user_id
-                       else:
-                           break                           
-                   user_ids -= approval_done_user_ids
-                                 
+            if record.approval_state_id:
+                user_ids = approval_user_ids[record.id]
                 record.approval_user_ids = user_ids
                 record.user_can_approve = bool(user_ids & self.env.user) or self.env.user._is_superuser()                
                 record.approval_partner_ids = user_ids.partner_id
-                record.approval_done_user_ids = approval_done_user_ids
+                record.approval_done_user_ids = record._get_approval_done_users()
             else:
                 record.approval_user_ids = False
                 record.approval_partner_ids = False
                 record.user_can_approve = False
                 record.approval_done_user_ids = False
                 
-                    
     def _search_approval_user_ids(self, operator, value):
         user_ids = self.env['res.users'].search([('id', operator, value)])
-        model_id = self.env['ir.model']._get_id(self._name)
-        state_ids = self.env['approval.config'].search([('model_id','=', model_id), ('group_ids','in', user_ids.mapped('wkf_groups_ids.id'))])
-        state_ids += self.env['approval.forward'].search([('model_id','=', model_id), ('user_id','in', user_ids.ids), ('active', '=', True)]).mapped('approval_state_id')
-        ids = []
-        for approval_state_id in state_ids:
-            records= self.search([('state', '=', approval_state_id.state)])
-            for record in records:
-                if record.approval_user_ids & user_ids:
-                    ids.append(record.id)                            
-        return [('id', 'in', ids)]
+        return [('id', 'in', self.env['approval.inbox']._get_record_ids(self._name, user_ids.ids))]
+    
+    def _refresh_approval_inbox(self):
+        """ 
+        refresh the approval inbox of the records, called after the trigger methods of the creation, the status updates and the forwards,
+        to be called when the waiting approval users change outside the workflow (e.g. delegation)
+        """
+        self.env['approval.inbox']._refresh(self)
+    
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        self._cr.execute(SQL("SELECT id FROM ir_model WHERE model = %s", self._name))
+        row = self._cr.fetchone()
+        if not row:
+            return
+        self._cr.execute(SQL("SELECT 1 FROM approval_inbox WHERE model_id = %s LIMIT 1", row[0]))
+        if self._cr.rowcount:
+            return
+        try:
+            with self._cr.savepoint():
+                self.env['approval.inbox']._rebuild([self._name])
+        except Exception:
+            _logger.exception("Error building the approval inbox of %s", self._name)
     
     def _get_approval_settings(self):
         return self.env["approval.settings"].sudo().get(self._name)
@@ -466,6 +538,7 @@ class ApprovalRecord(models.AbstractModel):
                 if remain_users:
                     record._create_approval_log(committee = True)
                     record.invalidate_recordset(['approval_user_ids','approval_done_user_ids', 'log_ids'])
+                    record._refresh_approval_inbox()
                     record._reschedule_approval_activity()                                        
                     continue
                 elif record.approval_state_id.is_voting and not remain_users and voting_percentage < record.approval_state_id.committee_vote_percentage:
@@ -573,13 +646,14 @@ class ApprovalRecord(models.AbstractModel):
         
         actions = []
         for record in self:
-            self.env['approval.forward'].create(record._prepare_approval_forward_vals())
+            self.env['approval.forward'].create(record._prepare_approval_forward_vals(forward_user_id))
             
             if not record.with_user(forward_user_id).has_access('read'):
                 raise UserError(self.env._('User %s not have access to record %s', forward_user_id.display_name, record.display_name))
             
             record._post_approval_forward(forward_user_id)
             actions.extend(record._apply_approval_trigger_methods('on_forward'))
+        self._refresh_approval_inbox()
         return self._clean_actions(actions)
     
     def _action_action(self):      
@@ -595,6 +669,11 @@ class ApprovalRecord(models.AbstractModel):
     def _unlink_remove_approval_log(self):
         model_id = self.env['ir.model']._get_id(self._name)
         self.env['approval.log'].sudo().search([('model_id','=', model_id), ('record_id', 'in', self.ids)]).unlink()            
+    
+    @api.ondelete(at_uninstall=False)
+    def _unlink_remove_approval_inbox(self):
+        model_id = self.env['ir.model']._get_id(self._name)
+        self.env['approval.inbox'].sudo().search([('model_id','=', model_id), ('record_id', 'in', self.ids)]).unlink()
                                                      
     def action_approve_all(self):            
         self = self.with_context(approval_all_action = True)
@@ -721,6 +800,12 @@ class ApprovalRecord(models.AbstractModel):
                 field_node.set("readonly", self._default_field_readonly)                                           
             
                 
+    @api.model
+    def _get_view_cache_key(self, view_id=None, view_type='form', **options):
+        """ the augmented views stay cached until the approval settings, statuses or buttons change """
+        key = super()._get_view_cache_key(view_id, view_type, **options)
+        return key + (self.env['approval.view.mixin']._get_approval_view_version(),)
+    
     @api.model
     def _get_view(self, view_id=None, view_type='form', **options):
         arch, view = super()._get_view(view_id, view_type, **options)
@@ -762,19 +847,20 @@ class ApprovalRecord(models.AbstractModel):
         
         return arch, view         
 
-    @property
-    def _approval_trigger_methods(self):
-        triggers = self.env.registry["approval.automation"]._fields['trigger'].get_values(self.env)
-        
-        cls = self.env.registry[self._name]
+    @api.model
+    def _get_approval_trigger_methods(self):
         methods = defaultdict(list)
-        for attr, func in getmembers(cls, callable):
-            for name in triggers:
-                if hasattr(func, f'_approval_{name}'):
-                    methods[name].append(func)
-        
-        cls._approval_trigger_methods = methods # pyright: ignore[reportAttributeAccessIssue]
+        for attr, func in getmembers(type(self), callable):
+            for name in list(getattr(func, '__dict__', ())):
+                if name.startswith('_approval_on_'):
+                    methods[name[len('_approval_'):]].append(func)
         return methods
+    
+    @api.model
+    def _setup_complete(self):
+        super()._setup_complete()
+        # trigger methods are discovered once per registry setup, the automation rules are kept apart by approval.automation
+        type(self)._approval_trigger_methods = self._get_approval_trigger_methods() # pyright: ignore[reportAttributeAccessIssue]
                                 
     def _apply_approval_trigger_methods(self, trigger: str) -> list :
         assert trigger in self.env["approval.automation"]._fields['trigger'].get_values(self.env)
@@ -792,7 +878,8 @@ class ApprovalRecord(models.AbstractModel):
                 return (".",)
             return states
         
-        for method in self._approval_trigger_methods.get(trigger, ()):
+        methods = self._approval_trigger_methods.get(trigger, []) + self.env['approval.automation']._get_rule_trigger_methods(self._name, trigger)
+        for method in methods:
             old_states, new_states = getattr(method, f'_approval_{trigger}')
             old_states = get_states(old_states)
             new_states = get_states(new_states)                                    
@@ -846,6 +933,7 @@ class ApprovalRecord(models.AbstractModel):
             if create:
                 for record in self:
                     record._apply_approval_trigger_methods('on_create')            
+                self._refresh_approval_inbox()
                 
             else:
                 if before:
@@ -855,6 +943,8 @@ class ApprovalRecord(models.AbstractModel):
                 else:
                     for record in self:
                         record._apply_approval_trigger_methods('on_state_updated')
+                    # after the trigger methods, which create the log and remove the forwards
+                    self._refresh_approval_inbox()
                                 
         return super().modified(fnames, create, before)
     
@@ -935,4 +1025,11 @@ class ApprovalRecord(models.AbstractModel):
         records = super().create(vals_list)
         if self.env.context.get("approval_auto_submit"):
             records._action_approve()
-        return records
\ No newline at end of file
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'state' not in vals:
+            # python code approvers may depend on any field of the record
+            self.filtered(lambda record: record.approval_state_id.sudo().user_python_code)._refresh_approval_inbox()
+        return res
\ No newline at end of file
@@ -3,7 +3,7 @@ from odoo import models, fields, api, _
 
 class ApprovalSettings(models.Model):
     _name = 'approval.settings'
-    _inherit = ['cache.mixin', 'xml_id.mixin']
+    _inherit = ['cache.mixin', 'xml_id.mixin', 'approval.view.mixin']
     _description = 'Approval Workflow Model Settings'
     _rec_name = 'model'
     _order = 'sequence,id'
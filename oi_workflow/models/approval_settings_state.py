@@ -3,7 +3,7 @@ from odoo import models, fields, api
 
 class ApprovalSettingsStatus(models.Model):
     _name = 'approval.settings.state'
-    _inherit = ['cache.mixin', 'xml_id.mixin']
+    _inherit = ['cache.mixin', 'xml_id.mixin', 'approval.view.mixin']
     _description = 'Approval Workflow Static Status'
     _order = 'type desc,sequence'
 
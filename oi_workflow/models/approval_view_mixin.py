@@ -0,0 +1,32 @@
+from odoo import models, api
+
+VIEW_VERSION_PARAM = 'oi_workflow.approval_view_version'
+
+class ApprovalViewMixin(models.AbstractModel):
+    _name = 'approval.view.mixin'
+    _description = 'Approval View Mixin'
+
+    @api.model
+    def _get_approval_view_version(self):
+        return self.env['ir.config_parameter'].sudo().get_param(VIEW_VERSION_PARAM, '0')
+
+    @api.model
+    def _bump_approval_view_version(self):
+        """ invalidate the approval views cached by all the workers """
+        params = self.env['ir.config_parameter'].sudo()
+        params.set_param(VIEW_VERSION_PARAM, str(int(params.get_param(VIEW_VERSION_PARAM, '0')) + 1))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self._bump_approval_view_version()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._bump_approval_view_version()
+        return res
+
+    @api.ondelete(at_uninstall=False)
+    def _unlink_bump_approval_view_version(self):
+        self._bump_approval_view_version()
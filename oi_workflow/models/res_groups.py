@@ -7,4 +7,10 @@ class ResGroups(models.Model):
         "approval.config",
         string="Approval Status",
         relation='approval_config_group_ids_rel'
-        )
\ No newline at end of file
+        )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'users', 'implied_ids'}.intersection(vals):
+            self.env['res.users']._refresh_approval_inbox(self | self.trans_implied_ids)
+        return res
@@ -15,5 +15,29 @@ class User(models.Model):
         field = 'active_groups_ids' in self and 'active_groups_ids' or 'groups_id'
         for record in self:
             record.wkf_groups_ids = record[field]
-            
-                
\ No newline at end of file
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._refresh_approval_inbox(records.groups_id)
+        return records
+    
+    def write(self, vals):
+        if not any(name in ('groups_id', 'active') or name.startswith(('in_group_', 'sel_groups_')) for name in vals):
+            return super().write(vals)
+        old_groups = {user: user.groups_id for user in self}
+        res = super().write(vals)
+        groups = self.env['res.groups']
+        for user in self:
+            if 'active' in vals:
+                groups |= old_groups[user] | user.groups_id
+            else:
+                groups |= old_groups[user] ^ user.groups_id
+        self._refresh_approval_inbox(groups)
+        return res
+    
+    def _refresh_approval_inbox(self, groups):
+        """ refresh the approval inbox of the records waiting the approval of the groups """
+        if groups:
+            configs = self.env['approval.config'].sudo().search([('group_ids', 'in', groups.ids)])
+            self.env['approval.inbox']._refresh_states(configs)
@@ -0,0 +1 @@
+from . import test_approval_users
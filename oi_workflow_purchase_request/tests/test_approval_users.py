@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+
+from odoo.tests import new_test_user, tagged
+from odoo.tests.common import TransactionCase
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'oi_workflow_benchmark')
+class TestApprovalUsers(TransactionCase):
+    """ Waiting approval users of 5,000 purchase requests, resolved in one batch
+        and record by record.
+
+        Run with --test-tags oi_workflow_benchmark
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True, mail_create_nolog=True))
+        cls.manager = new_test_user(cls.env, login='pr_approval_manager',
+                                    groups='purchase.group_purchase_manager,purchase_request.group_purchase_request_manager')
+        # reads only its own requests
+        cls.approver = new_test_user(cls.env, login='pr_approval_user',
+                                     groups='purchase.group_purchase_manager,purchase_request.group_purchase_request_user')
+        cls.requests = cls.env['purchase.request'].create([{
+            'name': 'PR approval %s' % i,
+            'requested_by': (cls.approver if i % 2 else cls.manager).id,
+        } for i in range(5000)])
+        # straight to the approval status, without the workflow triggers
+        cls.env.cr.execute(SQL("UPDATE purchase_request SET state = 'to approve' WHERE id IN %s", tuple(cls.requests.ids)))
+        cls.requests.invalidate_recordset()
+
+    def test_approval_users(self):
+        requests = self.requests
+        count = self.cr.sql_log_count
+        start = time.time()
+        users = requests._get_approval_users()
+        batch_queries, batch_time = self.cr.sql_log_count - count, time.time() - start
+
+        sample = requests[:500]
+        sample.invalidate_recordset()
+        single = {}
+        count = self.cr.sql_log_count
+        start = time.time()
+        for request in sample:
+            single.update(request._get_approval_users())
+        single_queries, single_time = self.cr.sql_log_count - count, time.time() - start
+
+        _logger.info("Approval users of 5000 purchase requests: %s queries in %.2fs in one batch, "
+                     "%s queries in %.2fs for 500 record by record",
+                     batch_queries, batch_time, single_queries, single_time)
+
+        for request in requests:
+            self.assertIn(self.manager, users[request.id])
+            self.assertEqual(self.approver in users[request.id], request.requested_by == self.approver)
+        for request in sample:
+            self.assertEqual(single[request.id], users[request.id])
+        self.assertLess(batch_queries, single_queries)
+
+    def test_search_approval_users(self):
+        count = self.cr.sql_log_count
+        start = time.time()
+        self.requests._refresh_approval_inbox()
+        refresh_queries, refresh_time = self.cr.sql_log_count - count, time.time() - start
+
+        count = self.cr.sql_log_count
+        start = time.time()
+        waiting = self.env['purchase.request'].search([('approval_user_ids', 'in', self.approver.ids)])
+        search_queries, search_time = self.cr.sql_log_count - count, time.time() - start
+
+        _logger.info("Approval inbox of 5000 purchase requests: refreshed with %s queries in %.2fs, "
+                     "searched with %s queries in %.2fs",
+                     refresh_queries, refresh_time, search_queries, search_time)
+        self.assertEqual(waiting, self.requests.filtered(lambda request: request.requested_by == self.approver))
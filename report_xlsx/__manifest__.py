@@ -11,6 +11,12 @@
     "license": "AGPL-3",
     "external_dependencies": {"python": ["xlsxwriter", "xlrd"]},
     "depends": ["base", "web"],
+    "data": [
+        "security/ir.model.access.csv",
+        "security/report_xlsx_job_security.xml",
+        "data/ir_cron.xml",
+        "views/ir_actions_report.xml",
+    ],
     "demo": ["demo/report.xml"],
     "installable": True,
     "assets": {
@@ -27,15 +27,9 @@ class ReportController(ReportController):
     @route()
     def report_routes(self, reportname, docids=None, converter=None, **data):
         if converter == "xlsx":
-            report = request.env["ir.actions.report"]._get_report_from_name(reportname)
-            context = dict(request.env.context)
-            if docids:
-                docids = [int(i) for i in docids.split(",")]
-            if data.get("options"):
-                data.update(json.loads(data.pop("options")))
-            if data.get("context"):
-                data["context"] = json.loads(data["context"])
-                context.update(data["context"])
+            report, docids, data, context = self._prepare_xlsx_report(
+                reportname, docids, data
+            )
             xlsx = report.with_context(**context)._render_xlsx(
                 reportname, docids, data=data
             )[0]
@@ -50,49 +44,70 @@ class ReportController(ReportController):
             return request.make_response(xlsx, headers=xlsxhttpheaders)
         return super().report_routes(reportname, docids, converter, **data)
 
+    def _prepare_xlsx_report(self, reportname, docids, data):
+        """Return the report, docids, data and context to render ``reportname``
+        from the arguments of the report route."""
+        report = request.env["ir.actions.report"]._get_report_from_name(reportname)
+        context = dict(request.env.context)
+        if docids:
+            docids = [int(i) for i in docids.split(",")]
+        if data.get("options"):
+            data.update(json.loads(data.pop("options")))
+        if data.get("context"):
+            data["context"] = json.loads(data["context"])
+            context.update(data["context"])
+        return report, docids, data, context
+
+    def _parse_xlsx_url(self, url, context=None):
+        """Split a /report/xlsx url in the report name, the docids and the
+        arguments of the report route."""
+        reportname = url.split("/report/xlsx/")[1].split("?")[0]
+        docids = None
+        if "/" in reportname:
+            reportname, docids = reportname.split("/")
+        if docids:
+            # Generic report:
+            data = {"context": context}
+        else:
+            # Particular report:
+            data = dict(
+                url_decode(url.split("?")[1]).items()
+            )  # decoding the args represented in JSON
+            if "context" in data:
+                context, data_context = (
+                    json.loads(context or "{}"),
+                    json.loads(data.pop("context")),
+                )
+                context = json.dumps({**context, **data_context})
+            data["context"] = context
+        return reportname, docids, data
+
+    def _get_xlsx_filename(self, report, docids):
+        filename = f"{report.name}.xlsx"
+        if docids:
+            ids = [int(x) for x in docids.split(",")]
+            obj = request.env[report.model].browse(ids)
+            if report.print_report_name and not len(obj) > 1:
+                report_name = safe_eval(
+                    report.print_report_name, {"object": obj, "time": time}
+                )
+                filename = f"{report_name}.xlsx"
+        return filename
+
     @route()
     def report_download(self, data, context=None, token=None):
         requestcontent = json.loads(data)
         url, report_type = requestcontent[0], requestcontent[1]
         if report_type == "xlsx":
             try:
-                reportname = url.split("/report/xlsx/")[1].split("?")[0]
-                docids = None
-                if "/" in reportname:
-                    reportname, docids = reportname.split("/")
-                if docids:
-                    # Generic report:
-                    response = self.report_routes(
-                        reportname, docids=docids, converter="xlsx", context=context
-                    )
-                else:
-                    # Particular report:
-                    data = dict(
-                        url_decode(url.split("?")[1]).items()
-                    )  # decoding the args represented in JSON
-                    if "context" in data:
-                        context, data_context = (
-                            json.loads(context or "{}"),
-                            json.loads(data.pop("context")),
-                        )
-                        context = json.dumps({**context, **data_context})
-                    response = self.report_routes(
-                        reportname, converter="xlsx", context=context, **data
-                    )
-
+                reportname, docids, data = self._parse_xlsx_url(url, context)
+                response = self.report_routes(
+                    reportname, docids=docids, converter="xlsx", **data
+                )
                 report = request.env["ir.actions.report"]._get_report_from_name(
                     reportname
                 )
-                filename = f"{report.name}.xlsx"
-
-                if docids:
-                    ids = [int(x) for x in docids.split(",")]
-                    obj = request.env[report.model].browse(ids)
-                    if report.print_report_name and not len(obj) > 1:
-                        report_name = safe_eval(
-                            report.print_report_name, {"object": obj, "time": time}
-                        )
-                        filename = f"{report_name}.xlsx"
+                filename = self._get_xlsx_filename(report, docids)
                 if not response.headers.get("Content-Disposition"):
                     response.headers.add(
                         "Content-Disposition", content_disposition(filename)
@@ -105,3 +120,25 @@ class ReportController(ReportController):
                 return request.make_response(html_escape(json.dumps(error)))
         else:
             return super().report_download(data, context=context, token=token)
+
+    @route("/report/xlsx/async", type="json", auth="user")
+    def report_xlsx_async(self, data, context=None):
+        """Queue the generation of the XLSX report of a /report/download
+        request and return the id of its job."""
+        url = json.loads(data)[0]
+        reportname, docids, data = self._parse_xlsx_url(url, context)
+        filename = self._get_xlsx_filename(
+            request.env["ir.actions.report"]._get_report_from_name(reportname),
+            docids,
+        )
+        report, docids, data, context = self._prepare_xlsx_report(
+            reportname, docids, data
+        )
+        job = request.env["report.xlsx.job"]._enqueue(
+            report, docids, data, context, filename
+        )
+        return job.id
+
+    @route("/report/xlsx/job/<int:job_id>", type="json", auth="user")
+    def report_xlsx_job_status(self, job_id):
+        return request.env["report.xlsx.job"].browse(job_id)._get_status()
@@ -1 +1,2 @@
 from . import ir_report
+from . import report_xlsx_job
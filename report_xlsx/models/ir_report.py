@@ -15,6 +15,14 @@ class ReportAction(models.Model):
     report_type = fields.Selection(
         selection_add=[("xlsx", "XLSX")], ondelete={"xlsx": "set default"}
     )
+    xlsx_async = fields.Boolean(
+        string="Generate in background",
+        help="The XLSX report is generated by a scheduled action and downloaded "
+        "when ready, for reports too large to be rendered within a request.",
+    )
+
+    def _get_readable_fields(self):
+        return super()._get_readable_fields() | {"xlsx_async"}
 
     @api.model
     def _render_xlsx(self, report_ref, docids, data):
@@ -30,6 +38,19 @@ class ReportAction(models.Model):
             report_sudo.save_xlsx_report_attachment(docids, ret[0])
         return ret
 
+    @api.model
+    def _render_xlsx_file(self, report_ref, docids, data, file_path):
+        """Same as _render_xlsx, writing the report to ``file_path``."""
+        report_sudo = self._get_report(report_ref)
+        report_model_name = f"report.{report_sudo.report_name}"
+        report_model = self.env[report_model_name]
+        report_model.with_context(active_model=report_sudo.model).sudo(
+            False
+        ).create_xlsx_report_file(docids, data, file_path)
+        if report_sudo.attachment:
+            with open(file_path, "rb") as f:
+                report_sudo.save_xlsx_report_attachment(docids, f.read())
+
     @api.model
     def _get_report_from_name(self, report_name):
         res = super()._get_report_from_name(report_name)
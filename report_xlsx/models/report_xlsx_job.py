@@ -0,0 +1,239 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CHUNK_SIZE = 64 * 1024
+
+
+class ReportXlsxJob(models.Model):
+    """XLSX report rendered in the background.
+
+    Jobs are created by the web client for the reports flagged with
+    "Generate in background", rendered by the "Generate XLSX reports"
+    scheduled action into a temporary file and stored as an attachment
+    the client downloads once the job is done.
+    """
+
+    _name = "report.xlsx.job"
+    _description = "XLSX Report Job"
+    _order = "id desc"
+
+    name = fields.Char(string="File Name", required=True, readonly=True)
+    user_id = fields.Many2one(
+        comodel_name="res.users",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete="cascade",
+        default=lambda self: self.env.user,
+    )
+    report_id = fields.Many2one(
+        comodel_name="ir.actions.report",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    docids = fields.Json(readonly=True)
+    data = fields.Json(readonly=True)
+    context = fields.Json(readonly=True)
+    state = fields.Selection(
+        selection=[
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    attachment_id = fields.Many2one(
+        comodel_name="ir.attachment", readonly=True, ondelete="set null"
+    )
+    error = fields.Text(readonly=True)
+    date_done = fields.Datetime(readonly=True)
+
+    @api.model
+    def _get_max_jobs_per_user(self):
+        return int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("report_xlsx.async_max_jobs_per_user", 2)
+        )
+
+    @api.model
+    def _enqueue(self, report, docids, data, context, filename):
+        """Create the job rendering ``report`` for the current user and wake
+        up the scheduled action."""
+        limit = self._get_max_jobs_per_user()
+        running = self.sudo().search_count(
+            [("user_id", "=", self.env.uid), ("state", "in", ("pending", "running"))]
+        )
+        if limit and running >= limit:
+            raise UserError(
+                _(
+                    "You already have %s XLSX reports being generated, "
+                    "please wait for them to be ready.",
+                    running,
+                )
+            )
+        job = self.sudo().create(
+            {
+                "name": filename,
+                "user_id": self.env.uid,
+                "report_id": report.id,
+                "docids": docids,
+                "data": data,
+                "context": context,
+            }
+        )
+        self.env.ref("report_xlsx.ir_cron_report_xlsx_job")._trigger()
+        return job.sudo(False)
+
+    def _get_status(self):
+        self.ensure_one()
+        return {
+            "state": self.state,
+            "error": self.error,
+            "attachment_id": self.attachment_id.id,
+        }
+
+    @api.model
+    def _cron_process_jobs(self, limit=None):
+        # Only one instance of the scheduled action runs at a time: a job
+        # still running was interrupted, most likely by the worker limits,
+        # so do not try it again.
+        self.search([("state", "=", "running")]).write(
+            {
+                "state": "failed",
+                "error": _("The generation of the report was interrupted."),
+                "date_done": fields.Datetime.now(),
+            }
+        )
+        self.env.cr.commit()
+        count = 0
+        while limit is None or count < limit:
+            self.env.cr.execute(
+                SQL(
+                    "SELECT id FROM report_xlsx_job WHERE state = 'pending' "
+                    "ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED"
+                )
+            )
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            self.browse(row[0])._process()
+            count += 1
+
+    def _process(self):
+        self.ensure_one()
+        self.state = "running"
+        self.env.cr.commit()
+        try:
+            attachment = self._render()
+            self.write(
+                {
+                    "state": "done",
+                    "attachment_id": attachment.id,
+                    "date_done": fields.Datetime.now(),
+                }
+            )
+        except Exception as e:
+            self.env.cr.rollback()
+            _logger.exception("Error while generating XLSX report job %s", self.id)
+            self.write(
+                {
+                    "state": "failed",
+                    "error": str(e),
+                    "date_done": fields.Datetime.now(),
+                }
+            )
+        self.env.cr.commit()
+
+    def _render(self):
+        """Render the report as the user who requested it into a temporary
+        file and return the attachment of the file."""
+        self.ensure_one()
+        report = self.report_id.with_user(self.user_id).with_context(
+            **(self.context or {})
+        )
+        fd, file_path = tempfile.mkstemp(suffix=".xlsx", prefix="report_xlsx_")
+        os.close(fd)
+        try:
+            report._render_xlsx_file(
+                report.report_name, self.docids, self.data, file_path
+            )
+            return self._attach_file(file_path)
+        finally:
+            os.unlink(file_path)
+
+    def _attach_file(self, file_path):
+        """Attach the file to the job. With the file storage, the file is
+        hashed and copied into the filestore by chunks instead of being read
+        in memory."""
+        self.ensure_one()
+        Attachment = self.env["ir.attachment"]
+        vals = {
+            "name": self.name,
+            "res_model": self._name,
+            "res_id": self.id,
+            "type": "binary",
+            "mimetype": XLSX_MIMETYPE,
+        }
+        if Attachment._storage() != "file":
+            with open(file_path, "rb") as f:
+                vals["raw"] = f.read()
+            return Attachment.create(vals)
+
+        sha = hashlib.sha1()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+        checksum = sha.hexdigest()
+        fname = checksum[:2] + "/" + checksum
+        full_path = Attachment._full_path(fname)
+        if not os.path.isfile(full_path):
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            tmp_path = full_path + ".tmp"
+            shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, full_path)
+        Attachment._mark_for_gc(fname)
+        # ir.attachment.create drops the file fields, they are set directly
+        attachment = Attachment.create(vals)
+        self.env.cr.execute(
+            SQL(
+                "UPDATE ir_attachment SET store_fname = %s, checksum = %s, "
+                "file_size = %s WHERE id = %s",
+                fname,
+                checksum,
+                os.path.getsize(full_path),
+                attachment.id,
+            )
+        )
+        attachment.invalidate_recordset(["store_fname", "checksum", "file_size"])
+        return attachment
+
+    @api.autovacuum
+    def _gc_jobs(self):
+        """Remove the jobs finished for more than a day, with their file."""
+        jobs = self.search(
+            [
+                ("state", "in", ("done", "failed")),
+                ("date_done", "<", fields.Datetime.now() - timedelta(days=1)),
+            ]
+        )
+        jobs.attachment_id.unlink()
+        jobs.unlink()
@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
 import logging
+import os
 import re
 from io import BytesIO
 
@@ -107,6 +108,16 @@ class ReportXlsxAbstract(models.AbstractModel):
         file_data.seek(0)
         return file_data.read(), "xlsx"
 
+    def create_xlsx_report_file(self, docids, data, file_path):
+        """Write the report to ``file_path`` instead of memory, used by the
+        reports generated in background."""
+        objs = self._get_objs_for_report(docids, data)
+        options = dict(self.get_workbook_options())
+        options.setdefault("tmpdir", os.path.dirname(file_path))
+        workbook = xlsxwriter.Workbook(file_path, options)
+        self.generate_xlsx_report(workbook, data, objs)
+        workbook.close()
+
     def get_workbook_options(self):
         """
         See https://xlsxwriter.readthedocs.io/workbook.html constructor options
@@ -1,7 +1,32 @@
+import {_t} from "@web/core/l10n/translation";
+import {browser} from "@web/core/browser/browser";
 import {download} from "@web/core/network/download";
 import {registry} from "@web/core/registry";
+import {rpc} from "@web/core/network/rpc";
 import {user} from "@web/core/user";
 
+const JOB_POLL_DELAY = 3000;
+
+async function downloadWhenReady(jobId, env) {
+    // Poll the job generating the report in background, then download it
+    for (;;) {
+        await new Promise((resolve) => browser.setTimeout(resolve, JOB_POLL_DELAY));
+        const status = await rpc(`/report/xlsx/job/${jobId}`);
+        if (status.state === "done") {
+            return download({
+                url: `/web/content/${status.attachment_id}`,
+                data: {download: true},
+            });
+        } else if (status.state === "failed") {
+            env.services.notification.add(status.error, {
+                title: _t("The XLSX report could not be generated"),
+                type: "danger",
+            });
+            return;
+        }
+    }
+}
+
 registry
     .category("ir.actions.report handlers")
     .add("xlsx_handler", async function (action, options, env) {
@@ -24,17 +49,23 @@ registry
                     url += `?context=${context}`;
                 }
             }
-            env.services.ui.block();
-            try {
-                await download({
-                    url: "/report/download",
-                    data: {
-                        data: JSON.stringify([url, action.report_type]),
-                        context: JSON.stringify(user.context),
-                    },
-                });
-            } finally {
-                env.services.ui.unblock();
+            const requestData = {
+                data: JSON.stringify([url, action.report_type]),
+                context: JSON.stringify(user.context),
+            };
+            if (action.xlsx_async) {
+                const jobId = await rpc("/report/xlsx/async", requestData);
+                env.services.notification.add(
+                    _t("The report is being generated, it will be downloaded once ready.")
+                );
+                downloadWhenReady(jobId, env);
+            } else {
+                env.services.ui.block();
+                try {
+                    await download({url: "/report/download", data: requestData});
+                } finally {
+                    env.services.ui.unblock();
+                }
             }
             const onClose = options.onClose;
             if (action.close_on_report_download) {
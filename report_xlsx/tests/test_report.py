@@ -3,6 +3,7 @@
 
 import logging
 
+from odoo.exceptions import UserError
 from odoo.tests import common
 
 _logger = logging.getLogger(__name__)
@@ -73,3 +74,30 @@ class TestReport(common.TransactionCase):
         self.assertEqual(
             self.xlsx_report._report_xlsx_currency_format(eur), "#,##0.00 €"
         )
+
+    def test_job(self):
+        Job = self.env["report.xlsx.job"]
+        job = Job._enqueue(self.report, self.docs.ids, {}, {}, "partner.xlsx")
+        self.assertEqual(job.state, "pending")
+        self.assertEqual(job.user_id, self.env.user)
+        job = job.sudo()
+        attachment = job._render()
+        self.assertEqual(attachment.res_id, job.id)
+        self.assertEqual(attachment.file_size, len(attachment.raw))
+        wb = open_workbook(file_contents=attachment.raw)
+        sheet = wb.sheet_by_index(0)
+        self.assertEqual(sheet.cell(0, 0).value, self.docs.name)
+
+    def test_job_limit(self):
+        Job = self.env["report.xlsx.job"]
+        self.env["ir.config_parameter"].sudo().set_param(
+            "report_xlsx.async_max_jobs_per_user", 1
+        )
+        Job._enqueue(self.report, self.docs.ids, {}, {}, "partner.xlsx")
+        with self.assertRaises(UserError):
+            Job._enqueue(self.report, self.docs.ids, {}, {}, "partner.xlsx")
+
+    def test_xlsx_async_readable(self):
+        self.report.xlsx_async = True
+        action = self.report.read(self.report_object._get_readable_fields())[0]
+        self.assertTrue(action["xlsx_async"])
@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 import re
+from collections import namedtuple
 from datetime import date, datetime
 from types import CodeType
 
@@ -12,6 +13,116 @@ from odoo.exceptions import UserError
 
 from .report_xlsx_format import FORMATS, XLS_HEADERS
 
+XlsxCellSpec = namedtuple(
+    "XlsxCellSpec",
+    "col pos last_pos value value_is_code cell_type cell_format format_is_code",
+)
+
+# cell types of the values of the most common classes, the values of other
+# classes are resolved by ReportXlsxAbstract._get_cell_type
+CELL_TYPES = {
+    bool: "boolean",
+    str: "string",
+    int: "number",
+    float: "number",
+    datetime: "datetime",
+}
+
+# source of the code objects returned by ReportXlsxAbstract._render
+RENDERED_SOURCES = {}
+
+
+class XlsxRowWriter:
+    """Write worksheet rows from precompiled column specifications.
+
+    Use ReportXlsxAbstract._get_row_writer to build it.
+    The rendered values and formats of a row are evaluated at once, and
+    the cell type and worksheet method of each cell are resolved by a
+    dictionary lookup.
+    """
+
+    def __init__(self, report, ws, cells, col_specs_section):
+        self.report = report
+        self.ws = ws
+        self.col_specs_section = col_specs_section
+        self.codes = []
+        self.cells = []
+        for cell in cells:
+            value = cell.value
+            if cell.value_is_code:
+                value = len(self.codes)
+                self.codes.append(cell.value)
+            cell_format = cell.cell_format
+            if cell.format_is_code:
+                cell_format = len(self.codes)
+                self.codes.append(cell.cell_format)
+            self.cells.append(cell._replace(value=value, cell_format=cell_format))
+        self.row_code = None
+        sources = [RENDERED_SOURCES.get(code) for code in self.codes]
+        if self.codes and all(sources):
+            self.row_code = compile(
+                "(" + ", ".join(f"({source})" for source in sources) + ",)",
+                "<string>",
+                "eval",
+            )
+        self._ws_methods = {}
+
+    def _get_ws_method(self, cell_type):
+        ws_method = self._ws_methods.get(cell_type)
+        if ws_method is None:
+            ws_method = self._ws_methods[cell_type] = getattr(
+                self.ws, f"write_{cell_type}"
+            )
+        return ws_method
+
+    def _eval(self, render_space):
+        if not render_space:
+            render_space = {}
+        if "datetime" not in render_space:
+            render_space["datetime"] = datetime
+        # the use of eval is not a security thread as long as the
+        # col_specs template is defined in a python module
+        # pylint: disable=W0123,W8112
+        if self.row_code:
+            return eval(self.row_code, render_space)
+        return [eval(code, render_space) for code in self.codes]
+
+    def write_row(self, row_pos, render_space=None):
+        """Write one row, return the position of the next row."""
+        values = self._eval(render_space) if self.codes else ()
+        for cell in self.cells:
+            cell_value = values[cell.value] if cell.value_is_code else cell.value
+            cell_type = cell.cell_type
+            if not cell_type:
+                cell_type = CELL_TYPES.get(type(cell_value))
+                if not cell_type:
+                    cell_type, cell_value = self.report._get_cell_type(
+                        cell_value, self.col_specs_section, cell.col
+                    )
+            args_data = [cell_value]
+            cell_format = cell.cell_format
+            if cell.format_is_code:
+                cell_format = values[cell_format]
+                args_data.append(cell_format)
+            elif cell_format:
+                args_data.append(cell_format)
+            if cell_type == "formula":
+                self.report._apply_formula_quirk(args_data, cell_type, cell_format)
+            if cell.last_pos is not None:
+                self.ws.merge_range(
+                    row_pos, cell.pos, row_pos, cell.last_pos, *args_data
+                )
+            else:
+                self._get_ws_method(cell_type)(row_pos, cell.pos, *args_data)
+        return row_pos + 1
+
+    def write_rows(self, row_pos, render_spaces):
+        """Write one row per render space, return the position of the
+        next row."""
+        for render_space in render_spaces:
+            row_pos = self.write_row(row_pos, render_space)
+        return row_pos
+
 
 class ReportXlsxAbstract(models.AbstractModel):
     _inherit = "report.report_xlsx.abstract"
@@ -692,36 +803,9 @@ class ReportXlsxAbstract(models.AbstractModel):
                 cell_type = cell_spec.get("type")
                 cell_format = cell_spec.get("format") or default_format
                 if not cell_type:
-                    # test bool first since isinstance(val, int) returns
-                    # True when type(val) is bool
-                    if isinstance(cell_value, bool):
-                        cell_type = "boolean"
-                    elif isinstance(cell_value, str):
-                        cell_type = "string"
-                    elif isinstance(cell_value, int | float):
-                        cell_type = "number"
-                    elif isinstance(cell_value, datetime):
-                        cell_type = "datetime"
-                    elif isinstance(cell_value, date):
-                        cell_value = datetime.combine(cell_value, datetime.min.time())
-                        cell_type = "datetime"
-                    else:
-                        if not cell_value:
-                            cell_type = "blank"
-                        else:
-                            msg = _(
-                                "%(__name__)s, _write_line : programming error "
-                                "detected while processing "
-                                "col_specs_section %(col_specs_section)s, "
-                                "column %(col)s"
-                            ) % {
-                                "__name__": __name__,
-                                "col_specs_section": col_specs_section,
-                                "col": col,
-                            }
-                            if cell_value:
-                                msg += _(", cellvalue %s") % cell_value
-                            raise UserError(msg)
+                    cell_type, cell_value = self._get_cell_type(
+                        cell_value, col_specs_section, col
+                    )
             colspan = cell_spec.get("colspan") or colspan
             args_pos = [row_pos, pos]
             args_data = [cell_value]
@@ -742,6 +826,97 @@ class ReportXlsxAbstract(models.AbstractModel):
 
         return row_pos + 1
 
+    @staticmethod
+    def _get_cell_type(cell_value, col_specs_section, col):
+        """Infer the cell type of a value, return (cell_type, cell_value)."""
+        # test bool first since isinstance(val, int) returns
+        # True when type(val) is bool
+        if isinstance(cell_value, bool):
+            cell_type = "boolean"
+        elif isinstance(cell_value, str):
+            cell_type = "string"
+        elif isinstance(cell_value, int | float):
+            cell_type = "number"
+        elif isinstance(cell_value, datetime):
+            cell_type = "datetime"
+        elif isinstance(cell_value, date):
+            cell_value = datetime.combine(cell_value, datetime.min.time())
+            cell_type = "datetime"
+        else:
+            if not cell_value:
+                cell_type = "blank"
+            else:
+                msg = _(
+                    "%(__name__)s, _write_line : programming error "
+                    "detected while processing "
+                    "col_specs_section %(col_specs_section)s, "
+                    "column %(col)s"
+                ) % {
+                    "__name__": __name__,
+                    "col_specs_section": col_specs_section,
+                    "col": col,
+                }
+                if cell_value:
+                    msg += _(", cellvalue %s") % cell_value
+                raise UserError(msg)
+        return cell_type, cell_value
+
+    def _get_row_writer(
+        self,
+        ws,
+        ws_params,
+        col_specs_section=None,
+        default_format=None,
+        col_specs="col_specs",
+        wanted_list="wanted_list",
+    ):
+        """
+        Compile the col_specs_section entries of the columns included in
+        the 'wanted_list' into a row writer.
+        The rows written with the row writer are identical to those
+        written with _write_line, but the column specifications are
+        only resolved once.
+        """
+        col_specs = ws_params.get(col_specs)
+        wl = ws_params.get(wanted_list) or []
+        cells = []
+        pos = 0
+        for col in wl:
+            if col not in col_specs:
+                raise UserError(
+                    _(
+                        "Programming Error:\n\n"
+                        "The '%s' column is not defined the worksheet "
+                        "column specifications."
+                    )
+                    % col
+                )
+            colspan = col_specs[col].get("colspan") or 1
+            cell_spec = col_specs[col].get(col_specs_section) or {}
+            if not cell_spec:
+                cell_value = None
+                cell_type = "blank"
+                cell_format = default_format
+            else:
+                cell_value = cell_spec.get("value")
+                cell_type = cell_spec.get("type")
+                cell_format = cell_spec.get("format") or default_format
+            colspan = cell_spec.get("colspan") or colspan
+            cells.append(
+                XlsxCellSpec(
+                    col=col,
+                    pos=pos,
+                    last_pos=pos + colspan - 1 if colspan > 1 else None,
+                    value=cell_value,
+                    value_is_code=isinstance(cell_value, CodeType),
+                    cell_type=cell_type,
+                    cell_format=cell_format,
+                    format_is_code=isinstance(cell_format, CodeType),
+                )
+            )
+            pos += colspan
+        return XlsxRowWriter(self, ws, cells, col_specs_section)
+
     @staticmethod
     def _apply_formula_quirk(args_data, cell_type, cell_format):
         """Insert empty value to force LibreOffice to recompute the value"""
@@ -753,7 +928,9 @@ class ReportXlsxAbstract(models.AbstractModel):
 
     @staticmethod
     def _render(code):
-        return compile(code, "<string>", "eval")
+        compiled_code = compile(code, "<string>", "eval")
+        RENDERED_SOURCES[compiled_code] = code
+        return compiled_code
 
     @staticmethod
     def _eval(val, render_space):
@@ -2,9 +2,10 @@
 # Part of Softhealer Technologies.
 from odoo import api, fields, models
 from odoo.exceptions import UserError
-from odoo.http import request
 from datetime import timedelta, date
 
+NOTIFY_BATCH_SIZE = 100
+
 
 class Attachment(models.Model):
     _inherit = 'ir.attachment'
@@ -147,7 +148,7 @@ class PDCWizard(models.Model):
         'paid', 'Paid')], string="Cheque Status", default='draft', tracking=True)
     payment_date = fields.Date(
         "Payment Date", default=fields.Date.today(), required=True, tracking=True)
-    due_date = fields.Date("Due Date", required=True, tracking=True)
+    due_date = fields.Date("Due Date", required=True, tracking=True, index=True)
     memo = fields.Char("Memo", tracking=True)
     agent = fields.Char("Agent", tracking=True)
     bank_id = fields.Many2one('res.bank', string="Bank", tracking=True)
@@ -167,6 +168,8 @@ class PDCWizard(models.Model):
     account_move_ids = fields.Many2many(
         'account.move', compute="compute_account_moves",)
     done_date = fields.Date(string="Done Date", readonly=True, tracking=True)
+    # last day the customer due date notification was sent for the cheque
+    due_notify_date = fields.Date("Due Notification Date", readonly=True, copy=False)
 
     @api.depends('payment_type', 'partner_id')
     def compute_account_moves(self):
@@ -669,75 +672,69 @@ class PDCWizard(models.Model):
     # ==============================
     #    CRON SCHEDULER CUSTOMER
     # ==============================
+    @api.model
+    def _get_due_notify_dates(self, notify_days):
+        # notify on the cheques whose due date is one of the configured days ago
+        today = fields.Date.today()
+        return [today + timedelta(days=int(notify_day)*-1) for notify_day in notify_days if notify_day]
+
     @api.model
     def notify_customer_due_date(self):
-        emails = []
-        if self.env.company.is_cust_due_notify:
-            notify_day_1 = self.env.company.notify_on_1
-            notify_day_2 = self.env.company.notify_on_2
-            notify_day_3 = self.env.company.notify_on_3
-            notify_day_4 = self.env.company.notify_on_4
-            notify_day_5 = self.env.company.notify_on_5
-            notify_date_1 = False
-            notify_date_2 = False
-            notify_date_3 = False
-            notify_date_4 = False
-            notify_date_5 = False
-            if notify_day_1:
-                notify_date_1 = fields.date.today() + timedelta(days=int(notify_day_1)*-1)
-            if notify_day_2:
-                notify_date_2 = fields.date.today() + timedelta(days=int(notify_day_2)*-1)
-            if notify_day_3:
-                notify_date_3 = fields.date.today() + timedelta(days=int(notify_day_3)*-1)
-            if notify_day_4:
-                notify_date_4 = fields.date.today() + timedelta(days=int(notify_day_4)*-1)
-            if notify_day_5:
-                notify_date_5 = fields.date.today() + timedelta(days=int(notify_day_5)*-1)
-
-            records = self.search([('payment_type', '=', 'receive_money')])
-            for user in self.env.company.sh_user_ids:
-                if user.partner_id and user.partner_id.email:
-                    emails.append(user.partner_id.email)
-            email_values = {
-                'email_to': ','.join(emails),
-            }
-            view = self.env.ref("sh_pdc.sh_pdc_payment_form_view",
-                                raise_if_not_found=False).sudo()
-            view_id = view.id if view else 0
-            for record in records:
-                if (record.due_date == notify_date_1
-                    or record.due_date == notify_date_2
-                    or record.due_date == notify_date_3
-                    or record.due_date == notify_date_4
-                        or record.due_date == notify_date_5):
-
-                    if self.env.company.is_notify_to_customer:
-                        # template_download_id = record.env['ir.model.data'].get_object(
-                        #     'sh_pdc', 'sh_pdc_company_to_customer_notification_1'
-                        #     )
-                        template_download_id = self.env.ref(
-                            'sh_pdc.sh_pdc_company_to_customer_notification_1')
-                        _ = record.env['mail.template'].browse(
-                            template_download_id.id
-                        ).send_mail(record.id, email_layout_xmlid='mail.mail_notification_light', force_send=True)
-                    if self.env.company.is_notify_to_user and self.env.company.sh_user_ids:
-                        url = ''
-                        base_url = request.env['ir.config_parameter'].sudo(
-                        ).get_param('web.base.url')
-                        url = base_url + "/web#id=" + \
-                            str(record.id) + \
-                            "&&model=pdc.wizard&view_type=form&view_id=" + \
-                            str(view_id)
-                        ctx = {
-                            "customer_url": url,
-                        }
-                        # template_download_id = record.env['ir.model.data'].get_object(
-                        #     'sh_pdc', 'sh_pdc_company_to_int_user_notification_1'
-                        #     )
-                        template_download_id = self.env.ref(
-                            'sh_pdc.sh_pdc_company_to_int_user_notification_1')
-                        _ = request.env['mail.template'].sudo().browse(template_download_id.id).with_context(ctx).send_mail(
-                            record.id, email_values=email_values, email_layout_xmlid='mail.mail_notification_light', force_send=True)
+        company = self.env.company
+        if not company.is_cust_due_notify:
+            return
+        notify_dates = self._get_due_notify_dates([
+            company.notify_on_1,
+            company.notify_on_2,
+            company.notify_on_3,
+            company.notify_on_4,
+            company.notify_on_5,
+        ])
+        if not notify_dates:
+            return
+
+        emails = [user.partner_id.email for user in company.sh_user_ids if user.partner_id and user.partner_id.email]
+        email_values = {
+            'email_to': ','.join(emails),
+        }
+        view = self.env.ref("sh_pdc.sh_pdc_payment_form_view",
+                            raise_if_not_found=False).sudo()
+        view_id = view.id if view else 0
+        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+        customer_template = self.env.ref(
+            'sh_pdc.sh_pdc_company_to_customer_notification_1')
+        user_template = self.env.ref(
+            'sh_pdc.sh_pdc_company_to_int_user_notification_1').sudo()
+
+        # each batch is marked as notified and committed, a run interrupted
+        # today resumes with the cheques not notified yet
+        today = fields.Date.today()
+        domain = [('payment_type', '=', 'receive_money'),
+                  ('due_date', 'in', notify_dates),
+                  '|', ('due_notify_date', '=', False), ('due_notify_date', '<', today)]
+        remaining = self.search_count(domain)
+        while remaining:
+            records = self.search(domain, order='id', limit=NOTIFY_BATCH_SIZE)
+            if not records:
+                break
+            if company.is_notify_to_customer:
+                customer_template.send_mail_batch(
+                    records.ids, email_layout_xmlid='mail.mail_notification_light', force_send=True)
+            if company.is_notify_to_user and company.sh_user_ids:
+                # the link to the cheque is read from the context by the template
+                mails = self.env['mail.mail'].sudo()
+                for record in records:
+                    url = base_url + "/web#id=" + \
+                        str(record.id) + \
+                        "&&model=pdc.wizard&view_type=form&view_id=" + \
+                        str(view_id)
+                    mails |= user_template.with_context(customer_url=url).send_mail_batch(
+                        record.ids, email_values=email_values, email_layout_xmlid='mail.mail_notification_light')
+                mails.send()
+            records.write({'due_notify_date': today})
+            remaining = max(remaining - len(records), 0)
+            self.env['ir.cron']._notify_progress(done=len(records), remaining=remaining)
+            self.env.cr.commit()
 
     # ==============================
     #    CRON SCHEDULER VENDOR
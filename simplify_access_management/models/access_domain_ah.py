@@ -20,6 +20,22 @@ class access_domain_ah(models.Model):
     write_right = fields.Boolean('Write', help="The set 'Write' access of the selected model for the specified users")
     delete_right = fields.Boolean('Delete', help="The set 'Delete' access of the selected model for the specified users")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super(access_domain_ah, self).create(vals_list)
+        self.env.registry.clear_cache()
+        return res
+
+    def write(self, vals):
+        res = super(access_domain_ah, self).write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super(access_domain_ah, self).unlink()
+        self.env.registry.clear_cache()
+        return res
+
     @api.onchange('apply_domain')
     def _check_domain(self):
         for rec in self:
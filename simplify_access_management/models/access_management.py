@@ -1,6 +1,6 @@
-from odoo import fields, models, api, _
+from odoo import fields, models, api, tools, _
 from odoo.exceptions import UserError
-from odoo.http import request
+from odoo.tools import SQL
 from .query_prepare import search_data
 
 class access_management(models.Model):
@@ -75,7 +75,7 @@ class access_management(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         res = super(access_management, self).create(vals_list)
-        request.registry.clear_cache()
+        self.env.registry.clear_cache()
         for record in res:
             if record.readonly:
                 for user in record.user_ids:
@@ -85,7 +85,7 @@ class access_management(models.Model):
 
     def unlink(self):
         res = super(access_management, self).unlink()
-        request.env.registry.clear_cache()
+        self.env.registry.clear_cache()
         return res
 
     def write(self, vals):
@@ -95,9 +95,31 @@ class access_management(models.Model):
             for user in self.user_ids:
                 if user.has_group('base.group_system') or user.has_group('base.group_erp_manager'):
                     raise UserError(_('Admin user can not be set as a read-only..!'))
-        request.env.registry.clear_cache()
+        self.env.registry.clear_cache()
         return res
 
+    @api.model
+    @tools.ormcache('uid', 'company_id', 'model_name')
+    def _get_guard_domain_ids(self, uid, company_id, model_name):
+        """ Return the ids of the access domain lines guarding create, write
+            and unlink of ``model_name`` for a user in a company.
+        """
+        self._cr.execute(SQL("""
+                        SELECT dm.id
+                        FROM access_domain_ah as dm
+                        JOIN ir_model as im ON im.id = dm.model_id
+                        JOIN access_management as am ON am.id = dm.access_management_id
+                        WHERE im.model = %(model)s AND am.active
+                        AND EXISTS (SELECT 1
+                                    FROM access_management_users_rel_ah as amusr
+                                    WHERE amusr.access_management_id = am.id AND amusr.user_id = %(uid)s)
+                        AND EXISTS (SELECT 1
+                                    FROM access_management_comapnay_rel as amc
+                                    WHERE amc.access_management_id = am.id AND amc.company_id = %(company_id)s)
+                        ORDER BY dm.id
+                        """, model=model_name, uid=uid, company_id=company_id))
+        return tuple(row[0] for row in self._cr.fetchall())
+
     def get_remove_options(self, model):
         
         # restrict_export = self.env['access.management'].sudo().search([('active', '=', True),
@@ -18,3 +18,20 @@ class hide_field(models.Model):
     required = fields.Boolean('Required', help="Selected Field will be set as required for selected model from the defined users.")
     external_link = fields.Boolean('Remove External Link', help="External Link will be hidden for relational fields in selected model from the defined users.")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super(hide_field, self).create(vals_list)
+        # the hidden nodes are resolved once per view in the registry cache
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
+    def write(self, vals):
+        res = super(hide_field, self).write(vals)
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
+    def unlink(self):
+        res = super(hide_field, self).unlink()
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
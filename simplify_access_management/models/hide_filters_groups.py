@@ -22,6 +22,23 @@ class hide_filters_groups(models.Model):
 
     access_management_id = fields.Many2one('access.management', 'Access Management')
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super(hide_filters_groups, self).create(vals_list)
+        # the hidden nodes are resolved once per view in the registry cache
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
+    def write(self, vals):
+        res = super(hide_filters_groups, self).write(vals)
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
+    def unlink(self):
+        res = super(hide_filters_groups, self).unlink()
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
     @api.model
     @api.onchange('model_id')
     def _get_filter_groups(self):
@@ -27,6 +27,23 @@ class hide_view_nodes(models.Model):
 
     access_management_id = fields.Many2one('access.management', 'Access Management')
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super(hide_view_nodes, self).create(vals_list)
+        # the hidden nodes are resolved once per view in the registry cache
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
+    def write(self, vals):
+        res = super(hide_view_nodes, self).write(vals)
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
+    def unlink(self):
+        res = super(hide_view_nodes, self).unlink()
+        self.env.registry.clear_cache('default', 'templates')
+        return res
+
     def _store_btn_data(self, btn, smart_button=False, smart_button_string=False):
         # string_value is used in case of kanban view button store, 
         string_value = 'string_value' in self._context.keys() and self._context['string_value'] or False
@@ -7,6 +7,14 @@ from odoo.tools import SQL, Query
 
 _logger = logging.getLogger(__name__)
 
+# access.domain.ah column granting each ``check()`` mode
+MODE_RIGHT_COLUMNS = {
+    'read': 'read_right',
+    'create': 'create_right',
+    'write': 'write_right',
+    'unlink': 'delete_right',
+}
+
 
 class ir_model_access(models.Model):
     _inherit = 'ir.model.access'
@@ -32,65 +40,16 @@ class ir_model_access(models.Model):
             In case of any record found in access management.
         """
         try:
-            value = self._cr.execute(SQL(
-                """SELECT value from ir_config_parameter where key='uninstall_simplify_access_management' """))
-            value = self._cr.fetchone()
-            if not value:
-                if is_model_exists:
-                
-                    self._cr.execute(SQL("SELECT id FROM ir_model WHERE model='%s'" % model))
-                    model_numeric_id = self._cr.fetchone()[0]
-                    if model_numeric_id and isinstance(model_numeric_id, int) and self.env.user:
-                        self._cr.execute(SQL("""
-                                        SELECT dm.id
-                                        FROM access_domain_ah as dm
-                                        WHERE dm.model_id=%s AND dm.apply_domain AND dm.access_management_id 
-                                        IN (SELECT am.id 
-                                            FROM access_management as am 
-                                            WHERE active='t' AND am.id 
-                                            IN (SELECT amusr.access_management_id
-                                                FROM access_management_users_rel_ah as amusr
-                                                WHERE amusr.user_id=%s))
-                                        """% (model_numeric_id, self.env.user.id)))
-                    
-                        
-                        access_domain_ah_ids = self.env['access.domain.ah'].sudo().browse(
-                            row[0] for row in self._cr.fetchall())
-                        access_domain_ah_ids -= access_domain_ah_ids.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-                        if mode == 'read':
-                            access_domain_ah_ids = access_domain_ah_ids.filtered(lambda x: x.read_right)
-                        elif mode == 'create':
-                            access_domain_ah_ids = access_domain_ah_ids.filtered(lambda x: x.create_right)
-                        elif mode == 'write':
-                            access_domain_ah_ids = access_domain_ah_ids.filtered(lambda x: x.write_right)
-                        elif mode == 'unlink':
-                            access_domain_ah_ids = access_domain_ah_ids.filtered(lambda x: x.delete_right)
-                        if access_domain_ah_ids:
-                            has_access = bool(access_domain_ah_ids)
-            
-                    read_value = True
-                    self._cr.execute(SQL("SELECT state FROM ir_module_module WHERE name='simplify_access_management'"))
-                    data = self._cr.fetchone() or False
-                    if data and data[0] != 'installed':
-                        read_value = False
-                    
+            if is_model_exists and self.env.user:
+                cids = False
+                if request:
                     cids = int(request.httprequest.cookies.get('cids') and request.httprequest.cookies.get('cids').split('-')[0] or request.env.company.id)
-        
-                    if self.env.user.id and read_value and cids:
-                    
-                        self._cr.execute(SQL("""SELECT access_management_id FROM access_management_comapnay_rel WHERE company_id = %s"""% cids))
-                        a = self._cr.fetchall()
-                        if a:
-                            
-                            self._cr.execute(SQL("""SELECT access_management_id FROM access_management_users_rel_ah WHERE user_id = %s AND access_management_id in %s""" % (self.env.user.id,tuple([i[0] for i in a] + [0]))))
-                            a = self._cr.fetchall()
-                            if a:
-                                self._cr.execute(SQL("""SELECT id FROM access_management WHERE active='t' AND id in %s AND readonly = True""", (
-                                    tuple([i[0] for i in a] + [0]))))
-                                a = self._cr.fetchall()
-                        if bool(a):
-                            if mode != 'read':
-                                return False
+                domain_access, readonly = self._sam_check_decision(
+                    self.env.user.id, self.env.company.id, cids, model, mode)
+                if domain_access:
+                    has_access = True
+                if readonly and mode != 'read':
+                    return False
 
         except:
             pass
@@ -99,3 +58,60 @@ class ir_model_access(models.Model):
             raise self._make_access_error(model, mode) from None
 
         return has_access
+
+    @api.model
+    @tools.ormcache('uid', 'company_id', 'cids', 'model', 'mode')
+    def _sam_check_decision(self, uid, company_id, cids, model, mode):
+        """ Compile the access management part of ``check()`` for one user,
+            company and model/mode.
+
+            Returns a tuple ``(domain_access, readonly)``: ``domain_access`` is
+            True when an access domain line grants ``mode`` on ``model``,
+            ``readonly`` is True when a read-only access pack of the cookie
+            company ``cids`` applies to the user.
+
+            The result only depends on access.management, access.domain.ah
+            and their relation tables, whose changes clear the registry cache.
+        """
+        self._cr.execute(SQL(
+            """SELECT value from ir_config_parameter where key='uninstall_simplify_access_management' """))
+        if self._cr.fetchone():
+            return False, False
+
+        right_column = SQL.identifier('dm', MODE_RIGHT_COLUMNS[mode]) if mode in MODE_RIGHT_COLUMNS else SQL('TRUE')
+        self._cr.execute(SQL("""
+                        SELECT 1
+                        FROM access_domain_ah as dm
+                        JOIN ir_model as im ON im.id = dm.model_id
+                        JOIN access_management as am ON am.id = dm.access_management_id
+                        WHERE im.model = %(model)s AND dm.apply_domain AND am.active AND %(right)s
+                        AND EXISTS (SELECT 1
+                                    FROM access_management_users_rel_ah as amusr
+                                    WHERE amusr.access_management_id = am.id AND amusr.user_id = %(uid)s)
+                        AND (am.is_apply_on_without_company
+                             OR EXISTS (SELECT 1
+                                        FROM access_management_comapnay_rel as amc
+                                        WHERE amc.access_management_id = am.id AND amc.company_id = %(company_id)s))
+                        LIMIT 1
+                        """, model=model, right=right_column, uid=uid, company_id=company_id))
+        domain_access = bool(self._cr.fetchone())
+
+        readonly = False
+        self._cr.execute(SQL("SELECT state FROM ir_module_module WHERE name='simplify_access_management'"))
+        data = self._cr.fetchone() or False
+        if cids and not (data and data[0] != 'installed'):
+            self._cr.execute(SQL("""
+                            SELECT 1
+                            FROM access_management as am
+                            WHERE am.active AND am.readonly
+                            AND EXISTS (SELECT 1
+                                        FROM access_management_comapnay_rel as amc
+                                        WHERE amc.access_management_id = am.id AND amc.company_id = %(cids)s)
+                            AND EXISTS (SELECT 1
+                                        FROM access_management_users_rel_ah as amusr
+                                        WHERE amusr.access_management_id = am.id AND amusr.user_id = %(uid)s)
+                            LIMIT 1
+                            """, cids=cids, uid=uid))
+            readonly = bool(self._cr.fetchone())
+
+        return domain_access, readonly
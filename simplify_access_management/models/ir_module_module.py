@@ -4,6 +4,13 @@ class ir_module_module(models.Model):
     _inherit = "ir.module.module"
 
 
+    def write(self, vals):
+        res = super(ir_module_module, self).write(vals)
+        if 'state' in vals:
+            # module states are part of the compiled access management rules
+            self.env.registry.clear_cache()
+        return res
+
     def button_immediate_uninstall(self):
         config_parameter_obj = self.env['ir.config_parameter'].sudo()
         if self.name == 'simplify_access_management':
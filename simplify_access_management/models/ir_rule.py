@@ -11,6 +11,9 @@ from odoo.tools import SQL, Query
 from dateutil.relativedelta import relativedelta
 from odoo.addons.advanced_web_domain_widget.models.domain_prepare import prepare_domain_v2,compute_domain
 
+# per worker counters of the compiled access management rules
+RULE_CACHE_STATS = {'calls': 0, 'misses': 0}
+
 class ir_rule(models.Model):
     _inherit = 'ir.rule'
 
@@ -23,103 +26,126 @@ class ir_rule(models.Model):
     def _compute_domain(self, model_name, mode="read"):
         res = super(ir_rule, self)._compute_domain(model_name, mode)
 
-        read_value = True
-        self._cr.execute(SQL("SELECT state FROM ir_module_module WHERE name='simplify_access_management'"))
-        data = self._cr.fetchone() or False
-
-        self._cr.execute(SQL("SELECT id FROM ir_module_module WHERE state IN ('to upgrade', 'to remove','to install')"))
-        all_data = self._cr.fetchone() or False
-
-        if data and data[0] != 'installed':
-            read_value = False
+        installed, pending_operation, uninstalling = self._sam_module_status()
         model_list = ['mail.activity', 'res.users.log', 'res.users', 'mail.channel', 'mail.alias', 'bus.presence',
                       'res.lang']
 
-        if self.env.user.id and read_value and not all_data:
-            if model_name not in model_list:
-                self._cr.execute(SQL("""SELECT am.id FROM access_management as am
-                                    WHERE active='t' AND readonly = True AND am.id 
-                                    IN (SELECT au.access_management_id 
-                                        FROM access_management_users_rel_ah as au 
-                                        WHERE user_id = %s AND am.id 
-                                        IN (SELECT ac.access_management_id
-                                            FROM access_management_comapnay_rel as ac)) """ % (self.env.user.id))) 
-                
-                a = self._cr.fetchall()
-                if bool(a):
-                    if mode != 'read' and model_name not in ['mail.channel.partner']:
-                        raise UserError(
-                            _('%s is a read-only user. So you can not make any changes in the system!') % self.env.user.name)
-        value = self._cr.execute(SQL(
+        if not self.env.user.id or not installed:
+            return res
+        RULE_CACHE_STATS['calls'] += 1
+        readonly, domains = self._sam_rule_data(self.env.user.id, self.env.company.id, model_name)
+        if uninstalling or not (model_name and model_name in self.env):
+            domains = ()
+
+        if readonly and not pending_operation and model_name not in model_list:
+            if mode != 'read' and model_name not in ['mail.channel.partner']:
+                raise UserError(
+                    _('%s is a read-only user. So you can not make any changes in the system!') % self.env.user.name)
+
+        if domains:
+            domain_list = []
+            if model_name == 'res.partner':
+                # jo aya user related jetala partner 6 ana access alag thi apididha 6 error no ave atle
+                self._cr.execute(SQL("""SELECT partner_id FROM res_users"""))
+                partner_ids = [row[0] for row in self._cr.fetchall()]
+                domain_list = ['|', ('id', 'in', partner_ids)]
+            eval_context = self._eval_context()
+            # only domain records
+            length = len(domains)
+
+            for domain in domains:
+                dom = safe_eval(domain, eval_context) if domain else []
+                if not dom and isinstance(dom,list):
+                    if length>1:
+                        domain_list.insert(0,'|')
+                    domain_list += [('id', '!=', False)]
+                    length -= 1
+
+                if dom:
+                    dom = expression.normalize_domain(dom)
+                    for dom_tuple in dom:
+                        if isinstance(dom_tuple, tuple):
+                            compute_domain(dom_tuple,model_name)
+                            operator_value = dom_tuple[1]
+
+                            if operator_value == 'date_filter':
+                                domain_list += prepare_domain_v2(dom_tuple)
+
+                            else:
+                                domain_list.append(dom_tuple)
+                        else:
+                            domain_list.append(dom_tuple)
+                    if length > 1:
+                        domain_list.insert(0, '|')
+                        length -= 1
+            if domain_list:
+                return domain_list
+
+        return res
+
+    @api.model
+    @tools.ormcache()
+    def _sam_module_status(self):
+        """ Return ``(installed, pending_operation, uninstalling)`` for this
+            module, shared by every user of the registry.
+        """
+        self._cr.execute(SQL("SELECT state FROM ir_module_module WHERE name='simplify_access_management'"))
+        data = self._cr.fetchone() or False
+        self._cr.execute(SQL("SELECT id FROM ir_module_module WHERE state IN ('to upgrade', 'to remove','to install') LIMIT 1"))
+        all_data = self._cr.fetchone() or False
+        self._cr.execute(SQL(
             """SELECT value from ir_config_parameter where key='uninstall_simplify_access_management' """))
         value = self._cr.fetchone()
-        if not value:
-            value = self._cr.execute(SQL("""select state from ir_module_module where name = 'simplify_access_management'"""))
-            value = self._cr.fetchone()
-            value = value and value[0] or False
-            if model_name and model_name in self.env and value == 'installed':
-                # if model_name:
-                self._cr.execute(SQL("SELECT id FROM ir_model WHERE model='%s'" % model_name))
-                model_numeric_id = self._cr.fetchone()
-                model_numeric_id = model_numeric_id and model_numeric_id[0] or False
-                if model_numeric_id and isinstance(model_numeric_id, int) and self.env.user:
-                    try:
-                        self._cr.execute(SQL("""
-                                        SELECT dm.id
-                                        FROM access_domain_ah as dm
-                                        WHERE dm.model_id=%s AND dm.apply_domain AND dm.access_management_id 
-                                        IN (SELECT am.id 
-                                            FROM access_management as am 
-                                            WHERE active='t' AND am.id 
-                                            IN (SELECT amusr.access_management_id
-                                                FROM access_management_users_rel_ah as amusr
-                                                WHERE amusr.user_id=%s))
-                                        """% (model_numeric_id, self.env.user.id)))
-                    
-                        access_domain_ah_ids = self.env['access.domain.ah'].sudo().browse(
-                            row[0] for row in self._cr.fetchall())
-                        
-                        access_domain_ah_ids -= access_domain_ah_ids.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-                    # access_domain_ah_ids = access_domain_ah_ids.filtered(lambda line: self.env.company in line.access_management_id.company_ids)
-                    except:
-                        access_domain_ah_ids = False
-                    if access_domain_ah_ids:
-                        domain_list = []
-                        if model_name == 'res.partner':
-                            # jo aya user related jetala partner 6 ana access alag thi apididha 6 error no ave atle
-                            self._cr.execute(SQL("""SELECT partner_id FROM res_users"""))
-                            partner_ids = [row[0] for row in self._cr.fetchall()]
-                            domain_list = ['|', ('id', 'in', partner_ids)]
-                        eval_context = self._eval_context()
-                        # only domain records
-                        length = len(access_domain_ah_ids.sudo()) if access_domain_ah_ids.sudo() else 0
-                        
-                        for access in access_domain_ah_ids.sudo():
-                            dom = safe_eval(access.domain, eval_context) if access.domain else []
-                            if not dom and isinstance(dom,list):
-                                if length>1:
-                                    domain_list.insert(0,'|')
-                                domain_list += [('id', '!=', False)]
-                                length -= 1
-                        
-                            if dom:
-                                dom = expression.normalize_domain(dom)
-                                for dom_tuple in dom:
-                                    if isinstance(dom_tuple, tuple):
-                                        compute_domain(dom_tuple,model_name)
-                                        operator_value = dom_tuple[1]
-
-                                        if operator_value == 'date_filter':
-                                            domain_list += prepare_domain_v2(dom_tuple)
-                                           
-                                        else:
-                                            domain_list.append(dom_tuple)
-                                    else:
-                                        domain_list.append(dom_tuple)
-                                if length > 1:
-                                    domain_list.insert(0, '|')
-                                    length -= 1
-                        if domain_list:
-                            return domain_list
+        return bool(data and data[0] == 'installed'), bool(all_data), bool(value)
 
-        return res
+    @api.model
+    @tools.ormcache('uid', 'company_id', 'model_name')
+    def _sam_rule_data(self, uid, company_id, model_name):
+        """ Compile the access management layer of the record rules of
+            ``model_name`` for a user in a company.
+
+            Returns ``(readonly, domains)`` where ``domains`` is the tuple of
+            the raw domains of the applicable access domain lines, evaluated
+            by ``_compute_domain()`` against the rule evaluation context.
+        """
+        RULE_CACHE_STATS['misses'] += 1
+        self._cr.execute(SQL("""SELECT am.id FROM access_management as am
+                            WHERE active='t' AND readonly = True AND am.id 
+                            IN (SELECT au.access_management_id 
+                                FROM access_management_users_rel_ah as au 
+                                WHERE user_id = %s AND am.id 
+                                IN (SELECT ac.access_management_id
+                                    FROM access_management_comapnay_rel as ac)) LIMIT 1""", uid))
+        readonly = bool(self._cr.fetchone())
+
+        self._cr.execute(SQL("""
+                        SELECT dm.domain
+                        FROM access_domain_ah as dm
+                        JOIN ir_model as im ON im.id = dm.model_id
+                        JOIN access_management as am ON am.id = dm.access_management_id
+                        WHERE im.model = %(model)s AND dm.apply_domain AND am.active
+                        AND EXISTS (SELECT 1
+                                    FROM access_management_users_rel_ah as amusr
+                                    WHERE amusr.access_management_id = am.id AND amusr.user_id = %(uid)s)
+                        AND (am.is_apply_on_without_company
+                             OR EXISTS (SELECT 1
+                                        FROM access_management_comapnay_rel as amc
+                                        WHERE amc.access_management_id = am.id AND amc.company_id = %(company_id)s))
+                        ORDER BY dm.id
+                        """, model=model_name, uid=uid, company_id=company_id))
+        domains = tuple(row[0] or '' for row in self._cr.fetchall())
+        return readonly, domains
+
+    @api.model
+    def _sam_rule_cache_stats(self):
+        """ Return the hit/miss counters of the compiled access management
+            rules of this worker.
+        """
+        calls = RULE_CACHE_STATS['calls']
+        misses = RULE_CACHE_STATS['misses']
+        return {
+            'calls': calls,
+            'hits': calls - misses,
+            'misses': misses,
+            'ratio': calls and 100.0 * (calls - misses) / calls,
+        }
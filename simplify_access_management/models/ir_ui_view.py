@@ -1,4 +1,5 @@
-from odoo import models, SUPERUSER_ID, _
+from odoo import models, tools, SUPERUSER_ID, _
+from odoo.tools.misc import frozendict
 from odoo.tools.translate import _
 from odoo.http import request
 import ast
@@ -7,54 +8,112 @@ from .query_prepare import search_data
 class ir_ui_view(models.Model):
     _inherit = 'ir.ui.view'
 
+    def _sam_hide_set(self, model_name):
+        """ Return the hidden nodes of ``model_name`` for the current user,
+            resolved once per view instead of once per arch node.
+        """
+        return self._sam_get_hide_set(self[:1].id, model_name, self.env.uid, self.env.company.id, self.env.lang)
+
+    @tools.ormcache('view_id', 'model_name', 'uid', 'company_id', 'lang')
+    def _sam_get_hide_set(self, view_id, model_name, uid, company_id, lang):
+        """ Collect every hide.field, hide.view.nodes and hide.filters.groups
+            line of ``model_name`` applying to the user into lookup sets,
+            keyed by the attribute compared by the ``_postprocess_tag_*``
+            hooks below.
+        """
+        # field name: (external_link, invisible, readonly, required)
+        hidden_fields = {}
+        hidden_labels = set()
+        for hide_field in search_data(self, 'hide.field', model_name) or []:
+            for field_id in hide_field.field_id:
+                flags = hidden_fields.get(field_id.name, (False, False, False, False))
+                hidden_fields[field_id.name] = (
+                    flags[0] or hide_field.external_link,
+                    flags[1] or hide_field.invisible,
+                    flags[2] or hide_field.readonly,
+                    flags[3] or hide_field.required,
+                )
+                hidden_labels.add((field_id.name, field_id.field_description))
+
+        buttons = set()
+        page_strings = set()
+        page_names = set()
+        links = set()
+        settings_keys = set()
+        hide_nodes = search_data(self, 'hide.view.nodes', model_name) or self.env['hide.view.nodes']
+        view = self.browse(view_id)
+        for btn in hide_nodes.mapped('btn_store_model_nodes_ids'):
+            buttons.add(btn.attribute_name)
+        for tab in hide_nodes.mapped('page_store_model_nodes_ids'):
+            settings_keys.add(tab.attribute_name)
+            attribute_string = tab.attribute_string
+            if view and tab.lang_code != lang:
+                field = self.env['ir.ui.view']._fields['arch_db']
+                translation_dictionary = field.get_translation_dictionary(
+                    view.with_context(lang=tab.lang_code).arch_db,
+                    {lang: view.with_context(lang=lang)['arch_db']})
+                attribute_string = translation_dictionary.get(attribute_string, {}).get(lang)
+                if not attribute_string and tab.attribute_name:
+                    page_names.add(tab.attribute_name)
+            # pages without string must not match a missing translation
+            if attribute_string:
+                page_strings.add(attribute_string)
+        for link in hide_nodes.mapped('link_store_model_nodes_ids'):
+            links.add(_(link.attribute_name))
+
+        filters = set()
+        for hide_filter_group in search_data(self, 'hide.filters.groups', model_name) or []:
+            filters.update(hide_filter_group.filters_store_model_nodes_ids.mapped('attribute_name'))
+            filters.update(hide_filter_group.groups_store_model_nodes_ids.mapped('attribute_name'))
+
+        return frozendict({
+            'fields': frozendict(hidden_fields),
+            'labels': frozenset(hidden_labels),
+            'buttons': frozenset(buttons),
+            'page_strings': frozenset(page_strings),
+            'page_names': frozenset(page_names),
+            'links': frozenset(links),
+            'settings_keys': frozenset(settings_keys),
+            'filters': frozenset(filters),
+        })
+
     def _postprocess_tag_field(self, node, name_manager, node_info):
         super()._postprocess_tag_field(node, name_manager, node_info)
         try:
-            # hide_field_obj = self.env['hide.field'].sudo()
-            # hide_fields = hide_field_obj.search(
-            #             [('model_id.model', '=', name_manager.model._name), ('access_management_id.active', '=', True),
-            #              ('access_management_id.user_ids', 'in', request.env.uid)])
-            
-            # hide_fields -= hide_fields.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-
-            hide_fields = search_data(self, 'hide.field', name_manager.model._name)
-            if node.tag == 'field' or node.tag == 'label':
-                for hide_field in hide_fields:
-                    for field_id in hide_field.field_id:
-                        # print(node.get('name'), '\n')
-                        if (node.tag == 'field' and node.get('name') == field_id.name) or (
-                                node.tag == 'label' and 'for' in node.attrib.keys() and node.attrib[
-                            'for'] == field_id.name):
-                            # if node.tag == 'field':
-                            if hide_field.external_link:
-                                options_dict = {}
-                                if 'widget' in node.attrib.keys():
-                                    if node.attrib['widget'] == 'product_configurator' or node.attrib['widget'] == 'many2one_avatar_user':
-                                        del node.attrib['widget']
-                                        
-                                if 'options' in node.attrib.keys():
-                                    options_dict = ast.literal_eval(node.attrib['options'])
-                                    options_dict.update({"no_edit": True, "no_create": True, "no_open": True})
-                                    node.attrib['options'] = str(options_dict)
-                                else:
-                                    # node.attrib.update({'can_create': 'false', 'can_write': 'false','no_open':'true'})
-                                    options_dict.update({'no_create': True, 'no_edit': True,'no_open': True})
-                                    node.attrib['options'] = str(options_dict)
-                                    
-                                # node.attrib.update({'can_create': 'false', 'can_write': 'false','no_open':'true'})
-                                    
-                            if hide_field.invisible:
-                                node_info['column_invisible'] = True
-                                node.set('column_invisible', 'True')
-                                node_info['invisible'] = True
-                                node.set('invisible', '1')
-                            if hide_field.readonly:
-                                node_info['readonly'] = True
-                                node.set('readonly', '1')
-                                node.set('force_save', '1')
-                            if hide_field.required:
-                                node_info['required'] = True
-                                node.set('required', '1')
+            hidden_fields = self._sam_hide_set(name_manager.model._name)['fields']
+            flags = False
+            if node.tag == 'field':
+                flags = hidden_fields.get(node.get('name'))
+            elif node.tag == 'label' and 'for' in node.attrib.keys():
+                flags = hidden_fields.get(node.attrib['for'])
+            if flags:
+                external_link, invisible, readonly, required = flags
+                if external_link:
+                    options_dict = {}
+                    if 'widget' in node.attrib.keys():
+                        if node.attrib['widget'] == 'product_configurator' or node.attrib['widget'] == 'many2one_avatar_user':
+                            del node.attrib['widget']
+
+                    if 'options' in node.attrib.keys():
+                        options_dict = ast.literal_eval(node.attrib['options'])
+                        options_dict.update({"no_edit": True, "no_create": True, "no_open": True})
+                        node.attrib['options'] = str(options_dict)
+                    else:
+                        options_dict.update({'no_create': True, 'no_edit': True,'no_open': True})
+                        node.attrib['options'] = str(options_dict)
+
+                if invisible:
+                    node_info['column_invisible'] = True
+                    node.set('column_invisible', 'True')
+                    node_info['invisible'] = True
+                    node.set('invisible', '1')
+                if readonly:
+                    node_info['readonly'] = True
+                    node.set('readonly', '1')
+                    node.set('force_save', '1')
+                if required:
+                    node_info['required'] = True
+                    node.set('required', '1')
 
         except Exception:
             pass
@@ -65,23 +124,7 @@ class ir_ui_view(models.Model):
         if postprocessor:
             super(ir_ui_view, self)._postprocess_tag_button(node, name_manager, node_info)
 
-        hide = None
-        # hide_button_obj = self.env['hide.view.nodes']
-        # hide_button_ids = hide_button_obj.sudo().search(
-        #     [('model_id.model', '=', name_manager.model._name), ('access_management_id.active', '=', True),
-        #      ('access_management_id.user_ids', 'in', request.env.uid)])
-        
-        # hide_button_ids -= hide_button_ids.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-        hide_button_ids = search_data(self, 'hide.view.nodes', name_manager.model._name)
-        # Filtered with same env user and current model
-        btn_store_model_nodes_ids = hide_button_ids.mapped('btn_store_model_nodes_ids') if hide_button_ids else False
-        # translation_obj = self.env['ir.translation']
-        if btn_store_model_nodes_ids:
-            for btn in btn_store_model_nodes_ids:
-                if btn.attribute_name == node.get('name'):
-                    hide = [btn]
-                    break
-        if hide:
+        if node.get('name') in self._sam_hide_set(name_manager.model._name)['buttons']:
             node.set('invisible', '1')
             if 'attrs' in node.attrib.keys() and node.attrib['attrs']:
                 del node.attrib['attrs']
@@ -95,33 +138,8 @@ class ir_ui_view(models.Model):
         if postprocessor:
             super(ir_ui_view, self)._postprocess_tag_page(node, name_manager, node_info)
 
-        hide = None
-        # hide_tab_obj = self.env['hide.view.nodes']
-        # hide_tab_ids = hide_tab_obj.sudo().search([('model_id.model', '=', name_manager.model._name),
-        #                                            ('access_management_id.active', '=', True),
-        #                                            ('access_management_id.user_ids', 'in', request.env.uid)])
-        
-        # hide_tab_ids -= hide_tab_ids.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-        hide_tab_ids = search_data(self, 'hide.view.nodes', name_manager.model._name)
-        page_store_model_nodes_ids = hide_tab_ids.mapped('page_store_model_nodes_ids') if hide_tab_ids else False
-        if page_store_model_nodes_ids:
-
-            for tab in page_store_model_nodes_ids:
-                attribute_string = tab.attribute_string
-                if tab.lang_code != self.env.lang:
-                    field = self.env['ir.ui.view']._fields['arch_db']
-                    translation_dictionary = field.get_translation_dictionary(
-                        self.with_context(lang=tab.lang_code).arch_db,
-                        {self.env.lang: self.with_context(lang=self.env.lang)['arch_db']})
-                    attribute_string = translation_dictionary[attribute_string][self.env.lang]
-                    if not attribute_string:
-                        if tab.attribute_name == node.attrib.get('name'):
-                            hide = [tab]
-                            break
-                if attribute_string == node.get('string'):
-                    hide = [tab]
-                    break
-        if hide:
+        hide_set = self._sam_hide_set(name_manager.model._name)
+        if node.get('string') in hide_set['page_strings'] or node.attrib.get('name') in hide_set['page_names']:
             node.set('invisible', '1')
             if 'attrs' in node.attrib.keys() and node.attrib['attrs']:
                 del node.attrib['attrs']
@@ -136,21 +154,7 @@ class ir_ui_view(models.Model):
         if postprocessor:
             super(ir_ui_view, self)._postprocess_tag_page(node, name_manager, node_info)
 
-        hide = None
-        # hide_tab_obj = self.env['hide.view.nodes']
-        # hide_tab_ids = hide_tab_obj.sudo().search([('model_id.model', '=', name_manager.model._name),
-        #                                            ('access_management_id.active', '=', True),
-        #                                            ('access_management_id.user_ids', 'in', request.env.uid)])
-        
-        # hide_tab_ids -= hide_tab_ids.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-        hide_tab_ids = search_data(self, 'hide.view.nodes', name_manager.model._name)
-        link_store_model_nodes_ids = hide_tab_ids.mapped('link_store_model_nodes_ids') if hide_tab_ids else False
-        if link_store_model_nodes_ids:
-            for link in link_store_model_nodes_ids:
-                if _(link.attribute_name) == node.get('name'):
-                    hide = [link]
-                    break
-        if hide:
+        if node.get('name') in self._sam_hide_set(name_manager.model._name)['links']:
             node.set('invisible', '1')
             if 'attrs' in node.attrib.keys() and node.attrib['attrs']:
                 del node.attrib['attrs']
@@ -165,27 +169,10 @@ class ir_ui_view(models.Model):
         if postprocessor:
             super(ir_ui_view, self)._postprocess_tag_page(node, name_manager, node_info)
 
-        # hide_button_obj = self.env['hide.view.nodes']
-        # setting_tabs = hide_button_obj.sudo().search([('model_id.model', '=', name_manager.model._name),
-        #                                                ('access_management_id.active', '=', True),
-        #                                                ('access_management_id.user_ids', 'in', request.env.uid)])
-        
-        # setting_tabs -= setting_tabs.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-        setting_tabs = search_data(self, 'hide.view.nodes', name_manager.model._name)
         if name_manager.model._name == 'res.config.settings' and node.tag == 'app' and node.get('string'):
-            setting_tabs = setting_tabs.mapped('page_store_model_nodes_ids') if setting_tabs else False
-            for setting_tab in setting_tabs:
-                attribute_string = setting_tab.attribute_string
-                if setting_tab.lang_code != self.env.lang:
-                    field = self.env['ir.ui.view']._fields['arch_db']
-                    translation_dictionary = field.get_translation_dictionary(
-                        self.with_context(lang=setting_tab.lang_code).arch_db,
-                        {self.env.lang: self.with_context(lang=self.env.lang)['arch_db']})
-                    attribute_string = translation_dictionary[attribute_string][self.env.lang]
-                if node.get('data-key') == setting_tab.attribute_name:
-                    # if node.get('string') == attribute_string and node.get('data-key') == setting_tab.attribute_name:
-                    node_info['invisible'] = True
-                    node.set('invisible', '1')
+            if node.get('data-key') in self._sam_hide_set(name_manager.model._name)['settings_keys']:
+                node_info['invisible'] = True
+                node.set('invisible', '1')
 
         return None
 
@@ -196,44 +183,17 @@ class ir_ui_view(models.Model):
             super(ir_ui_view, self)._postprocess_tag_page(node, name_manager, node_info)
 
         if node.tag == 'filter' or node.tag == 'group':
-
-            # hide_filter_group_obj = self.env['hide.filters.groups'].sudo().search(
-            #     [('model_id.model', '=', name_manager.model._name), ('access_management_id.active', '=', True),
-            #      ('access_management_id.user_ids', 'in', request.env.uid)])
-            
-            # hide_filter_group_obj -= hide_filter_group_obj.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-            hide_filter_group_obj = search_data(self, 'hide.filters.groups', name_manager.model._name)
-            if hide_filter_group_obj:
-                for hide_field_obj in hide_filter_group_obj:
-                    for hide_filter in hide_field_obj.filters_store_model_nodes_ids.mapped('attribute_name'):
-                        if hide_filter == node.get('name', False):
-                            node_info['invisible'] = True
-                            node.set('invisible', '1')
-                    for hide_field_obj in hide_filter_group_obj:
-                        for hide_filter in hide_field_obj.groups_store_model_nodes_ids.mapped('attribute_name'):
-                            if hide_filter == node.get('name', False):
-                                node_info['invisible'] = True
-                                node.set('invisible', '1')
+            if node.get('name', False) in self._sam_hide_set(name_manager.model._name)['filters']:
+                node_info['invisible'] = True
+                node.set('invisible', '1')
         return None
         
     def _postprocess_tag_label(self, node, name_manager, node_info):
         postprocessor = getattr(super(ir_ui_view, self), '_postprocess_tag_label', False)
-        hide_field_obj = self.env['hide.field'].sudo()
         if postprocessor:
             super(ir_ui_view, self)._postprocess_tag_label(node, name_manager, node_info)
             if node.get('for'):
-                # hide_lable = hide_field_obj.search([('model_id.model','=',name_manager.model._name),
-                #                                     ('access_management_id.active','=',True),
-                #                                     ('access_management_id.user_ids','in',request.env.uid)])
-                
-                # hide_lable -= hide_lable.filtered(lambda x: x.access_management_id.is_apply_on_without_company == False and self.env.company.id not in x.access_management_id.company_ids.ids)
-                hide_lable = search_data(self, 'hide.field', name_manager.model._name)
-                if hide_lable:
-                    for hide_field in hide_lable:
-                        for field_id in hide_field.field_id:
-                            if node.get('for') == field_id.name and node.get('string') == field_id.field_description:
-                                node_info['invisible'] = True
-                                node.set('invisible', '1')
-
-            
-
+                hidden_labels = self._sam_hide_set(name_manager.model._name)['labels']
+                if (node.get('for'), node.get('string')) in hidden_labels:
+                    node_info['invisible'] = True
+                    node.set('invisible', '1')
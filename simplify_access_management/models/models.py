@@ -336,106 +336,64 @@ class BaseModel(models.AbstractModel):
 
     def _get_access_management_domain_record(self, model=False):
         records = None
-        try:
-            if model:
-                self._cr.execute(SQL("SELECT id FROM ir_model WHERE model='%s'" % model))
-                model_numeric_id = self._cr.fetchone()[0]
-                if model_numeric_id and isinstance(model_numeric_id, int) and self.env.user:
-                    self._cr.execute(SQL("""
-                                    SELECT dm.id
-                                    FROM access_domain_ah as dm
-                                    WHERE dm.model_id=%s AND dm.access_management_id 
-                                    IN (SELECT am.id 
-                                        FROM access_management as am 
-                                        WHERE am.active='t' AND am.id 
-                                        IN (SELECT amusr.access_management_id
-                                            FROM access_management_users_rel_ah as amusr
-                                            WHERE amusr.user_id=%s))
-                                    """% (model_numeric_id, self.env.user.id)))
-                    records = self.env['access.domain.ah'].sudo().browse(row[0] for row in self._cr.fetchall())
-        except:
-            pass
+        if model and self.env.user:
+            domain_ids = self.env['access.management']._get_guard_domain_ids(
+                self.env.user.id, self.env.company.id, model)
+            if domain_ids:
+                records = self.env['access.domain.ah'].sudo().browse(domain_ids)
         return records
 
+    def _is_access_management_uninstalling(self):
+        return self.env['ir.rule']._sam_module_status()[2]
+
     def _check_access_management_right(self, mode=False, records=False):
-        access_flag = False
+        """ Check ``mode`` on the whole recordset against the access domain
+            lines ``records``.
+
+            Returns the records which are not allowed, along with the name of
+            the access rule to report.
+        """
         access_rule = None
-        length = len(records.sudo()) if records.sudo() else 0
-        partner_ids = self.env['res.users'].sudo().search([]).mapped("partner_id.id")
-        partner_domain = ['|', ('id', 'in', partner_ids)]
+        denied = self
         for record in records.sudo():
-            if mode == 'create' and record.create_right:
-                access_flag = True
-                break
-            elif mode in ['write', 'unlink']:
-                access = False
-                if mode == 'unlink':
-                    access = record.delete_right
-                elif mode == 'write':
-                    access = record.write_right
-
-                domain_list = []
-                # eval_context = rec._eval_context()
-                if self.sudo()._name == "res.partner":
-                    domain_list += partner_domain
-                dom = safe_eval(record.domain) if record.domain else []
-                if dom:
-                    dom = expression.normalize_domain(dom)
-                    model_name = self._name
-                    if isinstance(dom, list):
-                        for dom_tuple in dom:
-                            if isinstance(dom_tuple, tuple):
-                                compute_domain(dom_tuple, model_name)
-                                operator_value = dom_tuple[1]
-                                # left_value = dom_tuple[0]
-                                # operator_value = dom_tuple[1]
-                                # right_value = dom_tuple[2]
-                                # left_value_split_list = left_value.split('.')
-                                # model_string = model_name
-                                # left_user = False
-                                # left_company = False
-                                # for field in left_value_split_list:
-                                #     left_user = False
-                                #     left_company = False
-                                #     model_obj = self.env[model_string]
-                                #     field_type = model_obj.fields_get()[field]['type']
-                                #     if field_type in ['many2one', 'many2many', 'one2many']:
-                                #         field_relation = model_obj.fields_get()[field]['relation']
-                                #         model_string = field_relation
-                                #         if model_string == 'res.users':
-                                #             left_user = True
-                                #         if model_string == 'res.company':
-                                #             left_company = True
-
-                                # if left_user:
-                                #     if operator_value in ['in', 'not in']:
-                                #         if isinstance(right_value, list) and 0 in right_value:
-                                #             zero_index = right_value.index(0)
-                                #             right_value[zero_index] = self.env.user.id
-
-                                # if left_company:
-                                #     if operator_value in ['in', 'not in']:
-                                #         if isinstance(right_value, list) and 0 in right_value:
-                                #             zero_index = right_value.index(0)
-                                #             right_value[zero_index] = self.env.company.id
-                                already_add = False
-                                if operator_value == 'date_filter':
-                                    domain_list += prepare_domain_v2(dom_tuple)
-                                else:
-                                    domain_list.append(dom_tuple)
+            access_rule = record.access_management_id.name
+            if mode == 'create':
+                if record.create_right:
+                    return {'access_flag': True, 'denied': self.browse(), 'access_rule': access_rule}
+                continue
+            access = record.delete_right if mode == 'unlink' else record.write_right
+            if not access or not denied:
+                continue
+
+            domain_list = []
+            # eval_context = rec._eval_context()
+            if self.sudo()._name == "res.partner":
+                # the partners of the active users are always allowed
+                users = self.env['res.users'].sudo().search_fetch([('partner_id', 'in', denied.ids)], ['partner_id'])
+                domain_list += ['|', ('id', 'in', users.partner_id.ids)]
+            dom = safe_eval(record.domain) if record.domain else []
+            if dom:
+                dom = expression.normalize_domain(dom)
+                model_name = self._name
+                if isinstance(dom, list):
+                    for dom_tuple in dom:
+                        if isinstance(dom_tuple, tuple):
+                            compute_domain(dom_tuple, model_name)
+                            operator_value = dom_tuple[1]
+                            if operator_value == 'date_filter':
+                                domain_list += prepare_domain_v2(dom_tuple)
                             else:
                                 domain_list.append(dom_tuple)
-                    # domain_list.append(dom)
-                search_domain = domain_list
-                if 'active' in self._fields:
-                    search_domain = ['|', ('active', '=', False), ('active', '=', True)] + search_domain
-                record_ids = self.search(search_domain)
-
-                if self in record_ids and access:
-                    access_flag = access
-                    break
-            access_rule = record.access_management_id.name
-        return {'access_flag': access_flag, 'access_rule': access_rule}
+                        else:
+                            domain_list.append(dom_tuple)
+            search_domain = domain_list
+            if 'active' in self._fields:
+                search_domain = ['|', ('active', '=', False), ('active', '=', True)] + search_domain
+            # one search for the whole recordset instead of one per record
+            denied -= self.search(expression.AND([[('id', 'in', denied.ids)], search_domain]))
+        if mode == 'create':
+            return {'access_flag': False, 'denied': self, 'access_rule': access_rule}
+        return {'access_flag': not denied, 'denied': denied, 'access_rule': access_rule}
 
     def _display_access_management_error(self, mode=None, rule=None):
         if mode and rule:
@@ -458,41 +416,24 @@ class BaseModel(models.AbstractModel):
 {resolution_info}""".format(operation_error=operation_error, resolution_info=resolution_info)
             raise AccessError(msg)
 
-    def unlink(self):
-        value = self.env['ir.config_parameter'].sudo().search([('key', '=', 'uninstall_simplify_access_management')],
-                                                              limit=1).value
-        if not value:
-            for rec in self:
-                if rec._name:
-                    access_domain_ah_ids = rec._get_access_management_domain_record(model=rec._name)
-                    if access_domain_ah_ids:
-                        access_domain_ah_ids = access_domain_ah_ids.filtered(
-                            lambda line: self.env.company in line.access_management_id.company_ids)
-                    if access_domain_ah_ids:
-                        flag = rec._check_access_management_right(mode='unlink', records=access_domain_ah_ids)
-                        unlink_flag = flag['access_flag']
-                        access_rule = flag['access_rule']
-                        if not unlink_flag:
-                            rec._display_access_management_error(mode='unlink', rule=access_rule)
+    def _check_access_management_guard(self, mode):
+        if self._is_access_management_uninstalling() or not self._name:
+            return
+        access_domain_ah_ids = self._get_access_management_domain_record(model=self._name)
+        if access_domain_ah_ids:
+            flag = self._check_access_management_right(mode=mode, records=access_domain_ah_ids)
+            if not flag['access_flag']:
+                records = flag['denied'][:1] if mode != 'create' else self
+                records._display_access_management_error(mode=mode, rule=flag['access_rule'])
 
+    def unlink(self):
+        if self:
+            self._check_access_management_guard('unlink')
         return super().unlink()
 
     def write(self, vals):
-        value = self.env['ir.config_parameter'].sudo().search([('key', '=', 'uninstall_simplify_access_management')],
-                                                              limit=1).value
-        if not value:
-            for rec in self:
-                if rec._name:
-                    access_domain_ah_ids = rec._get_access_management_domain_record(model=rec._name)
-                    if access_domain_ah_ids:
-                        access_domain_ah_ids = access_domain_ah_ids.filtered(
-                            lambda line: self.env.company in line.access_management_id.company_ids)
-                    if access_domain_ah_ids:
-                        flag = rec._check_access_management_right(mode='write', records=access_domain_ah_ids)
-                        write_flag = flag['access_flag']
-                        access_rule = flag['access_rule']
-                        if not write_flag:
-                            rec._display_access_management_error(mode='write', rule=access_rule)
+        if self:
+            self._check_access_management_guard('write')
         return super().write(vals)
     
     # @api.model
@@ -505,17 +446,5 @@ class BaseModel(models.AbstractModel):
     @api.model_create_multi
     @api.returns('self', lambda value: value.id)
     def create(self, vals_list):
-        value = self.env['ir.config_parameter'].sudo().search([('key','=','uninstall_simplify_access_management')],limit=1).value
-        if not value:
-            if self._name:
-                access_domain_ah_ids = self._get_access_management_domain_record(model=self._name)
-                if access_domain_ah_ids:
-                    access_domain_ah_ids = access_domain_ah_ids.filtered(lambda line: self.env.company in line.access_management_id.company_ids)
-                if access_domain_ah_ids:
-                        flag = self._check_access_management_right(mode='create',records=access_domain_ah_ids)
-                        create_flag = flag['access_flag']
-                        access_rule = flag['access_rule']
-                        if not create_flag:
-                            self._display_access_management_error(mode='create',rule=access_rule)
-
+        self._check_access_management_guard('create')
         return super().create(vals_list)
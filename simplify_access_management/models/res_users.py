@@ -13,6 +13,8 @@ class res_users(models.Model):
     
     def write(self, vals):
         res = super(res_users, self).write(vals)
+        if 'access_management_ids' in vals:
+            self.env.registry.clear_cache()
         for access in self.access_management_ids:
             if self.env.company in access.company_ids and access.readonly:
                 if self.has_group('base.group_system') or self.has_group('base.group_erp_manager'):
@@ -22,6 +24,8 @@ class res_users(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         res = super(res_users, self).create(vals_list)
+        if any('access_management_ids' in vals for vals in vals_list):
+            self.env.registry.clear_cache()
         for record in self:
             for access in record.access_management_ids:    
                 if self.env.company in access.company_ids and access.readonly:
@@ -30,6 +34,13 @@ class res_users(models.Model):
         return res
 
 
+    def unlink(self):
+        has_access = bool(self.access_management_ids)
+        res = super(res_users, self).unlink()
+        if has_access:
+            self.env.registry.clear_cache()
+        return res
+
     @classmethod
     def _login(cls, db, credential, user_agent_env):
         res = super()._login(db, credential, user_agent_env=user_agent_env)
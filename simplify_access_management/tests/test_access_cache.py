@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+
+from odoo.tests import new_test_user, tagged
+from odoo.tests.common import TransactionCase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestAccessCache(TransactionCase):
+    """ Queries issued by the access management hooks, cold and once their
+        registry cache is warm.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = new_test_user(cls.env, login='sam_cache_user', groups='base.group_user')
+        cls.access = cls.env['access.management'].create({
+            'name': 'Access cache',
+            'user_ids': [(6, 0, cls.user.ids)],
+            'access_domain_ah_ids': [(0, 0, {
+                'model_id': cls.env['ir.model']._get_id('res.partner'),
+                'apply_domain': True,
+                'read_right': True,
+            })],
+        })
+
+    def _count_queries(self, func, *args, repeat=1):
+        count = self.cr.sql_log_count
+        for __ in range(repeat):
+            func(*args)
+        return self.cr.sql_log_count - count
+
+    def test_check_queries(self):
+        Access = self.env['ir.model.access'].with_user(self.user)
+        self.env.registry.clear_cache()
+        cold = self._count_queries(Access.check, 'res.partner', 'read')
+        warm = self._count_queries(Access.check, 'res.partner', 'read', repeat=1000)
+        _logger.info("ir.model.access check(): %s queries cold, %s for 1000 warm calls", cold, warm)
+        self.assertTrue(cold)
+        self.assertEqual(warm, 0)
+
+        # a change of the access domain lines compiles the decision again
+        self.access.access_domain_ah_ids.write({'read_right': False})
+        self.assertTrue(self._count_queries(Access.check, 'res.partner', 'read'))
+
+    def _write_each(self, records, vals):
+        count = self.cr.sql_log_count
+        start = time.time()
+        for record in records:
+            record.write(vals)
+            record.flush_recordset()
+        return self.cr.sql_log_count - count, time.time() - start
+
+    def test_write_guard_queries(self):
+        """ Bulk writes on a model without access domain lines issue the same
+            queries with and without the create/write/unlink guard.
+        """
+        categories = self.env['res.partner.category'].create([
+            {'name': 'Access cache %s' % i} for i in range(2000)
+        ]).with_user(self.user)
+        self.user.groups_id += self.env.ref('base.group_partner_manager')
+
+        categories[:1].write({'color': 1})
+        guarded, guarded_time = self._write_each(categories, {'color': 2})
+
+        self.env['ir.config_parameter'].sudo().set_param('uninstall_simplify_access_management', True)
+        categories[:1].write({'color': 1})
+        unguarded, unguarded_time = self._write_each(categories, {'color': 3})
+
+        _logger.info("2000 writes: %s queries in %.2fs with the access guard, %s in %.2fs without",
+                     guarded, guarded_time, unguarded, unguarded_time)
+        self.assertLessEqual(guarded, unguarded)
+
+    def test_user_write_keeps_cache(self):
+        """ Only the access packs of the users change the compiled access. """
+        Access = self.env['ir.model.access'].with_user(self.user)
+        Access.check('res.partner', 'read')
+        self.user.write({'name': 'Access cache user'})
+        self.assertEqual(self._count_queries(Access.check, 'res.partner', 'read'), 0)
+        self.user.write({'access_management_ids': [(5, 0, 0)]})
+        self.assertTrue(self._count_queries(Access.check, 'res.partner', 'read'))
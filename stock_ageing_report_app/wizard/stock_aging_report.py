@@ -199,53 +199,12 @@ class StockAgingReportWizard(models.TransientModel):
 			return 0.0
 
 
-	def get_warehouse_details(self, data, warehouse):
+	def get_warehouse_details(self, data, warehouse, matrix=None):
 		lines =[]
 		if warehouse:
-			start_date_data = data.get('start_date')
-			category_ids = data.get('category_ids')
-			filter_type = data.get('filter_type')
-			product_ids = data.get('product_ids')
-			company  = data.get('company_id')
-			if filter_type == 'category':
-				product_ids = self.env['product.product'].search([('categ_id', 'in', category_ids.ids)])
-			else:
-				product_ids = self.env['product.product'].search([('id', 'in', product_ids.ids)])
-			product_data = []
-			for product_id  in product_ids:
-				value = {}
-				counter = 1
-				col = "col_"
-				if product_id.product_template_attribute_value_ids:
-					variant = product_id.product_template_attribute_value_ids._get_combination_name()
-					name = variant and "%s (%s)" % (product_id.name, variant) or product_id.name
-					product_name = name
-				else:
-					product_name = product_id.name
-				value.update({
-					'product_id'         : product_id.id,
-					'product_name'       : product_name or '',
-					'product_code'       : product_id.default_code or '',
-					'cost_price'         : product_id.standard_price  or 0.00,
-				})
-				is_last = False
-				for date_data in self._get_date_data(data):
-					if counter == 6:
-						is_last = True
-					start_date = date_data.get('start_date')
-					end_date = date_data.get('end_date')
-					warehouse_id = warehouse.id
-					company_id = company.id
-					delivered_qty = self._get_product_info(product_id.id, warehouse_id, start_date, end_date, company_id)
-					received_qty = self._get_product_in_info(product_id.id, warehouse_id, start_date, end_date, company_id)
-					return_in_qty = self._get_return_in_qty(product_id.id, warehouse_id, start_date, end_date, company_id)
-					return_out_qty = self._get_return_out_qty(product_id.id, warehouse_id, start_date, end_date, company_id)
-					adjusted_qty = self._get_adjusted_qty(product_id.id, warehouse_id, start_date, end_date, company_id)
-					qty_on_hand = (received_qty + adjusted_qty + return_in_qty) - (delivered_qty + return_out_qty)
-					qty_hand_key = col + str(counter)
-					value.update({ qty_hand_key : qty_on_hand })
-					counter += 1
-				product_data.append(value)
+			if matrix is None:
+				matrix = self._get_ageing_matrix(data, warehouse.ids, 'warehouse')
+			product_data = list(self._iter_ageing_product_data(data, matrix, warehouse.id))
 			lines.append({'product_data':product_data})
 		return lines
 
@@ -407,62 +366,124 @@ class StockAgingReportWizard(models.TransientModel):
 		else:
 			return 0.0
 
-	def get_location_details(self, data, location):
+	def get_location_details(self, data, location, matrix=None):
 		lines =[]
 		if location:
-			start_date_data = data.get('start_date')
-			category_ids = data.get('category_ids')
-			filter_type = data.get('filter_type')
-			product_ids = data.get('product_ids')
-			company  = data.get('company_id')
-			if filter_type == 'category':
-				product_ids = self.env['product.product'].search([('categ_id', 'in', category_ids.ids)])
-			else:
-				product_ids = self.env['product.product'].search([('id', 'in', product_ids.ids)])
-			product_data = []
-			for product_id  in product_ids:
-				value = {}
-				counter = 1
-				col = "col_"
-				if product_id.product_template_attribute_value_ids:
-					variant = product_id.product_template_attribute_value_ids._get_combination_name()
-					name = variant and "%s (%s)" % (product_id.name, variant) or product_id.name
-					product_name = name
-				else:
-					product_name = product_id.name
-				value.update({
-					'product_id'         : product_id.id,
-					'product_name'       : product_name or '',
-					'product_code'       : product_id.default_code or '',
-					'cost_price'         : product_id.standard_price  or 0.00,
-				})
-				is_last = False
-				for date_data in self._get_date_data(data):
-					if counter == 6:
-						is_last = True
-					start_date = date_data.get('start_date')
-					end_date = date_data.get('end_date')
-					location_id = location.id
-					location_dest_id = location.id
-					company_id = company.id
-					location_id = location.id
-					delivered_qty = self._get_product_location_info(product_id.id, location_id, start_date, end_date, company_id)
-					received_qty = self._get_product_location_in_info(product_id.id, location_id, start_date, end_date, company_id)
-					return_in_qty = self._get_return_location_in_qty(product_id.id, location_id, start_date, end_date, company_id)
-					return_out_qty = self._get_return_location_out_qty(product_id.id, location_id, start_date, end_date, company_id)
-					internal_in_qty = self._get_internal_location_in_qty(product_id.id, location_id, start_date, end_date, company_id)
-					internal_out_qty = self._get_internal_location_out_qty(product_id.id, location_id, start_date, end_date, company_id)
-					pos_return_in_qty = self._get_pos_return_location_in_qty(product_id.id, location_id, start_date, end_date, company_id)
-					adjusted_in_qty = self._get_adjusted_location_in_qty(product_id.id, location_id, start_date, end_date, company_id)
-					adjusted_out_qty = self._get_adjusted_location_out_qty(product_id.id, location_id, start_date, end_date, company_id)
-					qty_on_hand = (received_qty + adjusted_in_qty + return_in_qty + internal_in_qty + pos_return_in_qty) - (delivered_qty + adjusted_out_qty + return_out_qty + internal_out_qty)
-					qty_hand_key = col + str(counter)
-					value.update({ qty_hand_key : qty_on_hand })
-					counter += 1
-				product_data.append(value)
+			if matrix is None:
+				matrix = self._get_ageing_matrix(data, location.ids, 'location')
+			product_data = list(self._iter_ageing_product_data(data, matrix, location.id))
 			lines.append({'product_data':product_data})
 		return lines
 
+# Ageing matrix
+
+	def _get_ageing_products(self, data):
+		if 'products' not in data:
+			if data.get('filter_type') == 'category':
+				data['products'] = self.env['product.product'].search([('categ_id', 'in', data.get('category_ids').ids)])
+			else:
+				data['products'] = self.env['product.product'].search([('id', 'in', data.get('product_ids').ids)])
+		return data['products']
+
+	def _get_ageing_matrix(self, data, scope_ids, scope):
+		"""Return {(warehouse or location id, product id): [qty of each period]}.
+
+		The quantities of all the products, periods and warehouses (or
+		locations) are summed by one query, each move line being counted
+		with the sign of the per period queries above.
+		"""
+		matrix = {}
+		products = self._get_ageing_products(data)
+		if not scope_ids or not products:
+			return matrix
+		date_data = self._get_date_data(data)
+		params = {
+			'scope_ids': list(scope_ids),
+			'product_ids': products.ids,
+			'company_id': data.get('company_id').id,
+			'date_min': date_data[-1]['end_date'],
+			'date_max': date_data[0]['start_date'],
+		}
+		whens = []
+		for index, period in enumerate(date_data):
+			whens.append("WHEN d.local_date BETWEEN %%(end_%s)s AND %%(start_%s)s THEN %s" % (index, index, index))
+			params.update({'end_%s' % index: period['end_date'], 'start_%s' % index: period['start_date']})
+		if scope == 'warehouse':
+			query = """
+				SELECT scope.id, sml.product_id, CASE %(whens)s END AS period,
+					SUM(sml.quantity * (
+						((spt.code = 'incoming' AND sm.warehouse_id = scope.id AND sm.origin_returned_move_id IS NULL) IS TRUE)::int
+						+ ((msrc.usage = 'inventory' AND dst.warehouse_id = scope.id) IS TRUE)::int
+						+ ((spt.code = 'outgoing' AND sm.warehouse_id = scope.id AND sm.origin_returned_move_id IS NOT NULL) IS TRUE)::int
+						- ((spt.code = 'outgoing' AND sm.warehouse_id = scope.id AND sm.origin_returned_move_id IS NULL) IS TRUE)::int
+						- ((spt.code = 'incoming' AND sm.warehouse_id = scope.id AND sm.origin_returned_move_id IS NOT NULL) IS TRUE)::int
+					))
+				FROM stock_move_line sml
+				JOIN stock_move sm ON sm.id = sml.move_id
+				LEFT JOIN stock_picking_type spt ON spt.id = sm.picking_type_id
+				JOIN stock_location msrc ON msrc.id = sm.location_id
+				JOIN stock_location dst ON dst.id = sml.location_dest_id
+				CROSS JOIN LATERAL (SELECT ((sml.date at time zone 'utc') at time zone 'asia/bangkok')::date AS local_date) d
+				JOIN unnest(%%(scope_ids)s::int[]) AS scope(id)
+					ON scope.id = sm.warehouse_id OR (msrc.usage = 'inventory' AND dst.warehouse_id = scope.id)
+				WHERE sml.state = 'done'
+				AND sml.company_id = %%(company_id)s
+				AND sml.product_id = ANY(%%(product_ids)s)
+				AND d.local_date BETWEEN %%(date_min)s AND %%(date_max)s
+				GROUP BY 1, 2, 3
+			""" % {'whens': " ".join(whens)}
+		else:
+			query = """
+				SELECT scope.id, sml.product_id, CASE %(whens)s END AS period,
+					SUM(sml.quantity * (
+						((spt.code = 'incoming' AND sml.location_dest_id = scope.id) IS TRUE)::int
+						+ ((src.usage = 'inventory' AND sml.location_dest_id = scope.id) IS TRUE)::int
+						+ ((spt.code = 'outgoing' AND sml.location_id = scope.id AND sm.origin_returned_move_id IS NOT NULL) IS TRUE)::int
+						+ ((spt.code = 'internal' AND sml.location_dest_id = scope.id) IS TRUE)::int
+						+ ((spt.code = 'outgoing' AND sml.location_dest_id = scope.id) IS TRUE)::int
+						- ((spt.code = 'outgoing' AND sml.location_id = scope.id) IS TRUE)::int
+						- ((dst.usage = 'inventory' AND sml.location_id = scope.id) IS TRUE)::int
+						- ((spt.code = 'incoming' AND sml.location_dest_id = scope.id AND sm.origin_returned_move_id IS NOT NULL) IS TRUE)::int
+						- ((spt.code = 'internal' AND sml.location_id = scope.id) IS TRUE)::int
+					))
+				FROM stock_move_line sml
+				JOIN stock_move sm ON sm.id = sml.move_id
+				LEFT JOIN stock_picking_type spt ON spt.id = sm.picking_type_id
+				JOIN stock_location src ON src.id = sml.location_id
+				JOIN stock_location dst ON dst.id = sml.location_dest_id
+				CROSS JOIN LATERAL (SELECT ((sml.date at time zone 'utc') at time zone 'asia/bangkok')::date AS local_date) d
+				JOIN unnest(%%(scope_ids)s::int[]) AS scope(id)
+					ON scope.id IN (sml.location_id, sml.location_dest_id)
+				WHERE sml.state = 'done'
+				AND sm.company_id = %%(company_id)s
+				AND sml.product_id = ANY(%%(product_ids)s)
+				AND d.local_date BETWEEN %%(date_min)s AND %%(date_max)s
+				GROUP BY 1, 2, 3
+			""" % {'whens': " ".join(whens)}
+		self.env.cr.execute(query, params)
+		for scope_id, product_id, period, qty in self.env.cr.fetchall():
+			matrix.setdefault((scope_id, product_id), [0.0] * len(date_data))[period] = qty or 0.0
+		return matrix
+
+	def _iter_ageing_product_data(self, data, matrix, scope_id):
+		"""Yield the report line of each product for a warehouse or location."""
+		empty = [0.0] * 6
+		for product_id in self._get_ageing_products(data):
+			if product_id.product_template_attribute_value_ids:
+				variant = product_id.product_template_attribute_value_ids._get_combination_name()
+				product_name = variant and "%s (%s)" % (product_id.name, variant) or product_id.name
+			else:
+				product_name = product_id.name
+			value = {
+				'product_id'         : product_id.id,
+				'product_name'       : product_name or '',
+				'product_code'       : product_id.default_code or '',
+				'cost_price'         : product_id.standard_price  or 0.00,
+			}
+			for counter, qty_on_hand in enumerate(matrix.get((scope_id, product_id.id), empty), 1):
+				value['col_%s' % counter] = qty_on_hand
+			yield value
+
 
 
 	def print_excel_report(self):
@@ -471,7 +492,9 @@ class StockAgingReportWizard(models.TransientModel):
 		output = io.BytesIO()
 		file_path = 'Stock Aging Report' + '.xlsx'
 		# workbook = xlsxwriter.Workbook('/tmp/' + file_path)
-		workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+		# rows are written in order and flushed as they go, the sheet is
+		# not kept in memory
+		workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
 		worksheet = workbook.add_worksheet('Stock Aging Report')
 
 		header_format = workbook.add_format({'bold': True,'valign':'vcenter','font_size':16,'align': 'center','bg_color':'#D8D8D8'})
@@ -518,18 +541,18 @@ class StockAgingReportWizard(models.TransientModel):
 		worksheet.merge_range(1, 0, 1, 15, TITLEHEDER,header_format)
 		rowscol = 1
 		if warehouse_ids:
+			matrix = self._get_ageing_matrix(data, warehouse_ids.ids, 'warehouse')
 			for warehouse in warehouse_ids:
 				# Report Title
 				worksheet.merge_range((rowscol + 2), 0, (rowscol + 2), 3,'Warehouse/Location', title_format)
 				worksheet.merge_range((rowscol + 2), 12, (rowscol + 2), 15, str(warehouse.name) , title_format)
 
 				worksheet.merge_range((rowscol + 4), 0, (rowscol + 4), 3,'Company: ', title_format)
-				worksheet.merge_range((rowscol + 5), 0, (rowscol + 5), 3, str(company_id.name) , title_format)
-
 				worksheet.merge_range((rowscol + 4), 6, (rowscol + 4), 9,'Start Date: ', title_format)
-				worksheet.merge_range((rowscol + 5), 6, (rowscol + 5), 9, str(start_date) , title_format)
-
 				worksheet.merge_range((rowscol + 4), 12, (rowscol + 4), 15,'Period Length:', title_format)
+
+				worksheet.merge_range((rowscol + 5), 0, (rowscol + 5), 3, str(company_id.name) , title_format)
+				worksheet.merge_range((rowscol + 5), 6, (rowscol + 5), 9, str(start_date) , title_format)
 				worksheet.merge_range((rowscol + 5), 12, (rowscol + 5), 15, str(period_length) , title_format)
 
 				# Report Content
@@ -559,47 +582,46 @@ class StockAgingReportWizard(models.TransientModel):
 				worksheet.write((rowscol + 8), 14, 'Qty', cell_wrap_format_bold)
 				worksheet.write((rowscol + 8), 15, 'Value', cell_wrap_format_bold)
 				rows = (rowscol + 9)
-				for records in self.get_warehouse_details(data, warehouse):
-					for record in records.get('product_data'):
-						col_1_data = record.get('col_1')
-						col_1_data_value = col_1_data * record.get('cost_price')
-						col_2_data = record.get('col_2')
-						col_2_data_value = col_2_data * record.get('cost_price')
-						col_3_data = record.get('col_3')
-						col_3_data_value = col_3_data * record.get('cost_price')
-						col_4_data = record.get('col_4')
-						col_4_data_value = col_4_data * record.get('cost_price')
-						col_5_data = record.get('col_5')
-						col_5_data_value = col_5_data * record.get('cost_price')
-						col_6_data = record.get('col_6')
-						col_6_data_value = col_6_data * record.get('cost_price')
-
-						sub_total = col_1_data + col_2_data + col_3_data + col_4_data + col_5_data + col_6_data
-
-						total_cost = sub_total * record.get('cost_price')
-
-						worksheet.write(rows, 0,  record.get('product_code'), cell_wrap_format)
-						worksheet.write(rows, 1,  record.get('product_name'), cell_wrap_format)
-
-						worksheet.write(rows, 2,  str('%.2f' % sub_total), cell_wrap_format_val)
-						worksheet.write(rows, 3,  str('%.2f' % total_cost), cell_wrap_format_right)
-
-						worksheet.write(rows, 4,  str('%.1f' % col_1_data), cell_wrap_format_amount)
-						worksheet.write(rows, 5,  str('%.2f' % col_1_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 6,  str('%.1f' % col_2_data), cell_wrap_format_amount)
-						worksheet.write(rows, 7,  str('%.2f' % col_2_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 8,  str('%.1f' % col_3_data), cell_wrap_format_amount)
-						worksheet.write(rows, 9,  str('%.2f' % col_3_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 10, str('%.1f' % col_4_data), cell_wrap_format_amount)
-						worksheet.write(rows, 11, str('%.2f' % col_4_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 12, str('%.1f' % col_5_data), cell_wrap_format_amount)
-						worksheet.write(rows, 13, str('%.2f' % col_5_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 14, str('%.1f' % col_6_data), cell_wrap_format_amount)
-						worksheet.write(rows, 15, str('%.2f' % col_6_data_value), cell_wrap_format_amount_val)
-						rows = rows + 1
-					rows = rows
+				for record in self._iter_ageing_product_data(data, matrix, warehouse.id):
+					col_1_data = record.get('col_1')
+					col_1_data_value = col_1_data * record.get('cost_price')
+					col_2_data = record.get('col_2')
+					col_2_data_value = col_2_data * record.get('cost_price')
+					col_3_data = record.get('col_3')
+					col_3_data_value = col_3_data * record.get('cost_price')
+					col_4_data = record.get('col_4')
+					col_4_data_value = col_4_data * record.get('cost_price')
+					col_5_data = record.get('col_5')
+					col_5_data_value = col_5_data * record.get('cost_price')
+					col_6_data = record.get('col_6')
+					col_6_data_value = col_6_data * record.get('cost_price')
+
+					sub_total = col_1_data + col_2_data + col_3_data + col_4_data + col_5_data + col_6_data
+
+					total_cost = sub_total * record.get('cost_price')
+
+					worksheet.write(rows, 0,  record.get('product_code'), cell_wrap_format)
+					worksheet.write(rows, 1,  record.get('product_name'), cell_wrap_format)
+
+					worksheet.write(rows, 2,  str('%.2f' % sub_total), cell_wrap_format_val)
+					worksheet.write(rows, 3,  str('%.2f' % total_cost), cell_wrap_format_right)
+
+					worksheet.write(rows, 4,  str('%.1f' % col_1_data), cell_wrap_format_amount)
+					worksheet.write(rows, 5,  str('%.2f' % col_1_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 6,  str('%.1f' % col_2_data), cell_wrap_format_amount)
+					worksheet.write(rows, 7,  str('%.2f' % col_2_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 8,  str('%.1f' % col_3_data), cell_wrap_format_amount)
+					worksheet.write(rows, 9,  str('%.2f' % col_3_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 10, str('%.1f' % col_4_data), cell_wrap_format_amount)
+					worksheet.write(rows, 11, str('%.2f' % col_4_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 12, str('%.1f' % col_5_data), cell_wrap_format_amount)
+					worksheet.write(rows, 13, str('%.2f' % col_5_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 14, str('%.1f' % col_6_data), cell_wrap_format_amount)
+					worksheet.write(rows, 15, str('%.2f' % col_6_data_value), cell_wrap_format_amount_val)
+					rows = rows + 1
 				rowscol = rows + 2
 		else:
+			matrix = self._get_ageing_matrix(data, location_ids.ids, 'location')
 			for location in location_ids:
 				if location.location_id:
 					location_name = str(location.location_id.name or '') + '/' + str(location.name or '') 
@@ -610,12 +632,11 @@ class StockAgingReportWizard(models.TransientModel):
 				worksheet.merge_range((rowscol + 2), 12, (rowscol + 2), 15, str(location_name) , title_format)
 
 				worksheet.merge_range((rowscol + 4), 0, (rowscol + 4), 3,'Company: ', title_format)
-				worksheet.merge_range((rowscol + 5), 0, (rowscol + 5), 3, str(company_id.name) , title_format)
-
 				worksheet.merge_range((rowscol + 4), 6, (rowscol + 4), 9,'Start Date: ', title_format)
-				worksheet.merge_range((rowscol + 5), 6, (rowscol + 5), 9, str(start_date) , title_format)
-
 				worksheet.merge_range((rowscol + 4), 12, (rowscol + 4), 15,'Period Length:', title_format)
+
+				worksheet.merge_range((rowscol + 5), 0, (rowscol + 5), 3, str(company_id.name) , title_format)
+				worksheet.merge_range((rowscol + 5), 6, (rowscol + 5), 9, str(start_date) , title_format)
 				worksheet.merge_range((rowscol + 5), 12, (rowscol + 5), 15, str(period_length) , title_format)
 
 				# Report Content
@@ -645,45 +666,43 @@ class StockAgingReportWizard(models.TransientModel):
 				worksheet.write((rowscol + 8), 14, 'Qty', cell_wrap_format_bold)
 				worksheet.write((rowscol + 8), 15, 'Value', cell_wrap_format_bold)
 				rows = (rowscol + 9)
-				for records in self.get_location_details(data, location):
-					for record in records.get('product_data'):
-						col_1_data = record.get('col_1')
-						col_1_data_value = col_1_data * record.get('cost_price')
-						col_2_data = record.get('col_2')
-						col_2_data_value = col_2_data * record.get('cost_price')
-						col_3_data = record.get('col_3')
-						col_3_data_value = col_3_data * record.get('cost_price')
-						col_4_data = record.get('col_4')
-						col_4_data_value = col_4_data * record.get('cost_price')
-						col_5_data = record.get('col_5')
-						col_5_data_value = col_5_data * record.get('cost_price')
-						col_6_data = record.get('col_6')
-						col_6_data_value = col_6_data * record.get('cost_price')
-
-						sub_total = col_1_data + col_2_data + col_3_data + col_4_data + col_5_data + col_6_data
-
-						total_cost = sub_total * record.get('cost_price')
-
-						worksheet.write(rows, 0,  record.get('product_code'), cell_wrap_format)
-						worksheet.write(rows, 1,  record.get('product_name'), cell_wrap_format)
-
-						worksheet.write(rows, 2,  str('%.2f' % sub_total), cell_wrap_format_val)
-						worksheet.write(rows, 3,  str('%.2f' % total_cost), cell_wrap_format_right)
-
-						worksheet.write(rows, 4,  str('%.1f' % col_1_data), cell_wrap_format_amount)
-						worksheet.write(rows, 5,  str('%.2f' % col_1_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 6,  str('%.1f' % col_2_data), cell_wrap_format_amount)
-						worksheet.write(rows, 7,  str('%.2f' % col_2_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 8,  str('%.1f' % col_3_data), cell_wrap_format_amount)
-						worksheet.write(rows, 9,  str('%.2f' % col_3_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 10, str('%.1f' % col_4_data), cell_wrap_format_amount)
-						worksheet.write(rows, 11, str('%.2f' % col_4_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 12, str('%.1f' % col_5_data), cell_wrap_format_amount)
-						worksheet.write(rows, 13, str('%.2f' % col_5_data_value), cell_wrap_format_amount_val)
-						worksheet.write(rows, 14, str('%.1f' % col_6_data), cell_wrap_format_amount)
-						worksheet.write(rows, 15, str('%.2f' % col_6_data_value), cell_wrap_format_amount_val)
-						rows = rows + 1
-					rows = rows
+				for record in self._iter_ageing_product_data(data, matrix, location.id):
+					col_1_data = record.get('col_1')
+					col_1_data_value = col_1_data * record.get('cost_price')
+					col_2_data = record.get('col_2')
+					col_2_data_value = col_2_data * record.get('cost_price')
+					col_3_data = record.get('col_3')
+					col_3_data_value = col_3_data * record.get('cost_price')
+					col_4_data = record.get('col_4')
+					col_4_data_value = col_4_data * record.get('cost_price')
+					col_5_data = record.get('col_5')
+					col_5_data_value = col_5_data * record.get('cost_price')
+					col_6_data = record.get('col_6')
+					col_6_data_value = col_6_data * record.get('cost_price')
+
+					sub_total = col_1_data + col_2_data + col_3_data + col_4_data + col_5_data + col_6_data
+
+					total_cost = sub_total * record.get('cost_price')
+
+					worksheet.write(rows, 0,  record.get('product_code'), cell_wrap_format)
+					worksheet.write(rows, 1,  record.get('product_name'), cell_wrap_format)
+
+					worksheet.write(rows, 2,  str('%.2f' % sub_total), cell_wrap_format_val)
+					worksheet.write(rows, 3,  str('%.2f' % total_cost), cell_wrap_format_right)
+
+					worksheet.write(rows, 4,  str('%.1f' % col_1_data), cell_wrap_format_amount)
+					worksheet.write(rows, 5,  str('%.2f' % col_1_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 6,  str('%.1f' % col_2_data), cell_wrap_format_amount)
+					worksheet.write(rows, 7,  str('%.2f' % col_2_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 8,  str('%.1f' % col_3_data), cell_wrap_format_amount)
+					worksheet.write(rows, 9,  str('%.2f' % col_3_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 10, str('%.1f' % col_4_data), cell_wrap_format_amount)
+					worksheet.write(rows, 11, str('%.2f' % col_4_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 12, str('%.1f' % col_5_data), cell_wrap_format_amount)
+					worksheet.write(rows, 13, str('%.2f' % col_5_data_value), cell_wrap_format_amount_val)
+					worksheet.write(rows, 14, str('%.1f' % col_6_data), cell_wrap_format_amount)
+					worksheet.write(rows, 15, str('%.2f' % col_6_data_value), cell_wrap_format_amount_val)
+					rows = rows + 1
 				rowscol = rows + 2
 
 		workbook.close()